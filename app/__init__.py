@@ -1,5 +1,13 @@
 from flask import Flask
+from sqlalchemy import event
+from config import build_database_uri, build_engine_options, build_database_binds
 from .extensions import db, bcrypt, jwt, migrate
+from .utils.read_replica import record_user_write
+from .utils.structured_logging import configure_logging
+from .utils.compression import init_compression
+from .utils.profiling import init_profiling
+from .utils.slow_queries import init_slow_query_log
+from .utils.scoring_jobs import init_scoring_workers
 
 
 def create_app(config_object='config.Config'):
@@ -7,6 +15,15 @@ def create_app(config_object='config.Config'):
     """An application factory."""
     app = Flask(__name__)
     app.config.from_object(config_object)
+    configure_logging(app)
+
+    # Database settings are resolved here so importing config never touches config.ini
+    if not app.config.get('SQLALCHEMY_DATABASE_URI'):
+        app.config['SQLALCHEMY_DATABASE_URI'] = build_database_uri()
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = build_engine_options(
+        app.config, app.config['SQLALCHEMY_DATABASE_URI']
+    )
+    app.config['SQLALCHEMY_BINDS'] = build_database_binds(app.config)
 
     # Initialize extensions
     db.init_app(app)
@@ -14,6 +31,22 @@ def create_app(config_object='config.Config'):
     jwt.init_app(app)
     migrate.init_app(app, db)  # <-- Initialize migrate here
 
+    with app.app_context():
+        _register_statement_timeout(app)
+        init_slow_query_log(app)
+
+    # gzip/brotli responses for clients that accept them, and gzip request bodies
+    init_compression(app)
+
+    # Opt-in cProfile dumps for sampled requests and those carrying a signed X-Profile-Token
+    init_profiling(app)
+
+    # Users who just wrote keep reading from the primary for a short window
+    app.after_request(record_user_write)
+
+    # Scores are calculated off the request path by an in-process worker pool
+    init_scoring_workers(app)
+
     # --- JWT Blocklist Checker ---
     # This callback function will be called every time a protected endpoint is
     # accessed, and will check if the JWT has been revoked.
@@ -32,10 +65,33 @@ def create_app(config_object='config.Config'):
         from .routes.auth import auth_bp
         from .routes.parking_routes import parking_bp
         from .routes.score_routes import score_bp
+        from .routes.health_routes import health_bp
+        from .routes.export_routes import export_bp
+        from .routes.admin_routes import admin_bp
 
         # Register the blueprints with the app
         app.register_blueprint(auth_bp)
         app.register_blueprint(parking_bp)
         app.register_blueprint(score_bp)
+        app.register_blueprint(health_bp)
+        app.register_blueprint(export_bp)
+        app.register_blueprint(admin_bp)
+
+    return app
+
+
+def _register_statement_timeout(app):
+    """Cap SELECT run time on every new MySQL connection (DB_STATEMENT_TIMEOUT_MS)."""
+    timeout_ms = app.config.get('DB_STATEMENT_TIMEOUT_MS')
+    if not timeout_ms:
+        return
+
+    def set_statement_timeout(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"SET SESSION max_execution_time = {int(timeout_ms)}")
+        cursor.close()
 
-    return app
\ No newline at end of file
+    # Applies to the primary and the read replica alike
+    for engine in db.engines.values():
+        if engine.dialect.name == 'mysql':
+            event.listen(engine, 'connect', set_statement_timeout)
@@ -1,36 +1,57 @@
 #Read data from INI file
 import configparser
+import logging
 import time
+from collections import OrderedDict
 from sys import flags
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, errorcode, errors
 from .sql_statement import *
+from .schema import schema_statements, schema_fingerprint, SCHEMA_VERSION_TABLE, CREATE_SCHEMA_VERSION_TABLE
+
+logger = logging.getLogger(__name__)
 
 
 class Database:
     _instance = None  # Singleton instance
+    _schema_checked = False  # Set once this process has verified the schema fingerprint
+
+    # [mysql] options that configure this class rather than mysql.connector.connect()
+    OPTION_KEYS = ('prepared_statements', 'statement_cache_size')
+    DEFAULT_STATEMENT_CACHE_SIZE = 64
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(Database, cls).__new__(cls)
-            cls._instance.config_filename = 'config.ini'  # Initialize here
-            cls._instance._init_database()
+            instance = super(Database, cls).__new__(cls)
+            instance.config_filename = 'config.ini'  # Initialize here
+            instance._init_database()
+            cls._instance = instance  # Only once initialised, so a rejected config.ini is not kept
         return cls._instance
 
     def _init_database(self):
-        """Initialize the database connection."""
+        """Initialize the database connection, creating the database if needed, and make sure the schema is current."""
         self.connection = None
+        self._statement_cache = OrderedDict()  # SQL text -> (prepared cursor, SQL text), least recently used first
+        self._statement_connection = None
+        options = self.load_options()
+        self.prepared_statements = options.getboolean('prepared_statements', fallback=False)
+        self.statement_cache_size = options.getint('statement_cache_size', fallback=self.DEFAULT_STATEMENT_CACHE_SIZE)
+        if self.statement_cache_size < 1:
+            # The statement just prepared must stay open until its caller has read the results
+            raise ValueError(f"statement_cache_size must be at least 1, not {self.statement_cache_size}")
         try:
             config = self.load_config()
-            self.connection = mysql.connector.connect(**config, autocommit=True)
-            if self.connection.is_connected():
-                print("✅ Database connected successfully.")
-                self._check_database_exist()
-                self._check_table_exist()
+            try:
+                self.connection = mysql.connector.connect(**config, autocommit=True)
+            except Error as e:
+                if e.errno != errorcode.ER_BAD_DB_ERROR:
+                    raise
+                self._create_database(config)
+                self.connection = mysql.connector.connect(**config, autocommit=True)
+            logger.info("Database connected successfully")
+            self._ensure_schema()
         except Error as e:
-            self._check_database_exist_if_db_error_occur()
-            self._check_table_exist()
-
+            logger.error("Error while connecting to the database: %s", e)
 
     def create_connection_parser(self):
 
@@ -42,48 +63,130 @@ class Database:
         else:
             raise Exception
 
-    def _check_database_exist(self):
-        config = self.load_config()
-        if not config.get("database") or config['database'] != DEFAULT_OB_NAME:
-            config['database'] = DEFAULT_OB_NAME
+    def _prepared_cursor(self, sql):
+        """
+        Return (cursor, sql) for a server-side prepared statement, reusing the cursor already prepared
+        for this SQL text on the persistent connection. Statements belong to a connection, so the cache
+        is dropped whenever the connection is replaced.
+        """
+        if self.connection is None:
+            self.connection = mysql.connector.connect(**self.load_config(), autocommit=True)
+        if self._statement_connection is not self.connection:
+            # create_connection_parser() or a reconnect replaced the connection the statements were prepared on
+            self._statement_cache.clear()
+            self._statement_connection = self.connection
+
+        cached = self._statement_cache.get(sql)
+        if cached is not None:
+            self._statement_cache.move_to_end(sql)
+            return cached
+
+        # The cursor re-prepares when it is given a different string object, so keep the one it was prepared with
+        cached = (self.connection.cursor(prepared=True), sql)
+        self._statement_cache[sql] = cached
+        while len(self._statement_cache) > self.statement_cache_size:
+            _, (evicted_cursor, _) = self._statement_cache.popitem(last=False)
+            evicted_cursor.close()  # Deallocates the statement on the server
+        return cached
+
+    def _execute(self, sql, values):
+        """Run sql with values and return the cursor, through the statement cache in prepared-statement mode."""
+        if not self.prepared_statements:
             cursor = self.create_connection_parser()
-            cursor.execute(f"{CREATE_DB} {config['database']};")
-            self.save_config(config)
-        return
-
-    def _check_table_exist(self):
-        cursor = self.create_connection_parser()
-        cursor.execute(CREATE_USER_TYPE_TABLE)
-        cursor.execute(CREATE_USER_TABLE)
-        cursor.execute(CREATE_EMERGENCY_CONTACT_TABLE)
-        cursor.execute(CREATE_PARKING_EVENT_TABLE)
-        cursor.execute(CREATE_LANDMARK_TABLE)
-        cursor.execute(CREATE_SCORE_TABLE)
+            cursor.execute(sql, values)
+            return cursor
+
+        cursor, sql = self._prepared_cursor(sql)
+        try:
+            cursor.execute(sql, values)
+        except (errors.OperationalError, errors.InterfaceError):
+            # A lost connection takes its prepared statements with it; reconnect on the next call
+            self.connection = None
+            raise
+        return cursor
+
+    def _create_database(self, config):
+        # Connect to the server without a database to create it
+        server_config = {key: value for key, value in config.items() if key != 'database'}
+        connection = mysql.connector.connect(**server_config, autocommit=True)
+        try:
+            cursor = connection.cursor()
+            cursor.execute(f"{CREATE_DB} `{config['database']}`;")
+            cursor.close()
+            logger.info("Database created", extra={"fields": {"database": config['database']}})
+        finally:
+            connection.close()
+
+    def _ensure_schema(self):
+        """
+        Apply the DDL generated from the models (see schema.py) unless SchemaVersion already records its
+        fingerprint. When the schema is current this is a single SELECT, and it runs once per process.
+        """
+        if Database._schema_checked:
+            return
+
+        fingerprint = schema_fingerprint()
+        cursor = self.connection.cursor()
+        try:
+            try:
+                cursor.execute(f"SELECT 1 FROM {SCHEMA_VERSION_TABLE} WHERE fingerprint = %s", (fingerprint,))
+                is_current = cursor.fetchone() is not None
+            except Error as e:
+                if e.errno != errorcode.ER_NO_SUCH_TABLE:
+                    raise
+                is_current = False
+
+            if not is_current:
+                self._apply_schema(cursor, fingerprint)
+        finally:
+            cursor.close()
+        Database._schema_checked = True
+
+    def _apply_schema(self, cursor, fingerprint):
+        cursor.execute("SHOW TABLES")
+        existing_tables = {row[0] for row in cursor.fetchall()}
+
+        for table_name, create_table, create_indexes in schema_statements():
+            cursor.execute(create_table)
+            # Tables that already exist are changed by Alembic migrations ('flask db upgrade'), not here
+            if table_name in existing_tables:
+                continue
+            for create_index in create_indexes:
+                try:
+                    cursor.execute(create_index)
+                except Error as e:
+                    # Another process bootstrapping at the same moment created it first
+                    if e.errno != errorcode.ER_DUP_KEYNAME:
+                        raise
+
+        cursor.execute(CREATE_SCHEMA_VERSION_TABLE)
+        cursor.execute(f"INSERT IGNORE INTO {SCHEMA_VERSION_TABLE} (fingerprint) VALUES (%s)", (fingerprint,))
+        logger.info("Database schema applied", extra={"fields": {
+            "fingerprint": fingerprint, "existing_tables": sorted(existing_tables)}})
 
     def load_config(self):
-        # Load database configurations
+        # Load database configurations; the database name falls back to the default without rewriting the file
         config = configparser.ConfigParser()
         config.read(self.config_filename)
-        return {key: value for key, value in config['mysql'].items()}
+        values = {key: value for key, value in config['mysql'].items() if key not in self.OPTION_KEYS}
+        values['database'] = values.get('database') or DEFAULT_OB_NAME
+        return values
 
-    def save_config(self, config):
-        # Save database configurations to the INI file (local)
-        config_parser = configparser.ConfigParser()
-        config_parser['mysql'] = config
-        # Write the configuration to the file
-        with open(self.config_filename, 'w') as configfile:
-            config_parser.write(configfile)
+    def load_options(self):
+        """Return the [mysql] section, for the options in OPTION_KEYS."""
+        config = configparser.ConfigParser()
+        config.read(self.config_filename)
+        return config['mysql']
 
     def add_to_database(self, sql, values):
         try:
-            cursor = self.create_connection_parser()
-            cursor.execute(sql, values)
+            cursor = self._execute(sql, values)
             added_id = cursor.lastrowid
             # print(f"added ID: {sql, values, added_id}")
             return added_id
 
         except Error as e:
-            print(f"Error: {e}")
+            logger.error("Database error: %s", e)
 
     def update_database(self, sql, values):
         """
@@ -92,12 +195,11 @@ class Database:
         :param values: Tuple of values to be updated
         """
         try:
-            cursor = self.create_connection_parser()
-            cursor.execute(sql, values)
+            cursor = self._execute(sql, values)
             self.connection.commit()
             # print(f"Updated rows: {sql, values, cursor.rowcount}")
         except Error as e:
-            print(f"Error: {e}")
+            logger.error("Database error: %s", e)
 
     def delete_from_database(self, sql, values):
         """
@@ -106,12 +208,11 @@ class Database:
         :param values: Tuple of values for the condition
         """
         try:
-            cursor = self.create_connection_parser()
-            cursor.execute(sql, values)
+            cursor = self._execute(sql, values)
             self.connection.commit()
-            print(f"Deleted rows: {cursor.rowcount}")
+            logger.debug("Deleted rows", extra={"fields": {"rowcount": cursor.rowcount}})
         except Error as e:
-            print(f"Error: {e}")
+            logger.error("Database error: %s", e)
 
     def select_from_database(self, sql, values=None):
         """
@@ -121,45 +222,9 @@ class Database:
         :return: List of rows
         """
         try:
-            cursor = self.create_connection_parser()
-            cursor.execute(sql, values or ())
+            cursor = self._execute(sql, values or ())
             result = cursor.fetchall()
             return result
         except Error as e:
-            print(f"Error: {e}")
+            logger.error("Database error: %s", e)
             return []
-
-    def _check_database_exist_if_db_error_occur(self):
-        config = self.load_config()
-
-        # Create a temporary connection without specifying a database
-        temp_config = config.copy()
-        temp_config.pop("database", None)  # Remove database from config to connect to MySQL server
-
-        try:
-            temp_connection = mysql.connector.connect(**temp_config, autocommit=True)
-            temp_cursor = temp_connection.cursor()
-
-            # Check if the database exists
-            temp_cursor.execute("SHOW DATABASES;")
-            databases = [db[0] for db in temp_cursor.fetchall()]
-
-            if DEFAULT_OB_NAME not in databases:
-                print(f"Database {DEFAULT_OB_NAME} not found. Creating...")
-                temp_cursor.execute(f"CREATE DATABASE {DEFAULT_OB_NAME};")
-
-            # Close the temporary connection
-            temp_cursor.close()
-            temp_connection.close()
-
-            # Update the config with the correct database name and reconnect
-            config['database'] = DEFAULT_OB_NAME
-            self.save_config(config)  # Save the updated config
-
-        except Error as e:
-            print(f"Error while checking/creating database: {e}")
-
-
-
-
-
@@ -0,0 +1,55 @@
+"""
+DDL for the raw mysql.connector layer, generated from the SQLAlchemy models so it cannot drift from them.
+The models (and Alembic migrations) stay the source of truth; this only bootstraps an empty database.
+"""
+import hashlib
+from functools import lru_cache
+
+from sqlalchemy.dialects import mysql
+from sqlalchemy.schema import CreateTable, CreateIndex
+
+from app.models.user_type import UserType
+from app.models.user import User
+from app.models.emergency_contact import EmergencyContact
+from app.models.parking_event import ParkingEvent
+from app.models.landmark import Landmark
+from app.models.score import Score
+
+# The tables the raw layer reads and writes, parents first
+RAW_LAYER_TABLES = (UserType, User, EmergencyContact, ParkingEvent, Landmark, Score)
+
+SCHEMA_VERSION_TABLE = 'SchemaVersion'
+CREATE_SCHEMA_VERSION_TABLE = f"""
+CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} (
+    fingerprint CHAR(64) PRIMARY KEY,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+@lru_cache(maxsize=None)
+def schema_statements():
+    """(table name, CREATE TABLE IF NOT EXISTS statement, CREATE INDEX statements) per raw-layer table."""
+    dialect = mysql.dialect()
+    statements = []
+    for model in RAW_LAYER_TABLES:
+        table = model.__table__
+        create_table = str(CreateTable(table, if_not_exists=True).compile(dialect=dialect)).strip()
+        create_indexes = tuple(
+            str(CreateIndex(index).compile(dialect=dialect)).strip()
+            for index in sorted(table.indexes, key=lambda index: index.name)
+        )
+        statements.append((table.name, create_table, create_indexes))
+    return tuple(statements)
+
+
+@lru_cache(maxsize=None)
+def schema_fingerprint():
+    """SHA-256 of the generated DDL; changes whenever a raw-layer model changes."""
+    digest = hashlib.sha256()
+    for _, create_table, create_indexes in schema_statements():
+        digest.update(create_table.encode('utf-8'))
+        for create_index in create_indexes:
+            digest.update(create_index.encode('utf-8'))
+    return digest.hexdigest()
+
@@ -0,0 +1,26 @@
+from app.extensions import db
+
+
+class AlertOutbox(db.Model):
+    """An emergency-contact email waiting to be sent by 'flask outbox dispatch-alerts'."""
+    __tablename__ = 'AlertOutbox'
+
+    alert_outbox_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    # Plain ids, not foreign keys: a queued alert must survive the event being deleted or archived
+    parking_events_id = db.Column(db.Integer, nullable=False)
+    emergency_id = db.Column(db.Integer, nullable=False)
+    recipient = db.Column(db.String(255), nullable=False)
+    subject = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    next_attempt_at = db.Column(db.TIMESTAMP, nullable=False, index=True)
+    last_error = db.Column(db.String(1024))
+    # Lease of the worker sending it; taken and committed before connecting to SMTP, so no row lock is held
+    locked_until = db.Column(db.TIMESTAMP, nullable=True)
+    locked_by = db.Column(db.String(32), nullable=True)  # Claim token of that worker
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.now())
+
+    __table_args__ = (
+        # One alert per contact and event, however often the status change is retried
+        db.UniqueConstraint('parking_events_id', 'emergency_id', name='uq_alert_event_contact'),
+    )
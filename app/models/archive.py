@@ -0,0 +1,34 @@
+from app.extensions import db
+from app.models.parking_event import ParkingEvent
+from app.models.landmark import Landmark
+from app.models.score import Score
+
+
+def _archive_table(source, name, *indexes):
+    """
+    Copy of a hot table's columns for archived rows. Keeps the original primary keys,
+    drops server defaults, auto-increment and foreign keys (archived rows only refer to other archived rows).
+    """
+    columns = [
+        db.Column(column.name, column.type, primary_key=column.primary_key,
+                  nullable=column.nullable, autoincrement=False)
+        for column in source.columns
+    ]
+    return db.Table(name, *columns, *indexes)
+
+
+# Finished parking events (and their landmarks and scores) older than the archive cut-off
+ParkingEventArchive = _archive_table(
+    ParkingEvent.__table__, 'ParkingEventArchive',
+    db.Index('ix_ParkingEventArchive_user_id_created_at', 'user_id', 'created_at'),
+)
+
+LandmarkArchive = _archive_table(
+    Landmark.__table__, 'LandmarkArchive',
+    db.Index('ix_LandmarkArchive_parking_events_id', 'parking_events_id'),
+)
+
+ScoreArchive = _archive_table(
+    Score.__table__, 'ScoreArchive',
+    db.Index('ix_ScoreArchive_parking_events_id', 'parking_events_id', unique=True),
+)
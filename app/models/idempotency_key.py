@@ -0,0 +1,19 @@
+from app.extensions import db
+
+
+class IdempotencyKey(db.Model):
+    __tablename__ = 'IdempotencyKey'
+
+    idempotency_keys_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('User.user_id'), nullable=False)
+    idempotency_key = db.Column(db.String(255), nullable=False)
+    request_method = db.Column(db.String(10), nullable=False)
+    request_path = db.Column(db.String(255), nullable=False)
+    response_status = db.Column(db.Integer, nullable=True)  # NULL while the first request is still running
+    response_body = db.Column(db.Text, nullable=True)
+    expires_at = db.Column(db.TIMESTAMP, nullable=False, index=True)
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.now())
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'idempotency_key', name='uq_idempotency_user_key'),
+    )
@@ -41,8 +41,13 @@ class ParkingEvent(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.TIMESTAMP, server_default=db.func.now())
     updated_at = db.Column(db.TIMESTAMP, server_default=db.func.now(), onupdate=db.func.now())
+    # Bumped on every update; PUT /parking/<id> applies changes only if it is unchanged since the read
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
 
     # Relationships
     user = db.relationship('User', back_populates='parking_events')
     landmarks = db.relationship("Landmark", back_populates='parking_event', cascade="all, delete-orphan")
-    score = db.relationship("Score", back_populates='parking_event', uselist=False, cascade="all, delete-orphan")
\ No newline at end of file
+    score = db.relationship("Score", back_populates='parking_event', uselist=False, cascade="all, delete-orphan")
+
+    # ORM flushes check and bump the same version column
+    __mapper_args__ = {'version_id_col': version}
\ No newline at end of file
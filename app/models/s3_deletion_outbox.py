@@ -0,0 +1,14 @@
+from app.extensions import db
+
+
+class S3DeletionOutbox(db.Model):
+    __tablename__ = 'S3DeletionOutbox'
+
+    s3_deletion_outbox_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    s3_key = db.Column(db.String(1024), nullable=False)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    last_error = db.Column(db.String(1024))
+    # Lease of the worker deleting it; taken and committed before the S3 call, so no row lock is held during it
+    locked_until = db.Column(db.TIMESTAMP, nullable=True)
+    locked_by = db.Column(db.String(32), nullable=True)  # Claim token of that worker
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.now())
@@ -18,6 +18,8 @@ class Score(db.Model):
     peek_penalty = db.Column(db.Integer, default=0)
     assist_penalty = db.Column(db.Integer, default=0)
     is_active = db.Column(db.Boolean, default=True)
+    # Set in the same transaction that adds the score to ScoreHistogram, so it is counted exactly once
+    counted_in_histogram = db.Column(db.Boolean, default=False, server_default=db.false(), nullable=False)
     created_at = db.Column(db.TIMESTAMP, server_default=db.func.now())
     updated_at = db.Column(db.TIMESTAMP, server_default=db.func.now(), onupdate=db.func.now())
 
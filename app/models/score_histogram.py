@@ -0,0 +1,17 @@
+from app.extensions import db
+
+
+class ScoreHistogram(db.Model):
+    """Number of task scores per 1-point bucket for a period ('YYYY-MM' or 'all'); see app.utils.score_histogram."""
+    __tablename__ = 'ScoreHistogram'
+
+    score_histograms_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    period = db.Column(db.String(7), nullable=False)
+    bucket = db.Column(db.SmallInteger, nullable=False)  # floor(task_score), 0-100
+    count = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.TIMESTAMP, server_default=db.func.now(), onupdate=db.func.now())
+
+    __table_args__ = (
+        # At most 101 rows per period, read together to answer a percentile
+        db.UniqueConstraint('period', 'bucket', name='uq_score_histogram_period_bucket'),
+    )
@@ -0,0 +1,32 @@
+from app.extensions import db
+from sqlalchemy.dialects import mysql
+import enum
+
+
+class ScoringJobStatusEnum(enum.Enum):
+    queued = 'queued'
+    running = 'running'
+    succeeded = 'succeeded'
+    failed = 'failed'
+
+
+class ScoringJob(db.Model):
+    __tablename__ = 'ScoringJob'
+
+    scoring_jobs_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    parking_events_id = db.Column(db.Integer, db.ForeignKey('ParkingEvent.parking_events_id'), unique=True,
+                                  nullable=False)
+    status = db.Column(db.Enum(ScoringJobStatusEnum), default=ScoringJobStatusEnum.queued, nullable=False)
+    # As sent with the 'retrieved' update; decoded by the worker. MEDIUMTEXT on MySQL, since a route of
+    # ROUTE_MAX_POINTS points is well past TEXT's 64 KB
+    route_polyline = db.Column(db.Text().with_variant(mysql.MEDIUMTEXT(), 'mysql'), nullable=True)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    run_after = db.Column(db.TIMESTAMP, nullable=False)  # Retries are pushed back with exponential backoff
+    locked_until = db.Column(db.TIMESTAMP, nullable=True)  # Lease of the worker running it; expired leases are retaken
+    last_error = db.Column(db.String(1024))
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.now())
+    updated_at = db.Column(db.TIMESTAMP, server_default=db.func.now(), onupdate=db.func.now())
+
+    __table_args__ = (
+        db.Index('ix_scoringjob_status_run_after', 'status', 'run_after'),
+    )
@@ -0,0 +1,17 @@
+from app.extensions import db
+
+
+class TrackPoint(db.Model):
+    """A GPS breadcrumb recorded while the user navigates back to their car."""
+    __tablename__ = 'TrackPoint'
+
+    # Kept deliberately narrow: navigation writes thousands of these per event
+    track_points_id = db.Column(db.BigInteger().with_variant(db.Integer, 'sqlite'), primary_key=True, autoincrement=True)
+    parking_events_id = db.Column(db.Integer, db.ForeignKey('ParkingEvent.parking_events_id'), nullable=False)
+    latitude = db.Column(db.Numeric(9, 6), nullable=False)
+    longitude = db.Column(db.Numeric(9, 6), nullable=False)
+    recorded_at = db.Column(db.TIMESTAMP, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_trackpoint_event_recorded', 'parking_events_id', 'recorded_at'),
+    )
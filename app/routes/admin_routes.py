@@ -0,0 +1,35 @@
+from flask import Blueprint, jsonify, request, current_app
+from flask_jwt_extended import jwt_required
+
+from app.utils.admin import admin_required
+from app.utils.slow_queries import slow_query_log
+
+admin_bp = Blueprint('admin_bp', __name__, url_prefix='/admin')
+
+
+@admin_bp.route('/slow-queries', methods=['GET'])  # Corresponds to GET /admin/slow-queries
+@jwt_required()
+@admin_required
+def get_slow_queries():
+    """Slow statements recorded by this process, newest first. ?limit= caps how many are returned."""
+    records = slow_query_log.records()
+
+    limit = request.args.get('limit', type=int)
+    if limit is not None:
+        if limit < 1:
+            return jsonify({"message": "limit must be a positive integer"}), 400
+        records = records[:limit]
+
+    return jsonify({
+        "threshold_ms": current_app.config.get('SLOW_QUERY_THRESHOLD_MS'),
+        "capacity": slow_query_log.capacity,
+        "slow_queries": records
+    }), 200
+
+
+@admin_bp.route('/slow-queries', methods=['DELETE'])  # Corresponds to DELETE /admin/slow-queries
+@jwt_required()
+@admin_required
+def clear_slow_queries():
+    slow_query_log.clear()
+    return jsonify({"message": "Slow query log cleared"}), 200
@@ -5,6 +5,7 @@ from app.models.emergency_contact import EmergencyContact
 from app.extensions import db
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.token_blocklist import TokenBlocklist
+from app.utils.read_replica import read_replica
 
 auth_bp = Blueprint('auth_bp', __name__, url_prefix='/auth')
 
@@ -76,6 +77,7 @@ def login():
 
 @auth_bp.route('/profile', methods=['GET'])
 @jwt_required()  # This decorator protects the endpoint
+@read_replica
 def get_profile():
     # Get the identity of the user from the access token (we stored user_id in it)
     current_user_id = get_jwt_identity()
@@ -0,0 +1,186 @@
+from flask import Blueprint, Response, current_app, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import select
+from app.models.parking_event import ParkingEvent
+from app.models.landmark import Landmark
+from app.models.score import Score
+from app.models.archive import ParkingEventArchive, LandmarkArchive, ScoreArchive
+from app.extensions import db
+from app.utils.read_replica import read_replica
+
+export_bp = Blueprint('export_bp', __name__, url_prefix='/export')
+
+# Parking events per chunk; the DB connection is released between chunks
+EXPORT_CHUNK_SIZE = 500
+
+EVENT_COLUMNS = (
+    'parking_events_id',
+    'parking_latitude',
+    'parking_longitude',
+    'parking_location_name',
+    'parking_address',
+    'parking_type',
+    'level_floor',
+    'parking_slot',
+    'notes',
+    'photo_s3_key',
+    'started_at',
+    'navigation_started_at',
+    'estimated_time',
+    'ended_at',
+    'finalScreenTime',
+    'finalMapViewCount',
+    'status',
+    'created_at',
+)
+
+SCORE_COLUMNS = (
+    'scores_id',
+    'time_factor',
+    'landmark_factor',
+    'path_performance',
+    'assistance_points',
+    'no_of_landmarks',
+    'landmarks_recalled',
+    'task_score',
+    'peek_penalty',
+    'assist_penalty',
+)
+
+LANDMARK_COLUMNS = (
+    'landmarks_id',
+    'parking_events_id',
+    'landmark_latitude',
+    'landmark_longitude',
+    'location_name',
+    'distance_from_parking',
+    'photo_s3_key',
+    'is_achieved',
+    'created_at',
+)
+
+# Archived (older) events first, then the hot tables; event ids are unique across both
+HISTORY_TABLES = (
+    (ParkingEventArchive, LandmarkArchive, ScoreArchive),
+    (ParkingEvent.__table__, Landmark.__table__, Score.__table__),
+)
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def _float(value):
+    return float(value) if value is not None else None
+
+
+def _landmark_to_dict(row):
+    return {
+        "landmarks_id": row.landmarks_id,
+        "landmark_latitude": _float(row.landmark_latitude),
+        "landmark_longitude": _float(row.landmark_longitude),
+        "location_name": row.location_name,
+        "distance_from_parking": row.distance_from_parking,
+        "photo_s3_key": row.photo_s3_key,
+        "is_achieved": row.is_achieved,
+        "created_at": _iso(row.created_at),
+    }
+
+
+def _event_to_dict(row, landmarks):
+    score_data = None
+    if row.scores_id is not None:
+        score_data = {
+            "scores_id": row.scores_id,
+            "time_factor": row.time_factor,
+            "landmark_factor": row.landmark_factor,
+            "path_performance": row.path_performance,
+            "assistance_points": row.assistance_points,
+            "no_of_landmarks": row.no_of_landmarks,
+            "landmarks_recalled": row.landmarks_recalled,
+            "task_score": row.task_score,
+            "peek_penalty": row.peek_penalty or 0,
+            "assist_penalty": row.assist_penalty or 0,
+            "created_at": _iso(row.score_created_at),
+        }
+
+    return {
+        "parking_events_id": row.parking_events_id,
+        "parking_latitude": _float(row.parking_latitude),
+        "parking_longitude": _float(row.parking_longitude),
+        "parking_location_name": row.parking_location_name,
+        "parking_address": row.parking_address,
+        "parking_type": row.parking_type.name if row.parking_type else None,  # Use .name for enums
+        "level_floor": row.level_floor,
+        "parking_slot": row.parking_slot,
+        "notes": row.notes,
+        "photo_s3_key": row.photo_s3_key,
+        "started_at": _iso(row.started_at),
+        "navigation_started_at": _iso(row.navigation_started_at),
+        "estimated_time": row.estimated_time,
+        "ended_at": _iso(row.ended_at),
+        "finalScreenTime": row.finalScreenTime,
+        "finalMapViewCount": row.finalMapViewCount,
+        "status": row.status.name if row.status else None,
+        "created_at": _iso(row.created_at),
+        "landmarks": landmarks,
+        "score": score_data,
+    }
+
+
+def iter_event_chunks(user_id, event_table, landmark_table, score_table, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield lists of (event row, landmark dicts) for a user's events in id order.
+    Each chunk is one keyset-paginated event query plus one grouped landmark query, after which the
+    session is closed so the connection goes back to the pool while the chunk is written out.
+    """
+    last_id = 0
+    while True:
+        events = db.session.execute(
+            select(
+                *(event_table.c[name] for name in EVENT_COLUMNS),
+                *(score_table.c[name] for name in SCORE_COLUMNS),
+                score_table.c.created_at.label('score_created_at'),
+            )
+            .outerjoin(score_table, score_table.c.parking_events_id == event_table.c.parking_events_id)
+            .where(event_table.c.user_id == user_id, event_table.c.parking_events_id > last_id)
+            .order_by(event_table.c.parking_events_id)
+            .limit(chunk_size)
+        ).all()
+        if not events:
+            break
+
+        event_ids = [row.parking_events_id for row in events]
+        landmarks_by_event = {event_id: [] for event_id in event_ids}
+        for landmark in db.session.execute(
+            select(*(landmark_table.c[name] for name in LANDMARK_COLUMNS))
+            .where(landmark_table.c.parking_events_id.in_(event_ids))
+            .order_by(landmark_table.c.parking_events_id, landmark_table.c.landmarks_id)
+        ):
+            landmarks_by_event[landmark.parking_events_id].append(_landmark_to_dict(landmark))
+
+        db.session.close()
+
+        yield [(row, landmarks_by_event[row.parking_events_id]) for row in events]
+
+        if len(events) < chunk_size:
+            break
+        last_id = event_ids[-1]
+
+
+@export_bp.route('', methods=['GET'])  # Corresponds to GET /export
+@jwt_required()
+@read_replica
+def export_history():
+    current_user_id = get_jwt_identity()
+
+    # One JSON document per line (NDJSON): a parking event with its landmarks and score embedded
+    def generate():
+        dumps = current_app.json.dumps
+        for tables in HISTORY_TABLES:
+            for chunk in iter_event_chunks(current_user_id, *tables):
+                yield ''.join(dumps(_event_to_dict(row, landmarks)) + '\n' for row, landmarks in chunk)
+
+    response = Response(stream_with_context(generate()), status=200, mimetype='application/x-ndjson')
+    response.headers['Content-Disposition'] = 'attachment; filename="memopark-export.ndjson"'
+    return response
@@ -0,0 +1,31 @@
+from flask import Blueprint, jsonify
+
+from app.extensions import db
+
+health_bp = Blueprint('health_bp', __name__, url_prefix='/health')
+
+
+def get_pool_stats():
+    """Return connection pool counters for each SQLAlchemy engine (primary and read replica)."""
+    all_stats = {}
+    for bind_key, engine in db.engines.items():
+        pool = engine.pool
+        stats = {"pool_class": type(pool).__name__}
+
+        # Only queue-style pools (MySQL) keep these counters; SQLite pools do not
+        for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+            counter = getattr(pool, name, None)
+            if callable(counter):
+                stats[name] = counter()
+
+        all_stats[bind_key or 'primary'] = stats
+
+    return all_stats
+
+
+@health_bp.route('', methods=['GET'])  # Corresponds to GET /health
+def health_check():
+    return jsonify({
+        "status": "ok",
+        "db_pool": get_pool_stats()
+    }), 200
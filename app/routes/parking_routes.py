@@ -1,24 +1,55 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
-from app.models.parking_event import ParkingEvent
+from app.models.parking_event import ParkingEvent, StatusEnum
 from app.models.landmark import Landmark
 from app.models.score import Score
+from app.models.archive import ParkingEventArchive
+from app.models.scoring_job import ScoringJob, ScoringJobStatusEnum
 
 from app.extensions import db
+from sqlalchemy import select, union_all
+from app.utils.idempotency import idempotent
+from app.utils.read_replica import read_replica
+from app.utils.s3 import get_s3_client
+from app.utils.archive import find_archived_event
+from app.utils.event_deletion import delete_parking_events
+from app.utils.tracking import parse_track_points, record_track_points, parse_route_polyline
+from app.utils.event_state import compare_and_swap, set_event_fields
+from app.utils.scoring_jobs import PENDING_STATUSES, enqueue_scoring_job, wake_scoring_workers
+from app.utils.alerts import queue_navigation_alerts
+from app.utils.fieldsets import parse_fieldset
+from app.utils.score_histogram import record_score_in_histogram
 import datetime
+import enum
+import logging
 
-import boto3
-from botocore.exceptions import NoCredentialsError
 from flask import current_app
 import time
 
 # Create a Blueprint for parking routes
 parking_bp = Blueprint('parking_bp', __name__, url_prefix='/parking')
+logger = logging.getLogger(__name__)
+
+# Response fields of GET /parking; each is a column of ParkingEvent, so ?fields= narrows the SELECT too
+EVENT_LIST_FIELDS = ('parking_events_id', 'parking_location_name', 'notes', 'started_at', 'status')
+
+# Response fields of GET /parking/<id> and GET /parking/latest-active
+EVENT_DETAIL_FIELDS = (
+    'parking_events_id', 'user_id', 'parking_latitude', 'parking_longitude', 'parking_location_name',
+    'parking_address', 'notes', 'parking_type', 'level_floor', 'parking_slot', 'photo_url', 'started_at',
+    'ended_at', 'status', 'landmarks', 'score',
+)
+LATEST_ACTIVE_FIELDS = tuple(
+    name for name in EVENT_DETAIL_FIELDS if name not in ('parking_address', 'parking_slot', 'ended_at')
+)
+# ?include= values -> the response field they expand. 'photo' also covers the landmark photos.
+EVENT_INCLUDES = {'landmarks': 'landmarks', 'score': 'score', 'photo': 'photo_url'}
 
 # add parking
 @parking_bp.route('', methods=['POST'])  # Corresponds to POST /parking
 @jwt_required()
+@idempotent
 def create_parking_event():
     current_user_id = get_jwt_identity()
     data = request.get_json()
@@ -71,77 +102,84 @@ def create_parking_event():
 
 @parking_bp.route('', methods=['GET']) # Corresponds to GET /parking
 @jwt_required()
+@read_replica
 def get_all_parking_events():
     current_user_id = get_jwt_identity()
 
-    # Query the database for all events belonging to the current user
-    user_events = ParkingEvent.query.filter_by(user_id=current_user_id).order_by(ParkingEvent.created_at.desc()).all()
+    try:
+        fields = parse_fieldset(EVENT_LIST_FIELDS, always=('parking_events_id',))
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    fields = [name for name in EVENT_LIST_FIELDS if name in fields]
+
+    # Query the database for all events belonging to the current user, including archived ones.
+    # created_at is only selected for the ordering.
+    user_events = union_all(*(
+        select(
+            *(event_table.c[name] for name in fields),
+            event_table.c.created_at,
+        ).where(event_table.c.user_id == current_user_id)
+        for event_table in (ParkingEvent.__table__, ParkingEventArchive)
+    )).subquery()
+    user_events = db.session.execute(select(user_events).order_by(
+        user_events.c.created_at.desc(), user_events.c.parking_events_id.desc()
+    )).all()
 
     # Serialize the list of event objects into a list of dictionaries
     events_list = []
     for event in user_events:
-        events_list.append({
-            "parking_events_id": event.parking_events_id,
-            "parking_location_name": event.parking_location_name,
-            "notes": event.notes,
-            "started_at": event.started_at.isoformat(),
-            "status": event.status.name
-        })
+        event_data = event._asdict()
+        del event_data['created_at']
+        if 'started_at' in event_data:
+            event_data['started_at'] = event.started_at.isoformat()
+        if 'status' in event_data:
+            event_data['status'] = event.status.name
+        events_list.append(event_data)
 
     return jsonify(events_list), 200
 
 
 @parking_bp.route('/<int:event_id>', methods=['GET'])
 @jwt_required()
+@read_replica
 def get_single_parking_event(event_id):
     current_user_id = get_jwt_identity()
 
+    try:
+        fields = parse_fieldset(EVENT_DETAIL_FIELDS, EVENT_INCLUDES, always=('parking_events_id',))
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
     # Query for the specific event, ensuring it belongs to the current user
     event = ParkingEvent.query.filter_by(
         parking_events_id=event_id,
         user_id=current_user_id
     ).first()
 
+    # Older finished events live in the archive tables
+    if not event:
+        event = find_archived_event(current_user_id, event_id,
+                                    with_landmarks='landmarks' in fields, with_score='score' in fields)
+
     if not event:
         return jsonify({"message": "Parking event not found"}), 404
 
     # --- Generate Pre-signed URL for the photo ---
     photo_url = None
-    if event.photo_s3_key:
-        s3_client = boto3.client(
-           "s3",
-           aws_access_key_id=current_app.config['AWS_ACCESS_KEY_ID'],
-           aws_secret_access_key=current_app.config['AWS_SECRET_ACCESS_KEY'],
-           region_name=current_app.config['AWS_REGION']
-        )
+    if 'photo_url' in fields and event.photo_s3_key:
+        s3_client = get_s3_client()
         try:
             photo_url = s3_client.generate_presigned_url(
                 'get_object',
                 Params={'Bucket': current_app.config['S3_BUCKET'], 'Key': event.photo_s3_key},
                 ExpiresIn=3600  # URL is valid for 1 hour
             )
-        except Exception as e:
+        except Exception:
             # Handle potential S3 errors gracefully
-            print(f"Error generating pre-signed URL: {e}")
+            logger.warning("Error generating pre-signed URL", exc_info=True,
+                           extra={"fields": {"parking_events_id": event.parking_events_id}})
             photo_url = None
 
-    # --- Serialize related landmarks ---
-    landmarks_list = []
-    for landmark in event.landmarks:
-        landmarks_list.append({
-            "landmarks_id": landmark.landmarks_id,
-            "location_name": landmark.location_name,
-            "is_achieved": landmark.is_achieved
-        })
-
-    # --- Serialize related score ---
-    score_data = None
-    if event.score:
-        score_data = {
-            "scores_id": event.score.scores_id,
-            "task_score": event.score.task_score
-        }
-
     # --- Build the final response object ---
     response_data = {
         "parking_events_id": event.parking_events_id,
@@ -158,12 +196,111 @@ def get_single_parking_event(event_id):
         "started_at": event.started_at.isoformat(),
         "ended_at": event.ended_at,
         "status": event.status.name,
-        "landmarks": landmarks_list,
-        "score": score_data
     }
+    response_data = {key: value for key, value in response_data.items() if key in fields}
+
+    # Relationships are only loaded when requested
+    # --- Serialize related landmarks ---
+    if 'landmarks' in fields:
+        response_data["landmarks"] = [{
+            "landmarks_id": landmark.landmarks_id,
+            "location_name": landmark.location_name,
+            "is_achieved": landmark.is_achieved
+        } for landmark in event.landmarks]
+
+    # --- Serialize related score ---
+    if 'score' in fields:
+        response_data["score"] = {
+            "scores_id": event.score.scores_id,
+            "task_score": event.score.task_score
+        } if event.score else None
 
     return jsonify(response_data), 200
 
+@parking_bp.route('/<int:event_id>', methods=['DELETE'])  # Corresponds to DELETE /parking/<id>
+@jwt_required()
+def delete_parking_event(event_id):
+    current_user_id = get_jwt_identity()
+
+    # Rows go now; photos are removed from S3 later by the outbox worker
+    try:
+        deleted_ids = delete_parking_events(current_user_id, [event_id])
+    except Exception:
+        logger.exception("Error deleting parking event", extra={"fields": {"parking_events_id": event_id}})
+        return jsonify({"message": "Database error occurred"}), 500
+
+    if not deleted_ids:
+        return jsonify({"message": "Parking event not found"}), 404
+
+    return jsonify({"message": f"Event {event_id} deleted successfully"}), 200
+
+
+@parking_bp.route('/bulk-delete', methods=['POST'])  # Corresponds to POST /parking/bulk-delete
+@jwt_required()
+def bulk_delete_parking_events():
+    current_user_id = get_jwt_identity()
+    data = request.get_json()
+
+    event_ids = data.get('parking_events_ids') if data else None
+    if not isinstance(event_ids, list) or not all(isinstance(event_id, int) for event_id in event_ids):
+        return jsonify({"message": "Request body must contain a 'parking_events_ids' array of integers"}), 400
+
+    max_ids = current_app.config['BULK_DELETE_MAX_EVENTS']
+    if len(event_ids) > max_ids:
+        return jsonify({"message": f"At most {max_ids} events can be deleted per request"}), 400
+
+    try:
+        deleted_ids = delete_parking_events(current_user_id, event_ids) if event_ids else []
+    except Exception:
+        logger.exception("Error deleting parking events", extra={"fields": {"count": len(event_ids)}})
+        return jsonify({"message": "Database error occurred"}), 500
+
+    return jsonify({
+        "message": f"{len(deleted_ids)} events deleted successfully",
+        "deleted_ids": sorted(deleted_ids)
+    }), 200
+
+
+def _scoring_accepted(event_id):
+    return jsonify({
+        "message": "Score is being calculated",
+        "scoring_job_url": f"/parking/{event_id}/scoring-job"
+    }), 202
+
+
+# Timestamps the server sets on a status change; a retried request gets them from the write that won
+SERVER_SET_FIELDS = ('navigation_started_at', 'ended_at')
+
+
+def _already_applied(event, changes):
+    """True if the event already holds every change the request asked for."""
+    for name, value in changes.items():
+        if name in SERVER_SET_FIELDS:
+            continue
+        current = getattr(event, name)
+        if (current.name if isinstance(current, enum.Enum) else current) != value:
+            return False
+    return True
+
+
+def _lost_update_response(event_id, changes):
+    """Answer a PUT whose compare-and-swap lost to a concurrent update of the same event."""
+    requested_status = changes.get('status')
+    event = db.session.get(ParkingEvent, event_id)
+    if not event:
+        return jsonify({"message": "Parking event not found"}), 404
+
+    # A retry of the write that won (same status and same values) is not an error; anything else
+    # would silently drop this request's changes, so it is a conflict
+    if requested_status is not None and _already_applied(event, changes):
+        # For a retried 'retrieved', the request that won the race queued the scoring
+        if requested_status == 'retrieved' and not event.score:
+            return _scoring_accepted(event_id)
+        return jsonify({"message": f"Event {event_id} updated successfully"}), 200
+
+    return jsonify({"message": "Parking event was changed by another request; reload it and retry"}), 409
+
+
 @parking_bp.route('/<int:event_id>', methods=['PUT'])  # Corresponds to PUT /parking/<id>
 @jwt_required()
 def update_parking_event(event_id):
@@ -179,20 +316,24 @@ def update_parking_event(event_id):
         return jsonify({"message": "Parking event not found"}), 404
 
     data = request.get_json()
+    now = datetime.datetime.now(datetime.timezone.utc)
+
+    # Changes are collected first and applied with one compare-and-swap on event.version,
+    # so a concurrent request that changed the event in the meantime is detected, not overwritten
+    changes = {}
+    needs_score = False
 
     # Update fields if they are provided in the request body
     if 'status' in data:
         new_status = data['status']
-        event.status = new_status
+        changes['status'] = new_status
 
         # If user starts navigating, set the navigation start time
         if new_status == 'retrieving':
-            event.navigation_started_at = datetime.datetime.now(datetime.timezone.utc)
-            print(f" retrieving - navigation_started_at: {event.navigation_started_at}")
+            changes['navigation_started_at'] = now
             if 'estimated_time' in data:
                 try:
-                    event.estimated_time = int(data['estimated_time'])
-                    print(f" retrieving - estimated_time: {event.estimated_time}")
+                    changes['estimated_time'] = int(data['estimated_time'])
                 except (ValueError, TypeError):
                     return jsonify({"message": "Invalid format for estimated_time"}), 400
 
@@ -200,201 +341,105 @@ def update_parking_event(event_id):
         elif new_status in ['retrieved', 'expired']:
             # Set end time only if not already set (important for idempotency)
             if not event.ended_at:
-                event.ended_at = datetime.datetime.now(datetime.timezone.utc)
+                changes['ended_at'] = now
 
             # --- Save Final Metrics ---
             if 'finalScreenTime' in data:
                 try:
                     screen_time_ms = int(data['finalScreenTime'])
-                    event.finalScreenTime = screen_time_ms // 1000  # Convert ms to seconds
+                    changes['finalScreenTime'] = screen_time_ms // 1000  # Convert ms to seconds
                 except (ValueError, TypeError):
                     return jsonify({"message": "Invalid format for finalScreenTime"}), 400
 
             if 'finalMapViewCount' in data:
                 try:
-                    event.finalMapViewCount = int(data['finalMapViewCount'])
+                    changes['finalMapViewCount'] = int(data['finalMapViewCount'])
                 except (ValueError, TypeError):
                     return jsonify({"message": "Invalid format for finalMapViewCount"}), 400
 
             # ===== HANDLE 'RETRIEVED' STATUS =====
-            if new_status == 'retrieved':
-
-                # Calculate Score (Only if no score exists)
-                if not event.score:
+            # Queue the score calculation (Only if no score exists or is on its way)
+            if new_status == 'retrieved' and not event.score:
+                job = ScoringJob.query.filter_by(parking_events_id=event_id).first()
+                if job and job.status in PENDING_STATUSES:
+                    return _scoring_accepted(event_id)
+
+                # The walked route comes from 'route_polyline' or, if absent, from POST /parking/<id>/track.
+                # It is checked here, so a bad polyline is a 400 rather than a failed job
+                if data.get('route_polyline') is not None:
                     try:
-                        # ===== 1. LANDMARK SCORE =====
-                        total_landmarks = len(event.landmarks)
-                        achieved_landmarks = sum(1 for lm in event.landmarks if lm.is_achieved)
-                        has_landmarks = total_landmarks > 0
-
-                        landmark_factor = 0.0
-                        if total_landmarks > 0:
-                            landmark_factor = (float(achieved_landmarks) / float(total_landmarks)) * 100.0
-                        else:
-                            landmark_factor = 100.0
-
-                        # ===== 2. TIME SCORE =====
-                        actual_duration = None
-                        if event.ended_at and event.navigation_started_at:
-                            ended_at_aware = event.ended_at
-                            if ended_at_aware.tzinfo is None:
-                                ended_at_aware = ended_at_aware.replace(tzinfo=datetime.timezone.utc)
-
-                            nav_started_at_aware = event.navigation_started_at
-                            if nav_started_at_aware.tzinfo is None:
-                                nav_started_at_aware = nav_started_at_aware.replace(tzinfo=datetime.timezone.utc)
-
-                            actual_duration = (ended_at_aware - nav_started_at_aware).total_seconds()
-
-                        estimated_duration = event.estimated_time
-
-                        time_factor = 0.0
-                        if actual_duration and estimated_duration and estimated_duration > 0:
-                            if actual_duration <= estimated_duration:
-                                time_factor = 100.0
-                            else:
-                                overtime_ratio = (actual_duration - float(estimated_duration)) / float(
-                                    estimated_duration)
-                                time_factor = max(0.0, 100.0 - (overtime_ratio * 100.0))
-
-                        # ===== 3. PENALTIES =====
-                        map_view_count = event.finalMapViewCount or 0
-
-                        # Peek penalty
-                        if map_view_count == 0:
-                            peek_penalty_points = 0.0
-                        elif map_view_count <= 3:
-                            peek_penalty_points = float(map_view_count * 1)
-                        elif map_view_count <= 7:
-                            peek_penalty_points = 3.0 + float((map_view_count - 3) * 1.5)
-                        else:
-                            peek_penalty_points = min(10.0, 9.0 + float((map_view_count - 7)) * 0.5)
-
-                        # CRITICAL FIX: Cap screen time at actual duration
-                        screen_time_raw = float(event.finalScreenTime or 0)
-                        screen_time = screen_time_raw
-                        assist_percentage = 0.0
-
-                        if actual_duration and actual_duration > 0:
-                            # Cap screen time - it cannot exceed navigation time!
-                            if screen_time_raw > actual_duration:
-                                print(
-                                    f"⚠️ WARNING: Screen time {screen_time_raw}s exceeds navigation {actual_duration}s")
-                                screen_time = actual_duration
-                                print(f"⚠️ Screen time capped to {screen_time}s (100% of navigation)")
-
-                            # Calculate percentage using CAPPED screen time
-                            assist_percentage = (screen_time / float(actual_duration)) * 100.0
-                            assist_penalty_points = min(15.0, (assist_percentage / 5.0))
-                        else:
-                            # Fallback if no duration available
-                            assist_penalty_points = min(15.0, screen_time / 20.0)
-                            if screen_time > 0:
-                                assist_percentage = 100.0  # Assume worst case
-
-                        # ===== 4. PATH PERFORMANCE =====
-                        path_performance = 100.0 - (peek_penalty_points * 1.0) - (assist_penalty_points * 0.2)
-                        path_performance = max(0.0, min(100.0, path_performance))
-
-                        # ===== 5. CALCULATE FINAL SCORE =====
-                        if has_landmarks:
-                            base_score = (
-                                    (landmark_factor * 0.50) +
-                                    (time_factor * 0.30) +
-                                    (path_performance * 0.20)
-                            )
-                        else:
-                            base_score = (
-                                    (time_factor * 0.60) +
-                                    (path_performance * 0.40)
-                            )
-
-                        # Apply penalties
-                        total_penalty = peek_penalty_points
-                        final_task_score = max(0.0, base_score - total_penalty)
-
-                        # Enhanced Debug logging
-                        print("=== SCORE CALCULATION DEBUG ===")
-                        print(f"Has Landmarks: {has_landmarks}")
-                        print(f"Achieved Landmarks: {achieved_landmarks}/{total_landmarks}")
-                        print(f"Actual Duration: {actual_duration}s vs Estimated: {estimated_duration}s")
-                        print(f"---")
-                        print(f"Map View Count: {map_view_count}")
-                        print(f"Screen Time (raw): {screen_time_raw}s")
-                        print(f"Screen Time (used): {screen_time}s")
-                        print(f"Screen Time %: {round(assist_percentage, 1)}%")
-                        print(f"---")
-
-                        if has_landmarks:
-                            print(f"Landmark Factor: {round(landmark_factor, 2)}% (Weight: 50%)")
-                            print(f"Time Factor: {round(time_factor, 2)}% (Weight: 30%)")
-                            print(f"Path Performance: {round(path_performance, 2)}% (Weight: 20%)")
-                            print(
-                                f"Base Score: {round(base_score, 2)} = ({round(landmark_factor, 2)} × 0.5) + ({round(time_factor, 2)} × 0.3) + ({round(path_performance, 2)} × 0.2)")
-                        else:
-                            print(f"Landmark Factor: N/A (No landmarks on this route)")
-                            print(f"Time Factor: {round(time_factor, 2)}% (Weight: 60%)")
-                            print(f"Path Performance: {round(path_performance, 2)}% (Weight: 40%)")
-                            print(
-                                f"Base Score: {round(base_score, 2)} = ({round(time_factor, 2)} × 0.6) + ({round(path_performance, 2)} × 0.4)")
-
-                        print(f"---")
-                        print(f"Peek Penalty: {round(peek_penalty_points, 2)} pts (max 10)")
-                        print(f"Assist Penalty: {round(assist_penalty_points, 2)} pts (max 15)")
-                        print(f"Total Penalty: {round(total_penalty, 2)} pts")
-                        print(f"---")
-                        print(f"FINAL SCORE: {round(final_task_score, 2)}")
-                        print("================================")
-
-                        # ===== 6. CREATE SCORE OBJECT =====
-                        new_score = Score(
-                            parking_events_id=event_id,
-                            time_factor=round(time_factor, 2),
-                            landmark_factor=round(landmark_factor, 2),
-                            landmarks_recalled=achieved_landmarks,
-                            no_of_landmarks=total_landmarks,
-                            path_performance=round(path_performance, 2),
-                            peek_penalty=int(map_view_count),
-                            assist_penalty=int(screen_time),  # Use CAPPED value
-                            task_score=round(final_task_score, 2),
-                            assistance_points=int(event.finalMapViewCount or 0),
-                        )
-                        db.session.add(new_score)
+                        parse_route_polyline(data['route_polyline'])
+                    except ValueError as e:
+                        return jsonify({"message": f"Invalid route_polyline: {e}"}), 400
 
-                        # ✅ Score calculated successfully
-                        event.status = 'active'
-                        print("✅ Score calculated successfully. Status set to 'active'.")
-
-                    except Exception as e:
-                        print(f"❌ Error calculating score: {str(e)}")
-                        # Don't set status to 'active' if calculation failed
-                        return jsonify({"message": f"Error calculating score: {str(e)}"}), 500
-
-                else:
-                    # Score already exists - user wants to view it again
-                    # event.status = 'active'
-                    print("ℹ️ Score already exists.")
-
-            # ===== HANDLE 'EXPIRED' STATUS =====
-            elif new_status == 'expired':
-                event.status = 'expired'
-                print("⏰ Navigation expired. Status set to 'expired'.")
+                needs_score = True
 
     if 'notes' in data:
-        event.notes = data['notes']
+        changes['notes'] = data['notes']
+
+    if not changes:
+        return jsonify({"message": f"Event {event_id} updated successfully"}), 200
 
     try:
+        won = compare_and_swap(event_id, event.version, **changes)
+        if won and needs_score:
+            # Queued in the same transaction, so an accepted retrieval is never left without a job
+            enqueue_scoring_job(event_id, data.get('route_polyline'), now)
+        if won and changes.get('status') == 'expired' and event.status != StatusEnum.expired:
+            # Emails go out later from the outbox ('flask outbox dispatch-alerts'), never from the request.
+            # Only on the change to 'expired': a sent alert leaves the outbox, so a retried PUT would resend it
+            queue_navigation_alerts(event, 'expired', now)
         db.session.commit()
-    except Exception as e:
+    except Exception:
         db.session.rollback()  # Rollback in case of error
-        print(f"Error during commit: {e}")
+        logger.exception("Error during commit", extra={"fields": {"parking_events_id": event_id}})
         return jsonify({"message": "Database error occurred"}), 500
 
+    if not won:
+        return _lost_update_response(event_id, changes)
+
+    if needs_score:
+        # ===== SCORE IS CALCULATED BY THE WORKER POOL (see app/utils/scoring_jobs.py) =====
+        wake_scoring_workers()
+        return _scoring_accepted(event_id)
+
     return jsonify({"message": f"Event {event_id} updated successfully"}), 200
 
+
+@parking_bp.route('/<int:event_id>/scoring-job', methods=['GET'])  # Corresponds to GET /parking/<id>/scoring-job
+@jwt_required()
+def get_scoring_job(event_id):
+    current_user_id = get_jwt_identity()
+
+    job = ScoringJob.query.join(
+        ParkingEvent, ParkingEvent.parking_events_id == ScoringJob.parking_events_id
+    ).filter(
+        ScoringJob.parking_events_id == event_id,
+        ParkingEvent.user_id == current_user_id
+    ).first()
+
+    if not job:
+        return jsonify({"message": "Scoring job not found"}), 404
+
+    response_data = {
+        "parking_events_id": job.parking_events_id,
+        "status": job.status.name,
+        "attempts": job.attempts,
+        "scores_id": None,
+        "error": job.last_error if job.status == ScoringJobStatusEnum.failed else None
+    }
+    if job.status == ScoringJobStatusEnum.succeeded:
+        # The score itself is read from GET /scores
+        response_data["scores_id"] = db.session.execute(
+            select(Score.scores_id).where(Score.parking_events_id == event_id)
+        ).scalar()
+
+    return jsonify(response_data), 200
+
 # add landmarks
 @parking_bp.route('/<int:event_id>/landmarks', methods=['POST'])
 @jwt_required()
+@idempotent
 def add_landmarks_to_event(event_id):
     current_user_id = get_jwt_identity()
 
@@ -436,6 +481,51 @@ def add_landmarks_to_event(event_id):
     }), 201
 
 
+@parking_bp.route('/<int:event_id>/track', methods=['POST'])  # Corresponds to POST /parking/<id>/track
+@jwt_required()
+@idempotent
+def track_parking_event(event_id):
+    current_user_id = get_jwt_identity()
+
+    parking_event = ParkingEvent.query.filter_by(
+        parking_events_id=event_id,
+        user_id=current_user_id
+    ).first()
+
+    if not parking_event:
+        return jsonify({"message": "Parking event not found"}), 404
+
+    if parking_event.status != StatusEnum.retrieving:
+        return jsonify({"message": "Points can only be tracked while the event is 'retrieving'"}), 409
+
+    data = request.get_json()
+    points = data.get('points') if data else None
+    if not isinstance(points, list) or not points:
+        return jsonify({"message": "Request body must contain a non-empty 'points' array"}), 400
+
+    max_points = current_app.config['TRACK_MAX_POINTS_PER_BATCH']
+    if len(points) > max_points:
+        return jsonify({"message": f"At most {max_points} points can be sent per request"}), 400
+
+    try:
+        latitudes, longitudes, timestamps = parse_track_points(points)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    try:
+        achieved_ids = record_track_points(parking_event, latitudes, longitudes, timestamps)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        logger.exception("Error recording track points", extra={"fields": {"parking_events_id": event_id}})
+        return jsonify({"message": "Database error occurred"}), 500
+
+    return jsonify({
+        "message": f"{len(points)} points recorded for event {event_id}",
+        "achieved_landmarks_ids": achieved_ids
+    }), 201
+
+
 @parking_bp.route('/<int:event_id>/score', methods=['POST'])
 @jwt_required()
 def add_score_to_event(event_id):
@@ -471,6 +561,8 @@ def add_score_to_event(event_id):
     )
 
     db.session.add(new_score)
+    db.session.flush()
+    record_score_in_histogram(event_id, new_score.task_score)
     db.session.commit()
 
     # Create a dictionary for the response
@@ -499,14 +591,10 @@ def upload_photo_to_event(event_id):
     if not event:
         return jsonify({"message": "Parking event not found"}), 404
 
-    s3_key = f"user_{current_user_id}/parking_{int(time.time())}_{file.filename}"
+    # The event id keeps keys unique per event, so deleting one event never removes another event's photo
+    s3_key = f"user_{current_user_id}/parking_{event_id}_{int(time.time())}_{file.filename}"
 
-    s3_client = boto3.client(
-        "s3",
-        aws_access_key_id=current_app.config['AWS_ACCESS_KEY_ID'],
-        aws_secret_access_key=current_app.config['AWS_SECRET_ACCESS_KEY'],
-        region_name=current_app.config['AWS_REGION']
-    )
+    s3_client = get_s3_client()
 
     try:
         s3_client.upload_fileobj(
@@ -521,7 +609,10 @@ def upload_photo_to_event(event_id):
     # --- CHANGES START HERE ---
 
     # We no longer save a static photo_url. We only need the key.
-    event.photo_s3_key = s3_key
+    # Written with one UPDATE rather than an ORM flush, so a concurrent PUT does not turn it into a 500
+    if not set_event_fields(event_id, photo_s3_key=s3_key):
+        db.session.rollback()
+        return jsonify({"message": "Parking event not found"}), 404
     db.session.commit()
 
     return jsonify({
@@ -531,9 +622,15 @@ def upload_photo_to_event(event_id):
 
 @parking_bp.route('/latest-active', methods=['GET'])
 @jwt_required()
+@read_replica
 def get_latest_active_parking_event():
     current_user_id = get_jwt_identity()
 
+    try:
+        fields = parse_fieldset(LATEST_ACTIVE_FIELDS, EVENT_INCLUDES, always=('parking_events_id',))
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
     event = ParkingEvent.query.filter_by(
         user_id=current_user_id
     ).order_by(ParkingEvent.started_at.desc()).first()
@@ -541,68 +638,24 @@ def get_latest_active_parking_event():
     if not event or event.status.name not in ['active', 'retrieving']:
         return jsonify({}), 200
 
+    # Photos (the event's and its landmarks') are only presigned when the photo is requested
+    presign_photos = 'photo_url' in fields
+
     # --- S3 Client Setup (to be used for all pre-signed URLs) ---
-    s3_client = boto3.client(
-       "s3",
-       aws_access_key_id=current_app.config['AWS_ACCESS_KEY_ID'],
-       aws_secret_access_key=current_app.config['AWS_SECRET_ACCESS_KEY'],
-       region_name=current_app.config['AWS_REGION']
-    )
+    s3_client = get_s3_client() if presign_photos else None
 
     # --- Generate Pre-signed URL for the main parking event photo ---
     main_photo_url = None
-    if event.photo_s3_key:
+    if presign_photos and event.photo_s3_key:
         try:
             main_photo_url = s3_client.generate_presigned_url(
                 'get_object',
                 Params={'Bucket': current_app.config['S3_BUCKET'], 'Key': event.photo_s3_key},
                 ExpiresIn=3600
             )
-        except Exception as e:
-            print(f"Error generating pre-signed URL for event: {e}")
-
-    # --- Fully Serialize related landmarks ---
-    landmarks_list = []
-    for landmark in event.landmarks:
-        landmark_photo_url = None
-        if landmark.photo_s3_key:
-            try:
-                landmark_photo_url = s3_client.generate_presigned_url(
-                    'get_object',
-                    Params={'Bucket': current_app.config['S3_BUCKET'], 'Key': landmark.photo_s3_key},
-                    ExpiresIn=3600
-                )
-            except Exception as e:
-                print(f"Error generating pre-signed URL for landmark: {e}")
-
-        landmarks_list.append({
-            "landmarks_id": landmark.landmarks_id,
-            "parking_events_id": landmark.parking_events_id,
-            "landmark_latitude": float(landmark.landmark_latitude) if landmark.landmark_latitude else None,
-            "landmark_longitude": float(landmark.landmark_longitude) if landmark.landmark_longitude else None,
-            "location_name": landmark.location_name,
-            "distance_from_parking": landmark.distance_from_parking,
-            "photo_url": landmark_photo_url,
-            "is_achieved": landmark.is_achieved,
-            "created_at": landmark.created_at.isoformat()
-        })
-
-    # --- Fully Serialize related score ---
-    score_data = None
-    if event.score:
-        score = event.score
-        score_data = {
-            "scores_id": score.scores_id,
-            "parking_events_id": score.parking_events_id,
-            "time_factor": score.time_factor,
-            "landmark_factor": score.landmark_factor,
-            "path_performance": score.path_performance,
-            "assistance_points": score.assistance_points,
-            "no_of_landmarks": score.no_of_landmarks,
-            "landmarks_recalled": score.landmarks_recalled,
-            "task_score": score.task_score,
-            "created_at": score.created_at.isoformat()
-        }
+        except Exception:
+            logger.warning("Error generating pre-signed URL for event", exc_info=True,
+                           extra={"fields": {"parking_events_id": event.parking_events_id}})
 
     # --- Build the final response object ---
     response_data = {
@@ -617,9 +670,59 @@ def get_latest_active_parking_event():
         "photo_url": main_photo_url,
         "started_at": event.started_at.isoformat(),
         "status": event.status.name,
-        "landmarks": landmarks_list,
-        "score": score_data
     }
+    response_data = {key: value for key, value in response_data.items() if key in fields}
+
+    # Relationships are only loaded when requested
+    # --- Fully Serialize related landmarks ---
+    if 'landmarks' in fields:
+        landmarks_list = []
+        for landmark in event.landmarks:
+            landmark_data = {
+                "landmarks_id": landmark.landmarks_id,
+                "parking_events_id": landmark.parking_events_id,
+                "landmark_latitude": float(landmark.landmark_latitude) if landmark.landmark_latitude else None,
+                "landmark_longitude": float(landmark.landmark_longitude) if landmark.landmark_longitude else None,
+                "location_name": landmark.location_name,
+                "distance_from_parking": landmark.distance_from_parking,
+                "is_achieved": landmark.is_achieved,
+                "created_at": landmark.created_at.isoformat()
+            }
+
+            if presign_photos:
+                landmark_data["photo_url"] = None
+                if landmark.photo_s3_key:
+                    try:
+                        landmark_data["photo_url"] = s3_client.generate_presigned_url(
+                            'get_object',
+                            Params={'Bucket': current_app.config['S3_BUCKET'], 'Key': landmark.photo_s3_key},
+                            ExpiresIn=3600
+                        )
+                    except Exception:
+                        logger.warning("Error generating pre-signed URL for landmark", exc_info=True,
+                                       extra={"fields": {"landmarks_id": landmark.landmarks_id}})
+
+            landmarks_list.append(landmark_data)
+        response_data["landmarks"] = landmarks_list
+
+    # --- Fully Serialize related score ---
+    if 'score' in fields:
+        score_data = None
+        if event.score:
+            score = event.score
+            score_data = {
+                "scores_id": score.scores_id,
+                "parking_events_id": score.parking_events_id,
+                "time_factor": score.time_factor,
+                "landmark_factor": score.landmark_factor,
+                "path_performance": score.path_performance,
+                "assistance_points": score.assistance_points,
+                "no_of_landmarks": score.no_of_landmarks,
+                "landmarks_recalled": score.landmarks_recalled,
+                "task_score": score.task_score,
+                "created_at": score.created_at.isoformat()
+            }
+        response_data["score"] = score_data
 
     return jsonify(response_data), 200
 
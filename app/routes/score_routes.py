@@ -1,59 +1,214 @@
-from flask import Blueprint, jsonify
+import datetime
+import math
+
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import func, select, union_all
 from app.models.score import Score
 from app.models.parking_event import ParkingEvent
+from app.models.archive import ParkingEventArchive, ScoreArchive
 from app.extensions import db
+from app.utils.read_replica import read_replica
+from app.utils.fieldsets import parse_fieldset
+from app.utils.score_histogram import ALL_TIME_PERIOD, month_period, score_percentile
 
 score_bp = Blueprint('score_bp', __name__, url_prefix='/scores')
 
+# Rows per page while streaming
+SCORES_STREAM_BATCH_SIZE = 500
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def _or_zero(value):
+    return value or 0
+
+
+# Response field -> (column it is read from, formatter or None). ?fields= selects only the columns it needs.
+SCORE_FIELDS = {
+    "parking_events_id": ("parking_events_id", None),
+    "scores_id": ("scores_id", None),
+
+    # Performance factors
+    "time_factor": ("time_factor", None),
+    "landmark_factor": ("landmark_factor", None),
+    "path_performance": ("path_performance", None),
+
+    # Landmark details
+    "landmarks_recalled": ("landmarks_recalled", None),
+    "no_of_landmarks": ("no_of_landmarks", None),
+
+    # Penalties (NEW FIELDS)
+    "peek_penalty": ("peek_penalty", _or_zero),
+    "assist_penalty": ("assist_penalty", _or_zero),
+
+    # Score
+    "task_score": ("task_score", None),
+
+    # Dates
+    "calculated_at": ("created_at", _isoformat),
+    "created_at": ("created_at", _isoformat),
+    "started_at": ("started_at", _isoformat),
+    "ended_at": ("ended_at", _isoformat),
+
+    # Location info from ParkingEvent
+    "parking_location_name": ("parking_location_name", None),
+    "parking_address": ("parking_address", None),
+
+    # Deprecated (keep for backward compatibility)
+    "assistance_points": ("assistance_points", _or_zero),
+}
+
+# Columns that come from the ParkingEvent side of the join
+EVENT_COLUMNS = ('started_at', 'ended_at', 'parking_location_name', 'parking_address')
+
+
+def _score_row_to_dict(row, fields):
+    """fields: (response field, position of its column in the row, formatter) triples from SCORE_FIELDS."""
+    data = {}
+    for name, position, formatter in fields:
+        value = row[position]
+        data[name] = formatter(value) if formatter is not None else value
+    return data
+
+
+def _watched_scores_select(score, event, user_id, columns, scores_ids=None):
+    """
+    Join scores with their parking events to filter by user and status (works for hot and archive tables).
+    scores_ids, when given, limits the select to those scores.
+    """
+    statement = select(
+        *(event.c[name] if name in EVENT_COLUMNS else score.c[name] for name in columns)
+    ).join(
+        event, score.c.parking_events_id == event.c.parking_events_id
+    ).where(
+        event.c.user_id == user_id,
+        event.c.status == 'score_watched'  # Filter by the specific status
+    )
+    if scores_ids is not None:
+        statement = statement.where(score.c.scores_id.in_(scores_ids))
+    return statement
+
+
+def _comparable_time(expression):
+    """
+    SQLite keeps timestamps as text, with or without microseconds depending on who wrote them, so equal
+    times can compare unequal; julianday() compares them as times. MySQL compares DATETIMEs natively.
+    """
+    if db.session.get_bind(mapper=Score.__mapper__).dialect.name == 'sqlite':
+        return func.julianday(expression)
+    return expression
+
+
+def _watched_scores(user_id, columns, scores_ids=None):
+    """Union of the user's watched scores in the hot tables and the archive; scores_ids are unique across both."""
+    return union_all(
+        _watched_scores_select(Score.__table__, ParkingEvent.__table__, user_id, columns, scores_ids),
+        _watched_scores_select(ScoreArchive, ParkingEventArchive, user_id, columns, scores_ids),
+    ).subquery()
+
+
 @score_bp.route('', methods=['GET']) # Corresponds to GET /scores
 @jwt_required()
+@read_replica
 def get_watched_scores():
     current_user_id = get_jwt_identity()
 
-    # Query scores, joining with ParkingEvent to filter by user and status
-    watched_scores = db.session.query(Score, ParkingEvent).join(
-        ParkingEvent, Score.parking_events_id == ParkingEvent.parking_events_id
-    ).filter(
-        ParkingEvent.user_id == current_user_id,
-        ParkingEvent.status == 'score_watched'  # Filter by the specific status
-    ).order_by(Score.created_at.desc()).all()
-
-    # Serialize the results
-    scores_list = []
-    for score, event in watched_scores:
-        scores_list.append({
-            "parking_events_id": score.parking_events_id,
-            "scores_id": score.scores_id,
-
-            # Performance factors
-            "time_factor": score.time_factor,
-            "landmark_factor": score.landmark_factor,
-            "path_performance": score.path_performance,
-
-            # Landmark details
-            "landmarks_recalled": score.landmarks_recalled,
-            "no_of_landmarks": score.no_of_landmarks,
-
-            # Penalties (NEW FIELDS)
-            "peek_penalty": score.peek_penalty or 0,
-            "assist_penalty": score.assist_penalty or 0,
-
-            # Score
-            "task_score": score.task_score,
-
-            # Dates
-            "calculated_at": score.created_at.isoformat() if score.created_at else None,
-            "created_at": score.created_at.isoformat() if score.created_at else None,
-            "started_at": event.started_at.isoformat() if event.started_at else None,
-            "ended_at": event.ended_at.isoformat() if event.ended_at else None,
-
-            # Location info from ParkingEvent
-            "parking_location_name": event.parking_location_name,
-            "parking_address": event.parking_address,
-
-            # Deprecated (keep for backward compatibility)
-            "assistance_points": score.assistance_points or 0,
-        })
-
-    return jsonify(scores_list), 200
\ No newline at end of file
+    try:
+        selected = parse_fieldset(SCORE_FIELDS, always=('scores_id',))
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    selected_fields = [(name, column, formatter)
+                       for name, (column, formatter) in SCORE_FIELDS.items() if name in selected]
+    columns = list(dict.fromkeys([column for _, column, _ in selected_fields] + ['scores_id']))
+    # Rows are read by position, which is cheaper per row than by column name
+    fields = [(name, columns.index(column), formatter) for name, column, formatter in selected_fields]
+    scores_id_position = columns.index('scores_id')
+
+    # Stream the JSON array one page at a time, so only the ids of a long history are held, not its rows.
+    # The ids are sorted once, then each page is fetched by primary key: keyset pages would each
+    # re-join and re-sort the rest of the history, as no index covers the order across the join.
+    # Pages rather than yield_per: mysql-connector buffers the whole result set client-side.
+    # Select only the columns the response needs; plain rows skip ORM entity construction and the identity map.
+    def generate():
+        dumps = current_app.json.dumps
+        ordered = _watched_scores(current_user_id, ['created_at', 'scores_id'])
+        scores_ids = db.session.execute(
+            select(ordered.c.scores_id).order_by(
+                _comparable_time(ordered.c.created_at).desc(), ordered.c.scores_id.desc()
+            )
+        ).scalars().all()
+
+        yield '['
+        separator = ''
+        for start in range(0, len(scores_ids), SCORES_STREAM_BATCH_SIZE):
+            page_ids = scores_ids[start:start + SCORES_STREAM_BATCH_SIZE]
+            rows = {row[scores_id_position]: row for row in db.session.execute(
+                select(_watched_scores(current_user_id, columns, page_ids))
+            )}
+            # Hand the connection back to the pool while the page is written out
+            db.session.close()
+            for scores_id in page_ids:
+                row = rows.get(scores_id)
+                if row is None:
+                    continue  # Deleted (or no longer watched) since the ids were read
+                yield separator + dumps(_score_row_to_dict(row, fields))
+                separator = ','
+        yield ']'
+
+    return Response(stream_with_context(generate()), status=200, mimetype='application/json')
+
+
+def _latest_task_score(user_id):
+    """The user's most recent task score, from the hot tables or the archive, or None."""
+    scores = union_all(*(
+        select(score.c.task_score, score.c.created_at, score.c.scores_id).join(
+            event, score.c.parking_events_id == event.c.parking_events_id
+        ).where(event.c.user_id == user_id, score.c.task_score.is_not(None))
+        for score, event in ((Score.__table__, ParkingEvent.__table__), (ScoreArchive, ParkingEventArchive))
+    )).subquery()
+    return db.session.execute(
+        select(scores.c.task_score).order_by(scores.c.created_at.desc(), scores.c.scores_id.desc()).limit(1)
+    ).scalar()
+
+
+@score_bp.route('/percentile', methods=['GET']) # Corresponds to GET /scores/percentile
+@jwt_required()
+@read_replica
+def get_score_percentile():
+    current_user_id = get_jwt_identity()
+
+    # ?period= is a month (YYYY-MM) or 'all'; defaults to the current month
+    period = request.args.get('period') or month_period(datetime.datetime.now(datetime.timezone.utc))
+    if period != ALL_TIME_PERIOD:
+        try:
+            period = month_period(datetime.datetime.strptime(period, '%Y-%m'))
+        except ValueError:
+            return jsonify({"message": f"'period' must be YYYY-MM or '{ALL_TIME_PERIOD}'"}), 400
+
+    # ?score= ranks any score; defaults to the user's latest one
+    score = request.args.get('score')
+    if score is not None:
+        try:
+            score = float(score)
+        except ValueError:
+            return jsonify({"message": "'score' must be a number"}), 400
+        if not math.isfinite(score):
+            return jsonify({"message": "'score' must be a number"}), 400
+    else:
+        score = _latest_task_score(current_user_id)
+        if score is None:
+            return jsonify({"message": "No score found for this user"}), 404
+
+    percentile, total = score_percentile(period, score)
+    if percentile is None:
+        return jsonify({"message": f"No scores recorded for period '{period}'"}), 404
+
+    return jsonify({
+        "period": period,
+        "score": score,
+        "percentile": percentile,
+        "total_scores": total
+    }), 200
@@ -0,0 +1,32 @@
+from functools import wraps
+
+from flask import jsonify
+from flask_jwt_extended import get_jwt_identity
+
+from app.extensions import db
+from app.models.user import User
+from app.models.user_type import UserType
+
+ADMIN_USER_TYPE = 'admin'
+
+
+def is_admin(user_id):
+    user_type = db.session.query(UserType.user_type).join(User.user_type).filter(
+        User.user_id == user_id,
+        User.is_active.is_(True)
+    ).scalar()
+    return user_type is not None and user_type.lower() == ADMIN_USER_TYPE
+
+
+def admin_required(view):
+    """
+    Only let users of the 'admin' UserType (see 'flask seed run') through; everyone else gets 403.
+    Must be applied below @jwt_required().
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not is_admin(get_jwt_identity()):
+            return jsonify({"message": "Admin access required"}), 403
+        return view(*args, **kwargs)
+
+    return wrapper
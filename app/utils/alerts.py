@@ -0,0 +1,184 @@
+import datetime
+import logging
+import smtplib
+import time
+from email.message import EmailMessage
+
+from flask import current_app
+from sqlalchemy import select, update, delete
+
+from app.extensions import db
+from app.models.alert_outbox import AlertOutbox
+from app.models.emergency_contact import EmergencyContact
+from app.models.parking_event import ParkingEvent, StatusEnum
+from app.models.user import User
+from app.utils.event_state import compare_and_swap
+from app.utils.outbox_leases import claim_outbox_rows
+
+logger = logging.getLogger(__name__)
+
+_outbox = AlertOutbox.__table__
+
+ALERT_REASONS = {
+    'expired': "ended their navigation back to the car without reaching it",
+    'abandoned': "started navigating back to the car {hours} hours ago and has not arrived",
+}
+
+
+def queue_navigation_alerts(event, reason, now):
+    """
+    Add an AlertOutbox row for every active contact of the event's user who allows alerts and has an email,
+    in the caller's transaction. Contacts already alerted for this event are skipped. Returns the rows added.
+    """
+    contacts = EmergencyContact.query.filter(
+        EmergencyContact.user_id == event.user_id,
+        EmergencyContact.is_allow_alerts.is_(True),
+        EmergencyContact.is_active.is_(True),
+        EmergencyContact.emergency_email.isnot(None),
+        EmergencyContact.emergency_email != '',
+    ).all()
+    if not contacts:
+        return []
+
+    already_alerted = set(db.session.execute(
+        select(AlertOutbox.emergency_id).where(AlertOutbox.parking_events_id == event.parking_events_id)
+    ).scalars())
+
+    user_name = db.session.execute(select(User.user_name).where(User.user_id == event.user_id)).scalar()
+    hours = int(current_app.config['ALERT_ABANDONED_AFTER'].total_seconds() // 3600)
+    location = event.parking_location_name or event.parking_address or "an unnamed location"
+
+    alerts = []
+    for contact in contacts:
+        if contact.emergency_id in already_alerted:
+            continue
+        alerts.append(AlertOutbox(
+            parking_events_id=event.parking_events_id,
+            emergency_id=contact.emergency_id,
+            recipient=contact.emergency_email,
+            subject=f"MemoPark alert for {user_name}",
+            body=(
+                f"Hello {contact.emergency_contact_name},\n\n"
+                f"{user_name} {ALERT_REASONS[reason].format(hours=hours)}.\n"
+                f"The car is parked at {location} "
+                f"({float(event.parking_latitude):.6f}, {float(event.parking_longitude):.6f}).\n\n"
+                f"You receive this message because {user_name} listed you as an emergency contact in MemoPark."
+            ),
+            next_attempt_at=now,
+        ))
+    db.session.add_all(alerts)
+    return alerts
+
+
+def expire_abandoned_navigations(now, batch_size=100):
+    """
+    Expire events left in 'retrieving' for longer than ALERT_ABANDONED_AFTER and queue their alerts.
+    Each event changes with a compare-and-swap, so a user finishing at the same moment wins. Returns the count.
+    """
+    cutoff = now - current_app.config['ALERT_ABANDONED_AFTER']
+    events = ParkingEvent.query.filter(
+        ParkingEvent.status == StatusEnum.retrieving,
+        ParkingEvent.navigation_started_at < cutoff
+    ).order_by(ParkingEvent.parking_events_id).limit(batch_size).all()
+
+    expired = 0
+    for event in events:
+        if compare_and_swap(event.parking_events_id, event.version, status='expired', ended_at=now):
+            queue_navigation_alerts(event, 'abandoned', now)
+            expired += 1
+        db.session.commit()
+    return expired
+
+
+class RateLimiter:
+    """Spaces calls at least 1 / rate_per_second apart; a rate of 0 disables the limit."""
+
+    def __init__(self, rate_per_second):
+        self.interval = 1.0 / rate_per_second if rate_per_second else 0.0
+        self._next_at = 0.0
+
+    def wait(self):
+        delay = self._next_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        self._next_at = max(self._next_at, time.monotonic()) + self.interval
+
+
+def _smtp_connection():
+    config = current_app.config
+    connection = smtplib.SMTP(config['ALERT_SMTP_HOST'], config['ALERT_SMTP_PORT'],
+                              timeout=config['ALERT_SMTP_TIMEOUT'])
+    if config['ALERT_SMTP_USE_TLS']:
+        connection.starttls()
+    if config['ALERT_SMTP_USERNAME']:
+        connection.login(config['ALERT_SMTP_USERNAME'], config['ALERT_SMTP_PASSWORD'])
+    return connection
+
+
+def _email(alert):
+    message = EmailMessage()
+    message['From'] = current_app.config['ALERT_FROM_ADDRESS']
+    message['To'] = alert.recipient
+    message['Subject'] = alert.subject
+    message.set_content(alert.body)
+    return message
+
+
+def dispatch_alert_batch(batch_size, max_attempts, rate_limiter):
+    """
+    Send one batch of due alerts over a single SMTP connection. The batch is leased and committed first,
+    so no row lock is held while sending. Sent rows are deleted; failed rows are retried after
+    2^attempts minutes until max_attempts. Returns (sent, failed); (0, 0) when none are due.
+    """
+    now = datetime.datetime.now(datetime.timezone.utc)
+    token, alerts = claim_outbox_rows(
+        _outbox, _outbox.c.attempts < max_attempts, _outbox.c.next_attempt_at <= now,
+        batch_size=batch_size, now=now, lease=current_app.config['ALERT_DISPATCH_LEASE']
+    )
+    if not alerts:
+        return 0, 0
+
+    failures = {}
+    connection = None
+    try:
+        connection = _smtp_connection()
+        for alert in alerts:
+            rate_limiter.wait()
+            try:
+                connection.send_message(_email(alert))
+            except smtplib.SMTPRecipientsRefused as e:
+                failures[alert.alert_outbox_id] = str(e)
+            except smtplib.SMTPServerDisconnected as e:
+                # The rest of the batch cannot go out on this connection; retry it on the next pass
+                for pending in alerts[alerts.index(alert):]:
+                    failures[pending.alert_outbox_id] = str(e) or "SMTP server disconnected"
+                break
+            except smtplib.SMTPException as e:
+                failures[alert.alert_outbox_id] = str(e)
+    except (OSError, smtplib.SMTPException) as e:
+        # Could not connect or authenticate: nothing was sent
+        logger.warning("Alert dispatch could not reach the SMTP server", exc_info=True)
+        failures = {alert.alert_outbox_id: str(e) or type(e).__name__ for alert in alerts}
+    finally:
+        if connection is not None:
+            try:
+                connection.quit()
+            except (OSError, smtplib.SMTPException):
+                pass
+
+    # Only rows still held by this claim are settled; a row whose lease ran out belongs to another worker now
+    owned = _outbox.c.locked_by == token
+    for alert in alerts:
+        if alert.alert_outbox_id in failures:
+            db.session.execute(
+                update(_outbox).where(_outbox.c.alert_outbox_id == alert.alert_outbox_id, owned)
+                .values(attempts=alert.attempts + 1, last_error=failures[alert.alert_outbox_id][:1024],
+                        next_attempt_at=now + datetime.timedelta(minutes=2 ** (alert.attempts + 1)),
+                        locked_until=None, locked_by=None)
+            )
+    sent_ids = [alert.alert_outbox_id for alert in alerts if alert.alert_outbox_id not in failures]
+    if sent_ids:
+        db.session.execute(delete(_outbox).where(_outbox.c.alert_outbox_id.in_(sent_ids), owned))
+    db.session.commit()
+
+    return len(alerts) - len(failures), len(failures)
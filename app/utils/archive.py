@@ -0,0 +1,123 @@
+import datetime
+from types import SimpleNamespace
+
+from sqlalchemy import select, insert, delete, func
+
+from app.extensions import db
+from app.models.parking_event import ParkingEvent, StatusEnum
+from app.models.landmark import Landmark
+from app.models.score import Score
+from app.models.track_point import TrackPoint
+from app.models.scoring_job import ScoringJob, ScoringJobStatusEnum
+from app.models.archive import ParkingEventArchive, LandmarkArchive, ScoreArchive
+
+# Only sessions that can no longer change are archived
+ARCHIVABLE_STATUSES = (StatusEnum.retrieved, StatusEnum.expired, StatusEnum.score_watched)
+
+# (hot table, archive table) pairs, parents first: inserts run in this order, deletes in reverse
+ARCHIVE_TABLES = (
+    (ParkingEvent.__table__, ParkingEventArchive),
+    (Landmark.__table__, LandmarkArchive),
+    (Score.__table__, ScoreArchive),
+)
+
+# Hot-only children: breadcrumbs and scoring jobs are only needed until the event is scored, so they are dropped.
+# Only succeeded jobs get this far; events with any other job are not archivable
+DISCARDED_TABLES = (TrackPoint.__table__, ScoringJob.__table__)
+
+
+def archive_cutoff(months, now=None):
+    """Events that finished before this moment are archived (a month is counted as 30 days)."""
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    return now - datetime.timedelta(days=30 * months)
+
+
+def archivable_criteria(cutoff):
+    """WHERE criteria on ParkingEvent selecting the events archive_finished_events would move."""
+    finished_at = func.coalesce(ParkingEvent.ended_at, ParkingEvent.created_at)
+    # A 'retrieved' event whose job is queued, running or failed is still to be scored or retried;
+    # archiving it would delete the job, and the worker only reads the hot tables
+    unfinished_job = select(ScoringJob.scoring_jobs_id).where(
+        ScoringJob.parking_events_id == ParkingEvent.parking_events_id,
+        ScoringJob.status != ScoringJobStatusEnum.succeeded
+    ).exists()
+    return ParkingEvent.status.in_(ARCHIVABLE_STATUSES), finished_at < cutoff, ~unfinished_job
+
+
+def _archivable_event_ids(cutoff, batch_size):
+    return db.session.execute(
+        select(ParkingEvent.parking_events_id)
+        .where(*archivable_criteria(cutoff))
+        .order_by(ParkingEvent.parking_events_id)
+        .limit(batch_size)
+    ).scalars().all()
+
+
+def archive_batch(event_ids):
+    """Move the given events and their children to the archive tables in one transaction."""
+    try:
+        for hot_table, archive_table in ARCHIVE_TABLES:
+            columns = [column.name for column in archive_table.columns]
+            db.session.execute(
+                insert(archive_table).from_select(
+                    columns,
+                    select(*(hot_table.c[name] for name in columns))
+                    .where(hot_table.c.parking_events_id.in_(event_ids))
+                )
+            )
+
+        # Children first, so foreign keys never point at a missing event
+        for hot_table in DISCARDED_TABLES:
+            db.session.execute(delete(hot_table).where(hot_table.c.parking_events_id.in_(event_ids)))
+        for hot_table, _ in reversed(ARCHIVE_TABLES):
+            db.session.execute(delete(hot_table).where(hot_table.c.parking_events_id.in_(event_ids)))
+
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def archive_finished_events(cutoff, batch_size=1000, max_batches=None):
+    """Archive every finished event older than cutoff in batches. Returns the number of events moved."""
+    moved = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        event_ids = _archivable_event_ids(cutoff, batch_size)
+        if not event_ids:
+            break
+        archive_batch(event_ids)
+        moved += len(event_ids)
+        batches += 1
+    return moved
+
+
+def find_archived_event(user_id, event_id, with_landmarks=True, with_score=True):
+    """
+    Load an archived event with the same attributes as a ParkingEvent (including .landmarks and .score),
+    so history endpoints can serialize it unchanged. Returns None if it is not archived.
+    with_landmarks/with_score=False skip those queries and leave the attribute empty.
+    """
+    event_row = db.session.execute(
+        select(ParkingEventArchive).where(
+            ParkingEventArchive.c.parking_events_id == event_id,
+            ParkingEventArchive.c.user_id == user_id
+        )
+    ).first()
+    if not event_row:
+        return None
+
+    landmarks = db.session.execute(
+        select(LandmarkArchive)
+        .where(LandmarkArchive.c.parking_events_id == event_id)
+        .order_by(LandmarkArchive.c.landmarks_id)
+    ).all() if with_landmarks else []
+    score = db.session.execute(
+        select(ScoreArchive).where(ScoreArchive.c.parking_events_id == event_id)
+    ).first() if with_score else None
+
+    return SimpleNamespace(
+        **event_row._asdict(),
+        landmarks=[SimpleNamespace(**landmark._asdict()) for landmark in landmarks],
+        score=SimpleNamespace(**score._asdict()) if score else None,
+    )
@@ -0,0 +1,164 @@
+import io
+import zlib
+from functools import lru_cache
+
+from flask import request, jsonify, current_app
+
+# gzip framing for zlib (header and CRC trailer)
+GZIP_WBITS = 31
+
+
+class _GzipEncoder:
+    name = 'gzip'
+
+    def __init__(self, config):
+        self._compressor = zlib.compressobj(config['COMPRESSION_GZIP_LEVEL'], zlib.DEFLATED, GZIP_WBITS)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    name = 'br'
+
+    def __init__(self, config):
+        import brotli
+        self._compressor = brotli.Compressor(quality=config['COMPRESSION_BROTLI_QUALITY'])
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+@lru_cache(maxsize=None)
+def _brotli_available():
+    try:
+        import brotli  # noqa: F401 - optional; without it only gzip is offered
+    except ImportError:
+        return False
+    return True
+
+
+def _negotiate_encoder():
+    """Pick the encoder the client prefers from Accept-Encoding; brotli wins ties when it is installed."""
+    candidates = [_GzipEncoder]
+    if _brotli_available():
+        candidates.insert(0, _BrotliEncoder)
+
+    best, best_quality = None, 0
+    for encoder in candidates:
+        quality = request.accept_encodings.quality(encoder.name)
+        if quality > best_quality:
+            best, best_quality = encoder, quality
+    return best
+
+
+def _compress_stream(chunks, encoder, flush_size):
+    """
+    Compress a streamed body as it is generated. Output is flushed every flush_size input bytes, so the
+    client keeps receiving rows while the server never holds more than one window in memory.
+    """
+    pending = 0
+    try:
+        for chunk in chunks:
+            data = chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+            out = encoder.compress(data)
+            pending += len(data)
+            if pending >= flush_size:
+                out += encoder.flush()
+                pending = 0
+            if out:
+                yield out
+        yield encoder.finish()
+    finally:
+        # Closing the original iterable pops the request context kept by stream_with_context
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+def compress_response(response):
+    """after_request hook: gzip or brotli compress JSON and NDJSON responses the client accepts."""
+    config = current_app.config
+    if (response.mimetype not in config['COMPRESSION_MIMETYPES']
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers or response.direct_passthrough):
+        return response
+
+    # Caches must keep compressed and plain copies apart even when this one stays plain
+    response.vary.add('Accept-Encoding')
+
+    encoder_class = _negotiate_encoder()
+    if encoder_class is None or request.method == 'HEAD':
+        return response
+
+    if response.is_streamed:
+        encoder = encoder_class(config)
+        response.response = _compress_stream(response.response, encoder, config['COMPRESSION_STREAM_FLUSH_SIZE'])
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < config['COMPRESSION_MIN_SIZE']:
+            return response
+        encoder = encoder_class(config)
+        response.set_data(encoder.compress(data) + encoder.finish())
+
+    response.headers['Content-Encoding'] = encoder.name
+    return response
+
+
+def decompress_request():
+    """
+    before_request hook: accept 'Content-Encoding: gzip' request bodies, e.g. large landmark, track or
+    score uploads. Bodies that inflate past REQUEST_MAX_DECOMPRESSED_SIZE are rejected with 413.
+    """
+    encoding = request.headers.get('Content-Encoding', '').strip().lower()
+    if encoding in ('', 'identity'):
+        return None
+    if encoding != 'gzip':
+        return jsonify({"message": f"Unsupported Content-Encoding '{encoding}'; use gzip"}), 415
+
+    max_size = current_app.config['REQUEST_MAX_DECOMPRESSED_SIZE']
+    too_large = jsonify({"message": f"Request body must be at most {max_size} bytes once decompressed"}), 413
+
+    compressed = request.stream.read(max_size + 1)
+    if len(compressed) > max_size:
+        return too_large
+
+    decompressor = zlib.decompressobj(GZIP_WBITS)
+    try:
+        data = decompressor.decompress(compressed, max_size + 1)
+    except zlib.error:
+        return jsonify({"message": "Request body is not valid gzip"}), 400
+    if len(data) > max_size or decompressor.unconsumed_tail:
+        return too_large
+    if not decompressor.eof:
+        return jsonify({"message": "Request body is not valid gzip"}), 400
+
+    # Swap the body for its decompressed form, so get_json() and form parsing read it as usual
+    request.environ['wsgi.input'] = io.BytesIO(data)
+    request.environ['CONTENT_LENGTH'] = str(len(data))
+    request.environ.pop('HTTP_CONTENT_ENCODING', None)
+    request.__dict__.pop('stream', None)
+    request.__dict__.pop('content_length', None)
+    return None
+
+
+def init_compression(app):
+    """Register the request decompression and response compression hooks (COMPRESSION_ENABLED)."""
+    if not app.config.get('COMPRESSION_ENABLED'):
+        return
+
+    app.before_request(decompress_request)
+    # after_request hooks run in reverse order, so registering first means compressing last
+    app.after_request(compress_response)
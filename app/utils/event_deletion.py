@@ -0,0 +1,108 @@
+import datetime
+
+from flask import current_app
+from sqlalchemy import select, delete, update, union_all
+
+from app.extensions import db
+from app.models.parking_event import ParkingEvent
+from app.models.landmark import Landmark
+from app.models.score import Score
+from app.models.track_point import TrackPoint
+from app.models.scoring_job import ScoringJob
+from app.models.archive import ParkingEventArchive, LandmarkArchive, ScoreArchive
+from app.models.s3_deletion_outbox import S3DeletionOutbox
+from app.utils.s3 import get_s3_client
+from app.utils.outbox_leases import claim_outbox_rows
+
+_outbox = S3DeletionOutbox.__table__
+
+# (event table, child tables) for the hot and archive sets; children are deleted before their event
+EVENT_TABLE_SETS = (
+    (ParkingEvent.__table__, (Landmark.__table__, Score.__table__, TrackPoint.__table__, ScoringJob.__table__)),
+    (ParkingEventArchive, (LandmarkArchive, ScoreArchive)),
+)
+
+# delete_objects accepts at most 1000 keys per call
+S3_DELETE_BATCH_LIMIT = 1000
+
+
+def delete_parking_events(user_id, event_ids):
+    """
+    Delete the user's events (hot or archived) with their landmarks and scores in one transaction,
+    queueing their photo keys in the S3 deletion outbox. Returns the ids that were deleted.
+    """
+    deleted_ids = []
+    photo_keys = []
+
+    try:
+        for event_table, child_tables in EVENT_TABLE_SETS:
+            owned_ids = db.session.execute(
+                select(event_table.c.parking_events_id).where(
+                    event_table.c.user_id == user_id,
+                    event_table.c.parking_events_id.in_(event_ids)
+                )
+            ).scalars().all()
+            if not owned_ids:
+                continue
+
+            landmark_table = child_tables[0]
+            photo_keys.extend(db.session.execute(union_all(
+                select(event_table.c.photo_s3_key).where(event_table.c.parking_events_id.in_(owned_ids)),
+                select(landmark_table.c.photo_s3_key).where(landmark_table.c.parking_events_id.in_(owned_ids)),
+            )).scalars())
+
+            for child_table in child_tables:
+                db.session.execute(delete(child_table).where(child_table.c.parking_events_id.in_(owned_ids)))
+            db.session.execute(delete(event_table).where(event_table.c.parking_events_id.in_(owned_ids)))
+            deleted_ids.extend(owned_ids)
+
+        # The outbox rows commit with the deletes, so no photo is forgotten if the request dies afterwards
+        db.session.add_all(S3DeletionOutbox(s3_key=key) for key in set(photo_keys) if key)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return deleted_ids
+
+
+def drain_s3_deletion_outbox(batch_size=S3_DELETE_BATCH_LIMIT, max_attempts=5):
+    """
+    Delete one batch of queued keys from S3 with a single delete_objects call. The batch is leased and
+    committed before the call, so no row lock is held during it. Returns (deleted, failed) outbox row
+    counts; (0, 0) when the outbox is empty.
+    """
+    now = datetime.datetime.now(datetime.timezone.utc)
+    token, rows = claim_outbox_rows(
+        _outbox, _outbox.c.attempts < max_attempts,
+        batch_size=min(batch_size, S3_DELETE_BATCH_LIMIT), now=now, lease=current_app.config['S3_DELETION_LEASE']
+    )
+    if not rows:
+        return 0, 0
+
+    keys = sorted({row.s3_key for row in rows})
+    try:
+        response = get_s3_client().delete_objects(
+            Bucket=current_app.config['S3_BUCKET'],
+            Delete={'Objects': [{'Key': key} for key in keys], 'Quiet': True}
+        )
+        # Quiet mode only reports the keys that failed
+        failed = {error['Key']: error.get('Message', error.get('Code')) for error in response.get('Errors', [])}
+    except Exception as e:
+        failed = {key: str(e) for key in keys}
+
+    # Only rows still held by this claim are settled; a row whose lease ran out belongs to another worker now
+    owned = _outbox.c.locked_by == token
+    failed_rows = [row for row in rows if row.s3_key in failed]
+    for row in failed_rows:
+        db.session.execute(
+            update(_outbox).where(_outbox.c.s3_deletion_outbox_id == row.s3_deletion_outbox_id, owned)
+            .values(attempts=_outbox.c.attempts + 1, last_error=(failed[row.s3_key] or 'Unknown error')[:1024],
+                    locked_until=None, locked_by=None)
+        )
+    deleted_ids = [row.s3_deletion_outbox_id for row in rows if row.s3_key not in failed]
+    if deleted_ids:
+        db.session.execute(delete(_outbox).where(_outbox.c.s3_deletion_outbox_id.in_(deleted_ids), owned))
+    db.session.commit()
+
+    return len(deleted_ids), len(failed_rows)
@@ -0,0 +1,59 @@
+from sqlalchemy import update, insert
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.extensions import db
+from app.models.parking_event import ParkingEvent
+from app.models.score import Score
+
+_events = ParkingEvent.__table__
+_scores = Score.__table__
+
+
+def compare_and_swap(event_id, expected_version, **values):
+    """
+    Apply values to the event only if its version is still expected_version, bumping the version.
+    A single-statement UPDATE: a losing caller matches no rows instead of waiting for a lock or
+    rolling back. Returns True if this caller won; the caller commits.
+    """
+    result = db.session.execute(
+        update(_events)
+        .where(_events.c.parking_events_id == event_id, _events.c.version == expected_version)
+        .values(version=expected_version + 1, **values)
+    )
+    return result.rowcount == 1
+
+
+def set_event_fields(event_id, **values):
+    """
+    Apply values that do not depend on the rest of the event (e.g. the photo key) whatever its version,
+    bumping the version so concurrent compare-and-swap callers see the change. Used instead of an
+    ORM flush, which would fail with StaleDataError after a concurrent update. The caller commits.
+    """
+    result = db.session.execute(
+        update(_events)
+        .where(_events.c.parking_events_id == event_id)
+        .values(version=_events.c.version + 1, **values)
+    )
+    return result.rowcount == 1
+
+
+def insert_score_once(event_id, score_values):
+    """
+    Insert the event's Score unless one already exists, as one atomic statement on the unique
+    parking_events_id, so a duplicate never surfaces as an IntegrityError. The caller commits.
+    """
+    dialect = db.session.get_bind(mapper=Score.__mapper__).dialect.name
+    row = dict(score_values, parking_events_id=event_id)
+
+    if dialect == 'mysql':
+        # Assigning the key to itself makes the duplicate case a no-op
+        statement = mysql_insert(_scores).values(row)
+        statement = statement.on_duplicate_key_update(parking_events_id=statement.inserted.parking_events_id)
+    elif dialect == 'sqlite':
+        statement = sqlite_insert(_scores).values(row).on_conflict_do_nothing(index_elements=['parking_events_id'])
+    else:
+        statement = insert(_scores).values(row)
+
+    db.session.execute(statement)
+
@@ -0,0 +1,39 @@
+from flask import request
+
+
+def _split(value):
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def parse_fieldset(fields, includes=None, always=()):
+    """
+    Read the sparse fieldset of the current request.
+
+    :param fields: every response field of the endpoint
+    :param includes: optional expansions (relationships, presigned URLs), as {include name: response field}
+    :param always: fields returned whatever ?fields= says, e.g. the id
+    :return: the set of response fields to build; raises ValueError for names the endpoint does not have
+
+    Without ?fields= every field is returned, and without ?include= every expansion, as before.
+    An expansion is only built when ?include= names it (or is absent) and ?fields= does not leave it out.
+    """
+    includes = includes or {}
+    selected = set(fields)
+
+    requested_fields = request.args.get('fields')
+    if requested_fields is not None:
+        names = _split(requested_fields)
+        unknown = sorted(set(names) - selected)
+        if unknown:
+            raise ValueError(f"Unknown field(s) in 'fields': {', '.join(unknown)}")
+        selected = set(names) | set(always)
+
+    requested_includes = request.args.get('include')
+    if requested_includes is not None:
+        names = _split(requested_includes)
+        unknown = sorted(set(names) - set(includes))
+        if unknown:
+            raise ValueError(f"Unknown value(s) in 'include': {', '.join(unknown)}")
+        selected -= {field for name, field in includes.items() if name not in names}
+
+    return selected
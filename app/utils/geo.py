@@ -0,0 +1,91 @@
+"""
+Vectorized distance helpers for GPS data. NumPy is imported on first use,
+so app startup does not pay for it.
+"""
+EARTH_RADIUS_M = 6371008.8
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """Great-circle distance in meters between coordinates in degrees; arguments broadcast like NumPy arrays."""
+    import numpy as np
+
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=np.float64)) for value in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2.0) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2.0) ** 2
+    return 2.0 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def reached_targets(point_lats, point_lons, target_lats, target_lons, radius_m):
+    """
+    For each target, whether any point came within radius_m of it.
+    Computes the full points x targets distance matrix in one pass; returns a boolean array per target.
+    """
+    import numpy as np
+
+    if len(point_lats) == 0 or len(target_lats) == 0:
+        return np.zeros(len(target_lats), dtype=bool)
+
+    distances = haversine_m(
+        np.asarray(point_lats, dtype=np.float64)[:, None], np.asarray(point_lons, dtype=np.float64)[:, None],
+        np.asarray(target_lats, dtype=np.float64)[None, :], np.asarray(target_lons, dtype=np.float64)[None, :],
+    )
+    return (distances <= radius_m).any(axis=0)
+
+
+def decode_polyline(encoded, precision=5):
+    """
+    Decode a Google encoded polyline into (latitudes, longitudes) float arrays without a per-point Python loop.
+    Raises ValueError for malformed input.
+    """
+    import numpy as np
+
+    data = np.frombuffer(encoded.encode('ascii'), dtype=np.uint8).astype(np.int64) - 63
+    if data.size == 0 or data.min() < 0 or data.max() > 63 or data[-1] & 0x20:
+        raise ValueError("Malformed polyline")
+
+    # Every value is a run of 5-bit groups, least significant first; 0x20 marks "more groups follow"
+    ends = (data & 0x20) == 0
+    value_index = np.concatenate(([0], np.cumsum(ends)[:-1]))
+    starts = np.flatnonzero(np.concatenate(([True], ends[:-1])))
+    position = np.arange(data.size) - starts[value_index]
+    if position.max() > 6:
+        raise ValueError("Malformed polyline")
+
+    # float64 sums are exact here: a value has at most 35 bits
+    values = np.bincount(value_index, weights=(data & 0x1f) << (5 * position)).astype(np.int64)
+    if values.size % 2:
+        raise ValueError("Malformed polyline")
+
+    deltas = np.where(values & 1, ~(values >> 1), values >> 1).reshape(-1, 2)
+    coordinates = np.cumsum(deltas, axis=0) / float(10 ** precision)
+    return coordinates[:, 0], coordinates[:, 1]
+
+
+def route_metrics(latitudes, longitudes, target_lat, target_lon):
+    """
+    Summarize a walked route that should end at the target (the parked car):
+      * path_length_m: total distance walked
+      * straight_line_m: distance from the first point to the target
+      * detour_ratio: path_length_m / straight_line_m (None when the walk started at the target)
+      * backtrack_ratio: share of the distance walked while moving away from the target
+    Returns None for routes with fewer than two points.
+    """
+    import numpy as np
+
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    if latitudes.size < 2:
+        return None
+
+    segments = haversine_m(latitudes[:-1], longitudes[:-1], latitudes[1:], longitudes[1:])
+    to_target = haversine_m(latitudes, longitudes, float(target_lat), float(target_lon))
+
+    path_length = float(segments.sum())
+    straight_line = float(to_target[0])
+    backtracked = float(segments[np.diff(to_target) > 0].sum())
+
+    return {
+        "path_length_m": path_length,
+        "straight_line_m": straight_line,
+        "detour_ratio": path_length / straight_line if straight_line > 0 else None,
+        "backtrack_ratio": backtracked / path_length if path_length > 0 else 0.0,
+    }
@@ -0,0 +1,113 @@
+import datetime
+from functools import wraps
+
+from flask import request, jsonify, make_response, current_app
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models.idempotency_key import IdempotencyKey
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+
+
+def _prune_keys(user_id, now):
+    """Drop expired keys for this user and keep at most IDEMPOTENCY_MAX_KEYS_PER_USER rows."""
+    IdempotencyKey.query.filter(
+        IdempotencyKey.user_id == user_id,
+        IdempotencyKey.expires_at <= now
+    ).delete(synchronize_session=False)
+
+    max_keys = current_app.config['IDEMPOTENCY_MAX_KEYS_PER_USER']
+    stale_ids = [row.idempotency_keys_id for row in IdempotencyKey.query.with_entities(
+        IdempotencyKey.idempotency_keys_id
+    ).filter_by(user_id=user_id).order_by(
+        IdempotencyKey.idempotency_keys_id.desc()
+    ).offset(max_keys - 1).all()]
+
+    if stale_ids:
+        IdempotencyKey.query.filter(
+            IdempotencyKey.idempotency_keys_id.in_(stale_ids)
+        ).delete(synchronize_session=False)
+
+
+def _replay(record):
+    # A reservation without a response means the first request has not finished yet
+    if record.response_status is None:
+        return jsonify({"message": "A request with this Idempotency-Key is still in progress"}), 409
+
+    if record.request_method != request.method or record.request_path != request.path:
+        return jsonify({"message": "Idempotency-Key was already used for a different request"}), 422
+
+    response = current_app.response_class(
+        record.response_body,
+        status=record.response_status,
+        mimetype='application/json'
+    )
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(view):
+    """
+    Replay the first response for requests that carry the same Idempotency-Key header.
+    Must be applied below @jwt_required() so the key can be scoped to the current user.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view(*args, **kwargs)
+
+        if len(key) > 255:
+            return jsonify({"message": f"{IDEMPOTENCY_HEADER} must be at most 255 characters"}), 400
+
+        current_user_id = get_jwt_identity()
+        now = datetime.datetime.now(datetime.timezone.utc)
+
+        record = IdempotencyKey.query.filter(
+            IdempotencyKey.user_id == current_user_id,
+            IdempotencyKey.idempotency_key == key,
+            IdempotencyKey.expires_at > now
+        ).first()
+        if record:
+            return _replay(record)
+
+        # Reserve the key before running the view, so a concurrent retry cannot write twice
+        _prune_keys(current_user_id, now)
+        record = IdempotencyKey(
+            user_id=current_user_id,
+            idempotency_key=key,
+            request_method=request.method,
+            request_path=request.path,
+            expires_at=now + current_app.config['IDEMPOTENCY_KEY_TTL']
+        )
+        db.session.add(record)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            record = IdempotencyKey.query.filter_by(user_id=current_user_id, idempotency_key=key).first()
+            if record:
+                return _replay(record)
+            return jsonify({"message": "A request with this Idempotency-Key is still in progress"}), 409
+
+        try:
+            response = make_response(view(*args, **kwargs))
+        except Exception:
+            db.session.rollback()
+            db.session.delete(record)
+            db.session.commit()
+            raise
+
+        if response.status_code >= 500:
+            # Server errors are not cached, so the client can retry with the same key
+            db.session.delete(record)
+        else:
+            record.response_status = response.status_code
+            record.response_body = response.get_data(as_text=True)
+        db.session.commit()
+
+        return response
+
+    return wrapper
@@ -0,0 +1,36 @@
+import uuid
+
+from sqlalchemy import select, update, or_
+
+from app.extensions import db
+
+
+def claim_outbox_rows(table, *criteria, batch_size, now, lease):
+    """
+    Lease up to batch_size rows of an outbox table (one with locked_until and locked_by columns) that match
+    criteria, oldest first, and commit the claim, so the caller's network I/O runs without row locks held.
+    Rows whose lease ran out, because the worker holding them died, can be claimed again.
+    Returns (claim token, claimed rows); the rows are plain Core rows, readable after the commit.
+    """
+    id_column = list(table.primary_key.columns)[0]
+    claimable = or_(table.c.locked_until.is_(None), table.c.locked_until < now)
+
+    ids = db.session.execute(
+        select(id_column).where(claimable, *criteria).order_by(id_column).limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+    if not ids:
+        db.session.rollback()
+        return None, []
+
+    # SKIP LOCKED keeps MySQL workers on different rows; re-checking the lease in the UPDATE
+    # also settles races on databases without row locks (SQLite)
+    token = uuid.uuid4().hex
+    db.session.execute(
+        update(table).where(id_column.in_(ids), claimable).values(locked_until=now + lease, locked_by=token)
+    )
+    db.session.commit()
+
+    rows = db.session.execute(select(table).where(table.c.locked_by == token).order_by(id_column)).all()
+    db.session.commit()
+    return token, rows
@@ -0,0 +1,145 @@
+import cProfile
+import datetime
+import hashlib
+import hmac
+import logging
+import os
+import random
+import re
+import threading
+import time
+
+from flask import g, request, current_app
+from flask_jwt_extended import get_jwt_identity
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-Profile-Token'
+PROFILE_DUMP_HEADER = 'X-Profile-Dump'
+PROFILE_SUFFIX = '.prof'
+# '<unix expiry>.<hex HMAC-SHA256>', ASCII only
+PROFILE_TOKEN_PATTERN = re.compile(r'[0-9]{1,12}\.[0-9a-f]{64}', re.ASCII)
+
+# Only one request per process is profiled at a time: it bounds the overhead, and Python 3.12+
+# allows a single active profiler anyway. Requests arriving meanwhile run unprofiled.
+_profiler_lock = threading.Lock()
+
+
+def sign_profile_token(key, expires_at):
+    """Header value that turns profiling on until expires_at (a unix timestamp)."""
+    expires_at = int(expires_at)
+    signature = hmac.new(key.encode(), str(expires_at).encode(), hashlib.sha256).hexdigest()
+    return f"{expires_at}.{signature}"
+
+
+def _valid_profile_token(token, key):
+    # Checked before parsing, so a malformed (e.g. non-ASCII) header is ignored rather than raising
+    if not key or not PROFILE_TOKEN_PATTERN.fullmatch(token):
+        return False
+    expires_at = token.partition('.')[0]
+    if int(expires_at) < time.time():
+        return False
+    return hmac.compare_digest(sign_profile_token(key, expires_at).encode(), token.encode())
+
+
+def _profile_reason():
+    """Why this request should be profiled ('header' or 'sampled'), or None."""
+    token = request.headers.get(PROFILE_HEADER)
+    if token and _valid_profile_token(token, current_app.config.get('PROFILE_SIGNING_KEY')):
+        return 'header'
+    sample_rate = current_app.config.get('PROFILE_SAMPLE_RATE', 0.0)
+    if sample_rate > 0 and random.random() < sample_rate:
+        return 'sampled'
+    return None
+
+
+def _current_user_id():
+    try:
+        return get_jwt_identity()
+    except RuntimeError:
+        # No JWT was verified for this request
+        return None
+
+
+def _rotate(directory, max_files):
+    """Delete the oldest dumps so at most max_files remain."""
+    dumps = sorted(
+        (entry for entry in os.scandir(directory) if entry.name.endswith(PROFILE_SUFFIX)),
+        key=lambda entry: entry.stat().st_mtime
+    )
+    for entry in dumps[:max(len(dumps) - max_files, 0)]:
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            pass  # Another worker process rotated it first
+
+
+def start_request_profile():
+    """before_request hook: start cProfile for a sampled request or one carrying a valid X-Profile-Token."""
+    reason = _profile_reason()
+    if reason is None or not _profiler_lock.acquire(blocking=False):
+        return
+
+    g.profile = {'profiler': cProfile.Profile(), 'reason': reason, 'started': time.perf_counter()}
+    g.profile['profiler'].enable()
+
+
+def _dump_filename(profile):
+    endpoint = re.sub(r'[^A-Za-z0-9_.-]', '_', request.endpoint or 'unmatched')
+    user_id = _current_user_id()
+    timestamp = datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%dT%H%M%S%f')
+    return f"{timestamp}-{endpoint}-user{user_id if user_id is not None else '-'}-{profile['reason']}{PROFILE_SUFFIX}"
+
+
+def name_request_profile(response):
+    """after_request hook: name the dump while the user is known, and return the name in X-Profile-Dump."""
+    profile = g.get('profile')
+    if profile is not None:
+        profile['filename'] = _dump_filename(profile)
+        profile['status'] = response.status_code
+        response.headers[PROFILE_DUMP_HEADER] = profile['filename']
+    return response
+
+
+def finish_request_profile(exception):
+    """
+    teardown_request hook: stop the profiler and write the pstats dump. Teardown runs once a streamed
+    body has been generated too, so GET /scores and the exports are profiled in full.
+    """
+    profile = g.pop('profile', None)
+    if profile is None:
+        return
+
+    profile['profiler'].disable()
+    _profiler_lock.release()
+    duration_ms = (time.perf_counter() - profile['started']) * 1000.0
+
+    # A view that raised never reached after_request
+    filename = profile.get('filename') or _dump_filename(profile)
+    directory = current_app.config['PROFILE_DIR']
+    try:
+        os.makedirs(directory, exist_ok=True)
+        profile['profiler'].dump_stats(os.path.join(directory, filename))
+        _rotate(directory, current_app.config['PROFILE_MAX_FILES'])
+    except OSError:
+        logger.exception("Could not write request profile", extra={"fields": {"file": filename}})
+        return
+
+    logger.info("Request profiled", extra={"fields": {
+        "file": filename,
+        "endpoint": request.endpoint,
+        "reason": profile['reason'],
+        "status": profile.get('status', 500),
+        "duration_ms": round(duration_ms, 1),
+    }})
+
+
+def init_profiling(app):
+    """Register the profiling hooks, unless neither sampling nor a signing key is configured."""
+    if not app.config.get('PROFILE_SAMPLE_RATE') and not app.config.get('PROFILE_SIGNING_KEY'):
+        return
+
+    # Registered before the blueprints, so the profile spans the other request hooks too
+    app.before_request(start_request_profile)
+    app.after_request(name_request_profile)
+    app.teardown_request(finish_request_profile)
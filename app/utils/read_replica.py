@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import g, has_request_context, request, current_app
+from flask_jwt_extended import get_jwt_identity
+from flask_sqlalchemy.session import Session
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+REPLICA_BIND = 'replica'
+WRITE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+# Signed, timestamped cookie naming the user who last wrote; any worker or host can check it
+LAST_WRITE_COOKIE = 'last_write'
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to the 'replica' bind while a view decorated with @read_replica is running.
+    Flushes (INSERT/UPDATE/DELETE) always go to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_request_context() and g.get('use_replica'):
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+class _RecentWriters:
+    """
+    Bounded map of user id -> time of their last write in this process. Covers clients that drop cookies,
+    as long as their next read reaches the same worker; the last_write cookie covers the other workers.
+    """
+
+    def __init__(self, max_users=10000):
+        self.max_users = max_users
+        self._lock = threading.Lock()
+        self._last_write = OrderedDict()
+
+    def mark(self, user_id):
+        with self._lock:
+            self._last_write[user_id] = time.monotonic()
+            self._last_write.move_to_end(user_id)
+            while len(self._last_write) > self.max_users:
+                self._last_write.popitem(last=False)
+
+    def wrote_within(self, user_id, seconds):
+        with self._lock:
+            last_write = self._last_write.get(user_id)
+        return last_write is not None and time.monotonic() - last_write < seconds
+
+
+recent_writers = _RecentWriters()
+
+
+def _current_user_id():
+    try:
+        return get_jwt_identity()
+    except RuntimeError:
+        # No JWT was verified for this request
+        return None
+
+
+def _last_write_serializer():
+    return URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt='read-replica-last-write')
+
+
+def _cookie_wrote_within(user_id, seconds):
+    token = request.cookies.get(LAST_WRITE_COOKIE)
+    if not token or seconds <= 0:
+        return False
+    try:
+        return _last_write_serializer().loads(token, max_age=seconds) == str(user_id)
+    except BadSignature:
+        # Tampered, signed with another key or older than the window (SignatureExpired)
+        return False
+
+
+def read_replica(view):
+    """
+    Serve this view's queries from the read replica, unless the current user wrote within the last
+    READ_REPLICA_STICKINESS_SECONDS. Apply below @jwt_required() so the blocklist check stays on the primary.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        user_id = _current_user_id()
+        window = current_app.config['READ_REPLICA_STICKINESS_SECONDS']
+        g.use_replica = user_id is None or not (
+            recent_writers.wrote_within(user_id, window) or _cookie_wrote_within(user_id, window)
+        )
+        return view(*args, **kwargs)
+
+    return wrapper
+
+
+def record_user_write(response):
+    """after_request hook: remember users whose request changed data, so their next reads use the primary."""
+    if request.method in WRITE_METHODS and response.status_code < 400:
+        user_id = _current_user_id()
+        if user_id is not None:
+            recent_writers.mark(user_id)
+            window = current_app.config['READ_REPLICA_STICKINESS_SECONDS']
+            if window > 0 and REPLICA_BIND in (current_app.config.get('SQLALCHEMY_BINDS') or {}):
+                response.set_cookie(
+                    LAST_WRITE_COOKIE, _last_write_serializer().dumps(str(user_id)), max_age=window,
+                    httponly=True, secure=current_app.config['SESSION_COOKIE_SECURE'], samesite='Strict'
+                )
+    return response
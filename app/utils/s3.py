@@ -0,0 +1,24 @@
+from flask import current_app
+
+
+def get_s3_client():
+    """
+    Return the S3 client for this app, creating it on first use.
+    boto3 is imported here rather than at module level: it takes longer to import than the rest of
+    the app combined, and most processes (CLI commands, workers that never touch photos) never need it.
+    """
+    s3_client = current_app.extensions.get('s3_client')
+    if s3_client is None:
+        import boto3
+
+        s3_client = boto3.client(
+            "s3",
+            aws_access_key_id=current_app.config['AWS_ACCESS_KEY_ID'],
+            aws_secret_access_key=current_app.config['AWS_SECRET_ACCESS_KEY'],
+            region_name=current_app.config['AWS_REGION'],
+            endpoint_url=current_app.config.get('S3_ENDPOINT_URL')
+        )
+        # boto3 clients are thread-safe, so one per app is shared across requests
+        current_app.extensions['s3_client'] = s3_client
+
+    return s3_client
@@ -0,0 +1,148 @@
+import datetime
+import math
+from collections import Counter
+
+from sqlalchemy import select, update, insert
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.extensions import db
+from app.models.score import Score
+from app.models.score_histogram import ScoreHistogram
+from app.models.archive import ScoreArchive
+
+_scores = Score.__table__
+_histogram = ScoreHistogram.__table__
+
+ALL_TIME_PERIOD = 'all'
+MAX_BUCKET = 100  # task_score is 0-100; one bucket per point
+
+
+def score_bucket(task_score):
+    return min(max(int(math.floor(float(task_score))), 0), MAX_BUCKET)
+
+
+def month_period(moment):
+    return moment.strftime('%Y-%m')
+
+
+def _increment(period, bucket, amount=1):
+    """Add amount to a histogram bucket as a single upsert, so concurrent scores never lose a count."""
+    dialect = db.session.get_bind(mapper=ScoreHistogram.__mapper__).dialect.name
+    row = {"period": period, "bucket": bucket, "count": amount}
+
+    if dialect == 'mysql':
+        statement = mysql_insert(_histogram).values(row)
+        statement = statement.on_duplicate_key_update(count=_histogram.c.count + amount)
+    elif dialect == 'sqlite':
+        statement = sqlite_insert(_histogram).values(row).on_conflict_do_update(
+            index_elements=['period', 'bucket'], set_={"count": _histogram.c.count + amount}
+        )
+    else:
+        statement = insert(_histogram).values(row)
+
+    db.session.execute(statement)
+
+
+def _score_period(created_at):
+    """Month a score is counted in: that of its created_at, in the live path and the rebuild alike."""
+    return month_period(created_at or datetime.datetime.now(datetime.timezone.utc))
+
+
+def record_score_in_histogram(event_id, task_score):
+    """
+    Count the event's score in its month's and the all-time histogram, once. The flag on the Score row
+    is flipped with a guarded UPDATE first, so a retried or racing caller adds nothing. The caller commits.
+    """
+    if task_score is None:
+        return False
+
+    claimed = db.session.execute(
+        update(_scores)
+        .where(_scores.c.parking_events_id == event_id, _scores.c.counted_in_histogram.is_(False))
+        .values(counted_in_histogram=True)
+    ).rowcount == 1
+    if not claimed:
+        return False
+
+    created_at = db.session.execute(
+        select(_scores.c.created_at).where(_scores.c.parking_events_id == event_id)
+    ).scalar_one()
+    bucket = score_bucket(task_score)
+    for period in (_score_period(created_at), ALL_TIME_PERIOD):
+        _increment(period, bucket)
+    return True
+
+
+def score_percentile(period, task_score):
+    """
+    Share of the period's scores below task_score, in percent (ties count half), from at most 101
+    histogram rows. Returns (percentile or None when the period has no scores, total scores).
+    """
+    counts = dict(db.session.execute(
+        select(_histogram.c.bucket, _histogram.c.count).where(_histogram.c.period == period)
+    ).all())
+    total = sum(counts.values())
+    if not total:
+        return None, 0
+
+    bucket = score_bucket(task_score)
+    below = sum(count for other, count in counts.items() if other < bucket)
+    return round(100.0 * (below + counts.get(bucket, 0) / 2.0) / total, 1), total
+
+
+def _count_uncounted_page(table, after_id, batch_size):
+    """
+    Add one page of the table's uncounted scores to the histograms and flag them, in one transaction.
+    Returns (last id of the page or None when there are no more, scores counted).
+    """
+    id_column = list(table.primary_key.columns)[0]
+    uncounted = (table.c.counted_in_histogram.is_(False), table.c.task_score.is_not(None))
+
+    # The row locks make a concurrent record_score_in_histogram wait, then find the flag already set
+    rows = db.session.execute(
+        select(id_column, table.c.task_score, table.c.created_at)
+        .where(id_column > after_id, *uncounted).order_by(id_column).limit(batch_size)
+        .with_for_update()
+    ).all()
+    if not rows:
+        db.session.rollback()
+        return None, 0
+
+    ids = [row[0] for row in rows]
+    flipped = db.session.execute(
+        update(table).where(id_column.in_(ids), *uncounted).values(counted_in_histogram=True)
+    ).rowcount
+    if flipped != len(ids):
+        # Without row locks (SQLite) a live insert counted some of them meanwhile; redo the page
+        db.session.rollback()
+        return after_id, 0
+
+    counts = Counter()
+    for _, task_score, created_at in rows:
+        bucket = score_bucket(task_score)
+        counts[(_score_period(created_at), bucket)] += 1
+        counts[(ALL_TIME_PERIOD, bucket)] += 1
+    for (period, bucket), count in counts.items():
+        _increment(period, bucket, count)
+    db.session.commit()
+    return ids[-1], len(ids)
+
+
+def rebuild_score_histograms(batch_size=1000):
+    """
+    Add the Score and ScoreArchive rows not yet counted to the histograms, flagging them in the same
+    transaction, one page of batch_size at a time. For scores loaded in bulk (seeding, the migration that
+    added the histogram); safe to run while new scores are recorded. Returns the number of scores counted.
+    """
+    total = 0
+    for table in (_scores, ScoreArchive):
+        after_id = 0
+        try:
+            while after_id is not None:
+                after_id, counted = _count_uncounted_page(table, after_id, batch_size)
+                total += counted
+        except Exception:
+            db.session.rollback()
+            raise
+    return total
@@ -0,0 +1,154 @@
+import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Walks that start closer to the car than this are too short for a meaningful detour ratio
+MIN_STRAIGHT_LINE_M = 20.0
+MAX_ROUTE_PENALTY = 20.0
+
+
+def route_penalty_points(route):
+    """Path-performance points lost for detours and backtracking on the walked route (see geo.route_metrics)."""
+    if not route:
+        return 0.0
+    detour_points = 0.0
+    if route["detour_ratio"] is not None and route["straight_line_m"] >= MIN_STRAIGHT_LINE_M:
+        detour_points = max(0.0, route["detour_ratio"] - 1.0) * 10.0
+    return min(MAX_ROUTE_PENALTY, detour_points + route["backtrack_ratio"] * 20.0)
+
+
+def calculate_score(event, route=None):
+    """
+    Compute the retrieval score for a finished ParkingEvent.
+    route is the optional geo.route_metrics() summary of the walk back to the car.
+    Returns a dict of Score column values; the caller creates and saves the Score row.
+    """
+    # ===== 1. LANDMARK SCORE =====
+    total_landmarks = len(event.landmarks)
+    achieved_landmarks = sum(1 for lm in event.landmarks if lm.is_achieved)
+    has_landmarks = total_landmarks > 0
+
+    landmark_factor = 0.0
+    if total_landmarks > 0:
+        landmark_factor = (float(achieved_landmarks) / float(total_landmarks)) * 100.0
+    else:
+        landmark_factor = 100.0
+
+    # ===== 2. TIME SCORE =====
+    actual_duration = None
+    if event.ended_at and event.navigation_started_at:
+        ended_at_aware = event.ended_at
+        if ended_at_aware.tzinfo is None:
+            ended_at_aware = ended_at_aware.replace(tzinfo=datetime.timezone.utc)
+
+        nav_started_at_aware = event.navigation_started_at
+        if nav_started_at_aware.tzinfo is None:
+            nav_started_at_aware = nav_started_at_aware.replace(tzinfo=datetime.timezone.utc)
+
+        actual_duration = (ended_at_aware - nav_started_at_aware).total_seconds()
+
+    estimated_duration = event.estimated_time
+
+    time_factor = 0.0
+    if actual_duration and estimated_duration and estimated_duration > 0:
+        if actual_duration <= estimated_duration:
+            time_factor = 100.0
+        else:
+            overtime_ratio = (actual_duration - float(estimated_duration)) / float(
+                estimated_duration)
+            time_factor = max(0.0, 100.0 - (overtime_ratio * 100.0))
+
+    # ===== 3. PENALTIES =====
+    map_view_count = event.finalMapViewCount or 0
+
+    # Peek penalty
+    if map_view_count == 0:
+        peek_penalty_points = 0.0
+    elif map_view_count <= 3:
+        peek_penalty_points = float(map_view_count * 1)
+    elif map_view_count <= 7:
+        peek_penalty_points = 3.0 + float((map_view_count - 3) * 1.5)
+    else:
+        peek_penalty_points = min(10.0, 9.0 + float((map_view_count - 7)) * 0.5)
+
+    # CRITICAL FIX: Cap screen time at actual duration
+    screen_time_raw = float(event.finalScreenTime or 0)
+    screen_time = screen_time_raw
+    assist_percentage = 0.0
+
+    if actual_duration and actual_duration > 0:
+        # Cap screen time - it cannot exceed navigation time!
+        if screen_time_raw > actual_duration:
+            screen_time = actual_duration
+
+        # Calculate percentage using CAPPED screen time
+        assist_percentage = (screen_time / float(actual_duration)) * 100.0
+        assist_penalty_points = min(15.0, (assist_percentage / 5.0))
+    else:
+        # Fallback if no duration available
+        assist_penalty_points = min(15.0, screen_time / 20.0)
+        if screen_time > 0:
+            assist_percentage = 100.0  # Assume worst case
+
+    # ===== 4. PATH PERFORMANCE =====
+    route_points = route_penalty_points(route)
+    path_performance = 100.0 - (peek_penalty_points * 1.0) - (assist_penalty_points * 0.2) - route_points
+    path_performance = max(0.0, min(100.0, path_performance))
+
+    # ===== 5. CALCULATE FINAL SCORE =====
+    if has_landmarks:
+        base_score = (
+                (landmark_factor * 0.50) +
+                (time_factor * 0.30) +
+                (path_performance * 0.20)
+        )
+    else:
+        base_score = (
+                (time_factor * 0.60) +
+                (path_performance * 0.40)
+        )
+
+    # Apply penalties
+    total_penalty = peek_penalty_points
+    final_task_score = max(0.0, base_score - total_penalty)
+
+    # One record per score instead of ~25 blocking print() calls; the fields are only built when enabled
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Score calculated", extra={"fields": {
+            "parking_events_id": event.parking_events_id,
+            "has_landmarks": has_landmarks,
+            "landmarks_recalled": achieved_landmarks,
+            "no_of_landmarks": total_landmarks,
+            "actual_duration_s": actual_duration,
+            "estimated_duration_s": estimated_duration,
+            "map_view_count": map_view_count,
+            "screen_time_raw_s": screen_time_raw,
+            "screen_time_s": screen_time,
+            "screen_time_capped": screen_time != screen_time_raw,
+            "assist_percentage": round(assist_percentage, 1),
+            "landmark_factor": round(landmark_factor, 2) if has_landmarks else None,
+            "time_factor": round(time_factor, 2),
+            "path_length_m": round(route["path_length_m"], 1) if route else None,
+            "detour_ratio": round(route["detour_ratio"], 3) if route and route["detour_ratio"] is not None else None,
+            "backtrack_ratio": round(route["backtrack_ratio"], 3) if route else None,
+            "route_penalty_points": round(route_points, 2),
+            "path_performance": round(path_performance, 2),
+            "base_score": round(base_score, 2),
+            "peek_penalty_points": round(peek_penalty_points, 2),
+            "assist_penalty_points": round(assist_penalty_points, 2),
+            "total_penalty": round(total_penalty, 2),
+            "final_score": round(final_task_score, 2),
+        }})
+
+    return {
+        "time_factor": round(time_factor, 2),
+        "landmark_factor": round(landmark_factor, 2),
+        "landmarks_recalled": achieved_landmarks,
+        "no_of_landmarks": total_landmarks,
+        "path_performance": round(path_performance, 2),
+        "peek_penalty": int(map_view_count),
+        "assist_penalty": int(screen_time),  # Use CAPPED value
+        "task_score": round(final_task_score, 2),
+        "assistance_points": int(event.finalMapViewCount or 0),
+    }
@@ -0,0 +1,185 @@
+import datetime
+import logging
+import threading
+
+from flask import current_app
+from sqlalchemy import update, or_, and_
+
+from app.extensions import db
+from app.models.parking_event import ParkingEvent, StatusEnum
+from app.models.scoring_job import ScoringJob, ScoringJobStatusEnum
+from app.utils.event_state import compare_and_swap, insert_score_once
+from app.utils.score_histogram import record_score_in_histogram
+from app.utils.scoring import calculate_score
+from app.utils.tracking import parse_route_polyline, walked_route
+
+logger = logging.getLogger(__name__)
+
+PENDING_STATUSES = (ScoringJobStatusEnum.queued, ScoringJobStatusEnum.running)
+
+
+def enqueue_scoring_job(event_id, route_polyline, now):
+    """Queue the event for scoring, or requeue its finished job, in the caller's transaction."""
+    job = ScoringJob.query.filter_by(parking_events_id=event_id).first()
+    if job is None:
+        job = ScoringJob(parking_events_id=event_id)
+        db.session.add(job)
+
+    job.status = ScoringJobStatusEnum.queued
+    job.route_polyline = route_polyline
+    job.attempts = 0
+    job.run_after = now
+    job.locked_until = None
+    job.last_error = None
+    return job
+
+
+def claim_scoring_job(now):
+    """
+    Take the oldest runnable job: queued and due, or running with an expired lease.
+    Returns its id, or None when there is nothing to do. Commits the claim.
+    """
+    job = ScoringJob.query.filter(or_(
+        and_(ScoringJob.status == ScoringJobStatusEnum.queued, ScoringJob.run_after <= now),
+        and_(ScoringJob.status == ScoringJobStatusEnum.running, ScoringJob.locked_until < now),
+    )).order_by(ScoringJob.scoring_jobs_id).with_for_update(skip_locked=True).first()
+
+    if job is None:
+        db.session.rollback()
+        return None
+
+    # SKIP LOCKED keeps MySQL workers on different rows; the guarded UPDATE also settles
+    # races on databases without row locks (SQLite)
+    claimed = db.session.execute(
+        update(ScoringJob.__table__)
+        .where(ScoringJob.__table__.c.scoring_jobs_id == job.scoring_jobs_id,
+               ScoringJob.__table__.c.status == job.status,
+               ScoringJob.__table__.c.attempts == job.attempts)
+        .values(status=ScoringJobStatusEnum.running,
+                attempts=job.attempts + 1,
+                locked_until=now + current_app.config['SCORING_JOB_LEASE'])
+    ).rowcount == 1
+    db.session.commit()
+    return job.scoring_jobs_id if claimed else None
+
+
+def run_scoring_job(job_id, now):
+    """Score the job's event and move it to 'active'; failures are retried with backoff until SCORING_JOB_MAX_ATTEMPTS."""
+    job = db.session.get(ScoringJob, job_id)
+    max_attempts = current_app.config['SCORING_JOB_MAX_ATTEMPTS']
+
+    try:
+        if job.attempts > max_attempts:
+            # The lease of the last allowed attempt expired, so the worker running it died
+            raise RuntimeError("Worker lease expired on the last attempt")
+
+        event = db.session.get(ParkingEvent, job.parking_events_id)
+        if not event.score:
+            route_points = parse_route_polyline(job.route_polyline) if job.route_polyline else None
+            score_values = calculate_score(event, walked_route(event, route_points))
+            insert_score_once(event.parking_events_id, score_values)
+            record_score_in_histogram(event.parking_events_id, score_values['task_score'])
+
+        # Leave the status alone if the user already moved the event on
+        if event.status == StatusEnum.retrieved:
+            compare_and_swap(event.parking_events_id, event.version, status='active')
+
+        job.status = ScoringJobStatusEnum.succeeded
+        job.locked_until = None
+        db.session.commit()
+        logger.debug("Scoring job succeeded", extra={"fields": {"scoring_jobs_id": job_id,
+                                                                 "parking_events_id": job.parking_events_id}})
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.exception("Scoring job failed", extra={"fields": {"scoring_jobs_id": job_id}})
+
+        job = db.session.get(ScoringJob, job_id)
+        job.last_error = str(e)[:1024] or type(e).__name__
+        job.locked_until = None
+        if job.attempts >= max_attempts:
+            job.status = ScoringJobStatusEnum.failed
+        else:
+            job.status = ScoringJobStatusEnum.queued
+            job.run_after = now + datetime.timedelta(seconds=2 ** job.attempts)
+        db.session.commit()
+        return False
+
+
+def run_pending_scoring_jobs(max_jobs=None):
+    """Run due jobs in this thread until none are left (or max_jobs ran). Returns the number of jobs run."""
+    ran = 0
+    while max_jobs is None or ran < max_jobs:
+        now = datetime.datetime.now(datetime.timezone.utc)
+        job_id = claim_scoring_job(now)
+        if job_id is None:
+            break
+        run_scoring_job(job_id, now)
+        ran += 1
+    return ran
+
+
+class ScoringWorkerPool:
+    """
+    Daemon threads that drain the ScoringJob table. Each process runs its own pool; the table is the
+    queue, so jobs survive restarts and are shared between gunicorn workers.
+    """
+
+    def __init__(self, app, workers, poll_interval):
+        self.app = app
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        if self._threads:
+            return
+        with self._start_lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"scoring-worker-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def wake(self):
+        """Skip the poll wait, so a job enqueued by a request starts right away."""
+        self._wakeup.set()
+
+    def stop(self, timeout=None):
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                with self.app.app_context():
+                    run_pending_scoring_jobs()
+            except Exception:
+                logger.exception("Scoring worker error")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+
+def init_scoring_workers(app):
+    """
+    Attach a ScoringWorkerPool of SCORING_WORKERS threads. It starts with the first request,
+    so CLI commands (migrations, seeding) never spawn workers.
+    """
+    if not app.config['SCORING_WORKERS']:
+        return
+
+    pool = ScoringWorkerPool(app, app.config['SCORING_WORKERS'], app.config['SCORING_POLL_INTERVAL'])
+    app.extensions['scoring_workers'] = pool
+    app.before_request(pool.start)
+
+
+def wake_scoring_workers():
+    pool = current_app.extensions.get('scoring_workers')
+    if pool is not None:
+        pool.wake()
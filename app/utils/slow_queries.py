@@ -0,0 +1,141 @@
+import datetime
+import logging
+import threading
+import time
+from collections import deque
+
+from flask import has_request_context, request
+from sqlalchemy import event
+
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+# Statements MySQL and SQLite can EXPLAIN without running them
+EXPLAINABLE_PREFIXES = ('select', 'insert', 'update', 'delete', 'replace', 'with')
+MAX_PARAMETER_LENGTH = 200  # Longer values (e.g. route polylines) are cut in the log
+
+
+class SlowQueryLog:
+    """Bounded, thread-safe ring buffer of the most recent slow statements in this process."""
+
+    def __init__(self, capacity=100):
+        self._lock = threading.Lock()
+        self._records = deque(maxlen=capacity)
+
+    @property
+    def capacity(self):
+        return self._records.maxlen
+
+    def resize(self, capacity):
+        with self._lock:
+            self._records = deque(self._records, maxlen=capacity)
+
+    def add(self, record):
+        with self._lock:
+            self._records.append(record)
+
+    def records(self):
+        """Newest first."""
+        with self._lock:
+            return list(reversed(self._records))
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+
+slow_query_log = SlowQueryLog()
+
+
+def _loggable(value):
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    text = value.isoformat() if isinstance(value, (datetime.date, datetime.time)) else str(value)
+    return text if len(text) <= MAX_PARAMETER_LENGTH else text[:MAX_PARAMETER_LENGTH] + '...'
+
+
+def _loggable_parameters(parameters):
+    if isinstance(parameters, dict):
+        return {key: _loggable(value) for key, value in parameters.items()}
+    return [_loggable(value) for value in parameters or ()]
+
+
+def _explain(cursor, dialect_name, statement, parameters):
+    """
+    EXPLAIN the statement on a second cursor of the same DBAPI connection, so the plan reflects the
+    session that ran it. Returns a list of plan rows as dicts, or None when it cannot be explained.
+    """
+    if not statement.lstrip().lower().startswith(EXPLAINABLE_PREFIXES):
+        return None
+
+    prefix = 'EXPLAIN QUERY PLAN' if dialect_name == 'sqlite' else 'EXPLAIN'
+    explain_cursor = cursor.connection.cursor()
+    try:
+        explain_cursor.execute(f"{prefix} {statement}", parameters)
+        columns = [column[0] for column in explain_cursor.description]
+        return [{column: _loggable(value) for column, value in zip(columns, row)}
+                for row in explain_cursor.fetchall()]
+    except Exception as e:
+        # The plan is best effort; never fail the request that was only being observed
+        logger.debug("Could not EXPLAIN slow query: %s", e)
+        return None
+    finally:
+        explain_cursor.close()
+
+
+def _calling_route():
+    if not has_request_context():
+        return threading.current_thread().name  # Scoring workers and CLI commands
+    rule = request.url_rule.rule if request.url_rule is not None else request.path
+    return f"{request.method} {rule}"
+
+
+def init_slow_query_log(app):
+    """
+    Record every statement slower than SLOW_QUERY_THRESHOLD_MS, with its parameters, the route that ran it
+    and its EXPLAIN plan, in slow_query_log (served by GET /admin/slow-queries). 0 disables it.
+    Must run inside an app context, after db.init_app().
+    """
+    threshold_ms = app.config.get('SLOW_QUERY_THRESHOLD_MS')
+    if not threshold_ms:
+        return
+
+    threshold = threshold_ms / 1000.0
+    capture_plan = app.config.get('SLOW_QUERY_EXPLAIN', True)
+    if slow_query_log.capacity != app.config['SLOW_QUERY_LOG_SIZE']:
+        slow_query_log.resize(app.config['SLOW_QUERY_LOG_SIZE'])
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info['query_start_time'] = time.perf_counter()
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop('query_start_time', None)
+        if started is None:
+            return
+        duration = time.perf_counter() - started
+        if duration < threshold:
+            return
+
+        plan = None
+        if capture_plan and not executemany:
+            plan = _explain(cursor, conn.dialect.name, statement, parameters)
+
+        record = {
+            "at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "duration_ms": round(duration * 1000.0, 1),
+            "route": _calling_route(),
+            "statement": statement,
+            # executemany() runs one statement for many rows; the first row shows their shape
+            "parameters": _loggable_parameters(parameters[0] if executemany and parameters else parameters),
+            "rows": None if executemany else cursor.rowcount,
+            "explain": plan,
+        }
+        slow_query_log.add(record)
+        logger.warning("Slow query", extra={"fields": {
+            key: record[key] for key in ('duration_ms', 'route', 'statement')}})
+
+    # Applies to the primary and the read replica alike
+    for engine in db.engines.values():
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', after_cursor_execute)
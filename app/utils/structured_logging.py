@@ -0,0 +1,92 @@
+import atexit
+import copy
+import datetime
+import json
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import has_request_context, request
+
+# Every module logs through logging.getLogger(__name__), so they all sit under this logger
+APP_LOGGER_NAME = 'app'
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; values passed as extra={"fields": {...}} become top-level keys."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key in ('method', 'path'):
+            if hasattr(record, key):
+                entry[key] = getattr(record, key)
+        entry.update(getattr(record, 'fields', None) or {})
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable variant for local development: the message followed by key=value fields."""
+
+    def format(self, record):
+        line = f"{self.formatTime(record)} {record.levelname:<7} {record.name}: {record.getMessage()}"
+        fields = getattr(record, 'fields', None)
+        if fields:
+            line += ' ' + ' '.join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_text:
+            line += '\n' + record.exc_text
+        return line
+
+
+class _RequestQueueHandler(QueueHandler):
+    """
+    Enqueues records for the background writer. Only the cheap parts happen on the request thread:
+    merging the message args, capturing the request path and rendering any traceback.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        if has_request_context():
+            record.method = request.method
+            record.path = request.path
+        return record
+
+
+def configure_logging(app):
+    """
+    Route the 'app' logger through a queue to a background thread that writes to stdout,
+    so logging never blocks a request on I/O. Safe to call for every create_app().
+    """
+    logger = logging.getLogger(APP_LOGGER_NAME)
+    logger.setLevel(app.config['LOG_LEVEL'])
+
+    # Per-module overrides, e.g. LOG_LEVELS = {'app.utils.scoring': 'DEBUG'}
+    for name, level in (app.config.get('LOG_LEVELS') or {}).items():
+        logging.getLogger(name).setLevel(level)
+
+    if any(isinstance(handler, _RequestQueueHandler) for handler in logger.handlers):
+        return
+
+    formatter = JsonFormatter() if app.config['LOG_FORMAT'] == 'json' else TextFormatter()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # Flush whatever is still queued on shutdown
+
+    logger.addHandler(_RequestQueueHandler(log_queue))
+    logger.propagate = False
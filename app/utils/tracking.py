@@ -0,0 +1,109 @@
+import datetime
+
+from flask import current_app
+from sqlalchemy import insert, select
+
+from app.extensions import db
+from app.models.track_point import TrackPoint
+from app.utils.geo import reached_targets, decode_polyline, route_metrics
+
+
+def _parse_timestamp(value):
+    recorded_at = datetime.datetime.fromisoformat(value)
+    if recorded_at.tzinfo is None:
+        recorded_at = recorded_at.replace(tzinfo=datetime.timezone.utc)
+    return recorded_at.astimezone(datetime.timezone.utc)
+
+
+def parse_track_points(points):
+    """
+    Validate a batch of {"latitude", "longitude", "recorded_at"} points.
+    Returns (latitudes, longitudes, timestamps) lists; raises ValueError naming the first bad point.
+    """
+    latitudes, longitudes, timestamps = [], [], []
+    for index, point in enumerate(points):
+        try:
+            latitude = float(point['latitude'])
+            longitude = float(point['longitude'])
+            recorded_at = _parse_timestamp(point['recorded_at'])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"Point {index} must have numeric latitude/longitude and an ISO 8601 recorded_at")
+        if not (-90.0 <= latitude <= 90.0 and -180.0 <= longitude <= 180.0):
+            raise ValueError(f"Point {index} is outside the valid coordinate range")
+        latitudes.append(latitude)
+        longitudes.append(longitude)
+        timestamps.append(recorded_at)
+    return latitudes, longitudes, timestamps
+
+
+def record_track_points(event, latitudes, longitudes, timestamps):
+    """
+    Bulk-insert one batch of breadcrumbs and mark the event's landmarks that the batch passed within
+    LANDMARK_ACHIEVED_RADIUS_M of. Returns the ids of newly achieved landmarks; the caller commits.
+    """
+    db.session.execute(insert(TrackPoint), [
+        {
+            "parking_events_id": event.parking_events_id,
+            "latitude": latitude,
+            "longitude": longitude,
+            "recorded_at": recorded_at,
+        }
+        for latitude, longitude, recorded_at in zip(latitudes, longitudes, timestamps)
+    ])
+
+    # Earlier batches already checked every landmark they passed, so only pending ones are tested
+    pending = [
+        landmark for landmark in event.landmarks
+        if not landmark.is_achieved and landmark.landmark_latitude is not None
+        and landmark.landmark_longitude is not None
+    ]
+    reached = reached_targets(
+        latitudes, longitudes,
+        [float(landmark.landmark_latitude) for landmark in pending],
+        [float(landmark.landmark_longitude) for landmark in pending],
+        current_app.config['LANDMARK_ACHIEVED_RADIUS_M'],
+    )
+
+    achieved_ids = []
+    for landmark, is_reached in zip(pending, reached):
+        if is_reached:
+            landmark.is_achieved = True
+            achieved_ids.append(landmark.landmarks_id)
+    return achieved_ids
+
+
+# decode_polyline accepts at most 7 characters per coordinate, so longer strings have too many points
+MAX_POLYLINE_CHARS_PER_POINT = 14
+
+
+def parse_route_polyline(encoded_polyline):
+    """Decode a submitted route_polyline into (latitudes, longitudes); raises ValueError if malformed or oversized."""
+    if not isinstance(encoded_polyline, str):
+        raise ValueError("route_polyline must be an encoded polyline string")
+    max_points = current_app.config['ROUTE_MAX_POINTS']
+    # Checked before decoding, so an oversized payload costs no decode time or memory
+    if len(encoded_polyline) > max_points * MAX_POLYLINE_CHARS_PER_POINT:
+        raise ValueError(f"route_polyline may have at most {max_points} points")
+    latitudes, longitudes = decode_polyline(encoded_polyline)
+    if latitudes.size > max_points:
+        raise ValueError(f"route_polyline may have at most {max_points} points")
+    return latitudes, longitudes
+
+
+def walked_route(event, route_points=None):
+    """
+    Route metrics for the walk back to the car, from parsed route_polyline points or,
+    without them, from the event's recorded breadcrumbs. Returns None when there is no route.
+    """
+    if route_points is not None:
+        latitudes, longitudes = route_points
+    else:
+        rows = db.session.execute(
+            select(TrackPoint.latitude, TrackPoint.longitude)
+            .where(TrackPoint.parking_events_id == event.parking_events_id)
+            .order_by(TrackPoint.recorded_at, TrackPoint.track_points_id)
+        ).all()
+        latitudes = [float(row.latitude) for row in rows]
+        longitudes = [float(row.longitude) for row in rows]
+
+    return route_metrics(latitudes, longitudes, event.parking_latitude, event.parking_longitude)
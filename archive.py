@@ -0,0 +1,38 @@
+import time
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import select, func
+from app.extensions import db
+from app.models.parking_event import ParkingEvent
+from app.models.user_type import UserType  # noqa: F401 - lets the User mapper resolve 'UserType' on its own
+from app.utils.archive import archivable_criteria, archive_cutoff, archive_finished_events
+
+# Create a new Click command group
+archive_cli = click.Group("archive", help="Commands to move old parking history out of the hot tables.")
+
+
+@archive_cli.command("run", help="Moves finished parking events older than --months into the archive tables.")
+@click.option('--months', type=int, default=None,
+              help="Archive events that finished more than this many months ago [default: ARCHIVE_AFTER_MONTHS].")
+@click.option('--batch-size', type=int, default=1000, show_default=True, help="Events moved per transaction.")
+@click.option('--max-batches', type=int, default=None, help="Stop after this many batches.")
+@click.option('--dry-run', is_flag=True, help="Only count the events that would be archived.")
+@with_appcontext
+def run(months, batch_size, max_batches, dry_run):
+    """Archives events, their landmarks and scores in batched, FK-safe transactions."""
+    months = months if months is not None else current_app.config['ARCHIVE_AFTER_MONTHS']
+    cutoff = archive_cutoff(months)
+
+    if dry_run:
+        count = db.session.execute(
+            select(func.count()).select_from(ParkingEvent).where(*archivable_criteria(cutoff))
+        ).scalar()
+        print(f"{count} events finished before {cutoff:%Y-%m-%d} would be archived.")
+        return
+
+    start_time = time.perf_counter()
+    moved = archive_finished_events(cutoff, batch_size=batch_size, max_batches=max_batches)
+    print(f"Archived {moved} events finished before {cutoff:%Y-%m-%d} "
+          f"in {time.perf_counter() - start_time:.1f}s.")
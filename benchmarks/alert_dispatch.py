@@ -0,0 +1,107 @@
+"""
+End-to-end check of emergency-alert dispatch against benchmarks/local_smtp.py:
+
+    register with an emergency contact (plus a second one) -> POST /parking -> PUT status=retrieving
+    -> PUT status=expired, twice -> dispatch_alert_batch while the SMTP server answers 550 for one contact
+    -> dispatch again once that contact's backoff has passed
+
+Checks that every contact gets exactly one email, that a 550 is retried rather than dropped, and that a
+repeated PUT queues no duplicate. Exits with code 1 when a check fails.
+
+Usage:
+    python benchmarks/alert_dispatch.py
+"""
+import datetime
+import sys
+
+from app_factory import BenchmarkConfig, create_benchmark_app
+from harness import Checks
+from local_smtp import LocalSMTPServer
+
+from app.extensions import db
+from app.models.alert_outbox import AlertOutbox
+from app.models.emergency_contact import EmergencyContact
+from app.utils.alerts import dispatch_alert_batch, RateLimiter
+
+BATCH_SIZE = 50
+MAX_ATTEMPTS = 5
+FIRST_CONTACT = 'first-contact@memopark.local'
+SECOND_CONTACT = 'second-contact@memopark.local'
+
+
+def _recipients(smtp):
+    return sorted(message['To'] for message in smtp.messages)
+
+
+def main():
+    smtp = LocalSMTPServer().start()
+
+    class AlertCheckConfig(BenchmarkConfig):
+        ALERT_SMTP_HOST = smtp.host
+        ALERT_SMTP_PORT = smtp.port
+        ALERT_RATE_PER_SECOND = 0  # No provider limit to respect locally
+
+    app = create_benchmark_app(AlertCheckConfig)
+    client = app.test_client()
+    checks = Checks()
+
+    body = client.post('/auth/register', json={
+        'user_email': 'alert-check@memopark.local', 'user_password': 'alert-check-password', 'user_name': 'Alert Check',
+        'emergency_contact': {'emergency_contact_name': 'First', 'emergency_email': FIRST_CONTACT,
+                              'is_allow_alerts': True},
+    }).get_json()
+    headers = {'Authorization': f"Bearer {body['access_token']}"}
+    user_id = client.get('/auth/profile', headers=headers).get_json()['user_id']
+    with app.app_context():
+        db.session.add(EmergencyContact(user_id=user_id, emergency_contact_name='Second',
+                                        emergency_email=SECOND_CONTACT, is_allow_alerts=True))
+        db.session.commit()
+
+    event_id = client.post('/parking', headers=headers, json={
+        'parking_latitude': -37.8136, 'parking_longitude': 144.9631, 'parking_location_name': 'Alert check car park'
+    }).get_json()['parking_events_id']
+    client.put(f'/parking/{event_id}', headers=headers, json={'status': 'retrieving', 'estimated_time': 300})
+    statuses = [client.put(f'/parking/{event_id}', headers=headers, json={'status': 'expired'}).status_code
+                for _ in range(2)]
+    checks.expect("expiring the navigation (and retrying the PUT) succeeds", statuses == [200, 200], statuses)
+
+    smtp.rejected_recipients.add(SECOND_CONTACT)
+    with app.app_context():
+        checks.expect("one alert per contact is queued", AlertOutbox.query.count() == 2, AlertOutbox.query.count())
+
+        sent, failed = dispatch_alert_batch(BATCH_SIZE, MAX_ATTEMPTS, RateLimiter(0))
+        checks.expect("the accepted contact is emailed, the 550 is reported as failed",
+                      (sent, failed) == (1, 1) and _recipients(smtp) == [FIRST_CONTACT], (sent, failed, _recipients(smtp)))
+
+        pending = AlertOutbox.query.all()
+        checks.expect("the refused alert stays queued for a retry, with the error and a backoff",
+                      len(pending) == 1 and pending[0].recipient == SECOND_CONTACT and pending[0].attempts == 1
+                      and '550' in (pending[0].last_error or '') and pending[0].locked_by is None,
+                      [(alert.recipient, alert.attempts, alert.last_error) for alert in pending])
+        db.session.commit()
+
+    # A client retrying the same status change must not queue the contacts again
+    client.put(f'/parking/{event_id}', headers=headers, json={'status': 'expired'})
+    with app.app_context():
+        checks.expect("a repeated PUT queues no duplicate", AlertOutbox.query.count() == 1, AlertOutbox.query.count())
+        checks.expect("nothing is sent before the backoff has passed",
+                      dispatch_alert_batch(BATCH_SIZE, MAX_ATTEMPTS, RateLimiter(0)) == (0, 0))
+
+        smtp.rejected_recipients.clear()
+        db.session.execute(db.update(AlertOutbox).values(
+            next_attempt_at=datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=1)))
+        db.session.commit()
+        checks.expect("the retry is delivered once the contact accepts mail",
+                      dispatch_alert_batch(BATCH_SIZE, MAX_ATTEMPTS, RateLimiter(0)) == (1, 0))
+        checks.expect("the outbox is empty afterwards", AlertOutbox.query.count() == 0, AlertOutbox.query.count())
+
+    checks.expect("every contact got exactly one email",
+                  _recipients(smtp) == [FIRST_CONTACT, SECOND_CONTACT], _recipients(smtp))
+
+    smtp.stop()
+    print(f"\n{checks.failures} check(s) failed" if checks.failures else "\nAll alert dispatch checks passed")
+    return 1 if checks.failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
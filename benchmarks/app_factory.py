@@ -0,0 +1,36 @@
+import os
+import sys
+
+# Allow running the scripts directly (python benchmarks/<name>.py) from the repository root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from config import Config
+from app import create_app
+from app.extensions import db
+
+
+class BenchmarkConfig(Config):
+    """In-memory SQLite app used by the benchmark and load-test scripts."""
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    JWT_SECRET_KEY = 'benchmark-jwt-secret-key-at-least-32-bytes'
+    JWT_VERIFY_SUB = False  # Tokens carry the int user_id; PyJWT>=2.10 rejects non-string subjects
+    SCORING_WORKERS = 0  # The in-memory database has a single shared connection; see LoadTestConfig
+    S3_BUCKET = 'memopark-benchmark'
+    AWS_ACCESS_KEY_ID = 'benchmark'
+    AWS_SECRET_ACCESS_KEY = 'benchmark'
+    AWS_REGION = 'us-east-1'
+
+
+def create_benchmark_app(config_object=BenchmarkConfig):
+    """Create the app, build every table and seed the two user types."""
+    app = create_app(config_object)
+    with app.app_context():
+        from app.models.user_type import UserType
+
+        db.create_all()
+        db.session.add_all([UserType(user_type='admin'), UserType(user_type='user')])
+        db.session.commit()
+    return app
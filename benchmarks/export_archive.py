@@ -0,0 +1,102 @@
+"""
+End-to-end check that `flask export scores` covers archived events:
+
+    register -> five scored events -> two of them finish long ago -> flask archive run's archive_finished_events
+    -> flask export scores --format csv, in chunks smaller than the score count
+
+Checks that every score is exported exactly once, archived ones with their event's data, and that the
+archived events really left the hot tables. Exits with code 1 when a check fails.
+
+Usage:
+    python benchmarks/export_archive.py
+"""
+import csv
+import datetime
+import glob
+import os
+import sys
+import tempfile
+
+from app_factory import BenchmarkConfig, create_benchmark_app
+from harness import Checks
+
+from app.extensions import db
+from app.models.parking_event import ParkingEvent, StatusEnum
+from app.models.score import Score
+from app.utils.archive import archive_finished_events
+from export import export_cli
+
+SCORES = 5
+ARCHIVED_EVENTS = 2
+CHUNK_SIZE = 2  # Smaller than SCORES, so the keyset pagination crosses the hot and archive tables
+FINISHED_AT = datetime.datetime(2020, 1, 1)
+
+
+def _exported_rows(output):
+    rows = []
+    for path in glob.glob(os.path.join(output, 'month=*', 'scores.csv')):
+        with open(path, newline='') as f:
+            rows.extend(csv.DictReader(f))
+    return rows
+
+
+def main():
+    class ExportCheckConfig(BenchmarkConfig):
+        EXPORT_PSEUDONYM_KEY = 'export-check-pseudonym-key'
+
+    app = create_benchmark_app(ExportCheckConfig)
+    client = app.test_client()
+    checks = Checks()
+
+    body = client.post('/auth/register', json={
+        'user_email': 'export-check@memopark.local', 'user_password': 'export-check-password',
+        'user_name': 'Export Check',
+    }).get_json()
+    headers = {'Authorization': f"Bearer {body['access_token']}"}
+
+    event_ids = []
+    for index in range(SCORES):
+        event_id = client.post('/parking', headers=headers, json={
+            'parking_latitude': -37.8136, 'parking_longitude': 144.9631, 'parking_location_name': 'Export check'
+        }).get_json()['parking_events_id']
+        client.post(f'/parking/{event_id}/score', headers=headers, json={'task_score': 10.0 * index})
+        event_ids.append(event_id)
+
+    archived_ids = event_ids[1:1 + 2 * ARCHIVED_EVENTS:2]
+    with app.app_context():
+        for event_id in archived_ids:
+            event = db.session.get(ParkingEvent, event_id)
+            event.status = StatusEnum.score_watched
+            event.ended_at = FINISHED_AT
+        db.session.commit()
+
+        moved = archive_finished_events(FINISHED_AT + datetime.timedelta(days=1))
+        hot_scores = Score.query.count()
+    checks.expect("the old events are archived", moved == ARCHIVED_EVENTS, moved)
+    checks.expect("their scores left the hot table", hot_scores == SCORES - ARCHIVED_EVENTS, hot_scores)
+
+    with tempfile.TemporaryDirectory() as output:
+        result = app.test_cli_runner().invoke(
+            export_cli, ['scores', '--format', 'csv', '--output', output, '--chunk-size', str(CHUNK_SIZE)]
+        )
+        checks.expect("the export succeeds", result.exit_code == 0, result.output or result.exception)
+        rows = _exported_rows(output)
+
+    exported = sorted(int(row['parking_events_id']) for row in rows)
+    checks.expect("every score is exported exactly once, archived ones included",
+                  exported == sorted(event_ids), exported)
+    archived_rows = [row for row in rows if int(row['parking_events_id']) in archived_ids]
+    checks.expect("archived scores carry their event's status and end time",
+                  len(archived_rows) == ARCHIVED_EVENTS
+                  and all(row['status'] == 'score_watched' and row['ended_at'].startswith('2020-01-01')
+                          for row in archived_rows),
+                  [(row['status'], row['ended_at']) for row in archived_rows])
+    checks.expect("archived and hot scores of the user share one pseudonym",
+                  len({row['user_pseudonym'] for row in rows}) == 1, {row['user_pseudonym'] for row in rows})
+
+    print(f"\n{checks.failures} check(s) failed" if checks.failures else "\nAll export checks passed")
+    return 1 if checks.failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
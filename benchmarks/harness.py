@@ -0,0 +1,94 @@
+"""
+Minimal pytest-benchmark style runner: warm up, time a callable for a number of rounds,
+and compare the median against a stored baseline. Also the PASS/FAIL reporter of the check scripts.
+"""
+import json
+import os
+import statistics
+import time
+
+
+class BenchmarkResult:
+    def __init__(self, name, timings):
+        self.name = name
+        self.rounds = len(timings)
+        self.min_ms = min(timings) * 1000.0
+        self.median_ms = statistics.median(timings) * 1000.0
+        self.mean_ms = statistics.mean(timings) * 1000.0
+        self.stddev_ms = statistics.pstdev(timings) * 1000.0
+
+    def as_row(self):
+        return (f"{self.name:<45} {self.rounds:>6} {self.min_ms:>10.3f} {self.median_ms:>10.3f} "
+                f"{self.mean_ms:>10.3f} {self.stddev_ms:>10.3f}")
+
+
+def bench(name, func, rounds=20, warmup=2):
+    """Time func() `rounds` times after `warmup` untimed calls."""
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return BenchmarkResult(name, timings)
+
+
+def median_of_runs(runs):
+    """
+    Combine repeated runs of the same benchmarks (lists of results, in the same order): for each benchmark,
+    keep the run whose median is the median across runs, so one noisy run moves neither the check nor a baseline.
+    """
+    combined = []
+    for results in zip(*runs):
+        ranked = sorted(results, key=lambda result: result.median_ms)
+        combined.append(ranked[(len(ranked) - 1) // 2])
+    return combined
+
+
+def print_results(results):
+    print(f"{'benchmark':<45} {'rounds':>6} {'min ms':>10} {'median ms':>10} {'mean ms':>10} {'stddev ms':>10}")
+    for result in results:
+        print(result.as_row())
+
+
+def write_baseline(results, filename):
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, 'w') as f:
+        json.dump({result.name: round(result.median_ms, 3) for result in results}, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare_to_baseline(results, filename, tolerance):
+    """Return a list of failure messages for medians slower than baseline * (1 + tolerance)."""
+    if not os.path.exists(filename):
+        print(f"No baseline at {filename}; run with --write-baseline to create one.")
+        return []
+
+    with open(filename) as f:
+        baseline = json.load(f)
+
+    failures = []
+    for result in results:
+        base_ms = baseline.get(result.name)
+        if base_ms is None:
+            continue
+        budget = base_ms * (1.0 + tolerance)
+        if result.median_ms > budget:
+            failures.append(f"{result.name}: median {result.median_ms:.3f}ms exceeds budget {budget:.3f}ms "
+                            f"(baseline {base_ms}ms)")
+    return failures
+
+
+class Checks:
+    """Prints PASS/FAIL per check and counts the failures, for the end-to-end check scripts."""
+
+    def __init__(self):
+        self.failures = 0
+
+    def expect(self, description, condition, detail=''):
+        print(f"{'PASS' if condition else 'FAIL'}  {description}" + (f"  ({detail})" if detail and not condition else ''))
+        if not condition:
+            self.failures += 1
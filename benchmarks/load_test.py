@@ -0,0 +1,246 @@
+"""
+End-to-end load generator that replays the mobile session flow:
+
+    register (once per virtual user) -> login -> POST /parking -> POST /parking/<id>/landmarks
+    -> POST /parking/<id>/photo -> PUT status=retrieving -> GET /parking/latest-active
+    -> PATCH each landmark -> PUT status=retrieved -> poll GET /parking/<id>/scoring-job -> GET /scores
+
+Two targets:
+  * --base-url http://127.0.0.1:8000   drive a running server (e.g. gunicorn with N workers); point its
+                                       S3_ENDPOINT_URL at a local S3 stand-in such as MinIO
+  * --in-process (default)             drive the app through Flask test clients on a temporary SQLite
+                                       file, with photos written by benchmarks/local_s3.py
+
+Reports p50/p95/p99 latency, throughput and error counts per endpoint. Errors on the PUT/PATCH steps
+under concurrency usually mean lock contention on ParkingEvent rows.
+
+Usage:
+    python benchmarks/load_test.py --users 8 --sessions 5
+    python benchmarks/load_test.py --base-url http://127.0.0.1:8000 --users 32 --sessions 20
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from app_factory import BenchmarkConfig, create_benchmark_app
+from local_s3 import install_local_s3
+
+PHOTO_BYTES = b'\xff\xd8\xff\xe0' + os.urandom(48 * 1024)  # ~48 KB fake JPEG
+SCORING_POLL_SECONDS = 0.05
+SCORING_WAIT_SECONDS = 30
+
+
+class HttpTransport:
+    """Sends requests to a running server with urllib."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method, path, json_body=None, headers=None, photo=None):
+        headers = dict(headers or {})
+        data = None
+        if json_body is not None:
+            data = json.dumps(json_body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        elif photo is not None:
+            boundary = uuid.uuid4().hex
+            data = (
+                f'--{boundary}\r\nContent-Disposition: form-data; name="photo"; filename="car.jpg"\r\n'
+                f'Content-Type: image/jpeg\r\n\r\n'
+            ).encode('utf-8') + photo + f'\r\n--{boundary}--\r\n'.encode('utf-8')
+            headers['Content-Type'] = f'multipart/form-data; boundary={boundary}'
+
+        req = urllib.request.Request(self.base_url + path, data=data, headers=headers, method=method)
+        try:
+            with urllib.request.urlopen(req, timeout=60) as response:
+                return response.status, _parse_json(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, _parse_json(e.read())
+
+
+class FlaskTransport:
+    """Sends requests through a Flask test client (one per virtual user)."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, json_body=None, headers=None, photo=None):
+        kwargs = {'headers': headers or {}}
+        if json_body is not None:
+            kwargs['json'] = json_body
+        elif photo is not None:
+            kwargs['data'] = {'photo': (io.BytesIO(photo), 'car.jpg', 'image/jpeg')}
+            kwargs['content_type'] = 'multipart/form-data'
+        response = self.client.open(path, method=method, **kwargs)
+        return response.status_code, response.get_json(silent=True)
+
+
+def _parse_json(raw):
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return None
+
+
+class Recorder:
+    """Thread-safe collection of (endpoint -> latencies, errors)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def call(self, transport, endpoint, method, path, expected, **kwargs):
+        start = time.perf_counter()
+        status, body = transport.request(method, path, **kwargs)
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.latencies[endpoint].append(elapsed)
+            if status not in expected:
+                self.errors[endpoint] += 1
+        if status not in expected:
+            raise SessionError(f"{endpoint} returned {status}: {body}")
+        return body
+
+
+class SessionError(Exception):
+    pass
+
+
+def run_virtual_user(transport, recorder, sessions, landmarks_per_event):
+    email = f"load-{uuid.uuid4().hex}@memopark.local"
+    password = 'load-test-password'
+    failed = 0
+
+    recorder.call(transport, 'POST /auth/register', 'POST', '/auth/register', (201,),
+                  json_body={'user_email': email, 'user_password': password, 'user_name': 'Load Test'})
+
+    for _ in range(sessions):
+        try:
+            body = recorder.call(transport, 'POST /auth/login', 'POST', '/auth/login', (200,),
+                                 json_body={'user_email': email, 'user_password': password})
+            headers = {'Authorization': f"Bearer {body['access_token']}"}
+
+            event = recorder.call(transport, 'POST /parking', 'POST', '/parking', (201,), headers=headers,
+                                  json_body={'parking_latitude': -37.8136, 'parking_longitude': 144.9631,
+                                             'parking_location_name': 'Load test car park'})
+            event_id = event['parking_events_id']
+
+            recorder.call(transport, 'POST /parking/<id>/landmarks', 'POST', f'/parking/{event_id}/landmarks',
+                          (201,), headers=headers, json_body={'landmarks': [{
+                              'location_name': f'Landmark {i}',
+                              'landmark_latitude': -37.8136 + i * 1e-4,
+                              'landmark_longitude': 144.9631,
+                              'distance_from_parking': 10.0 * i,
+                          } for i in range(landmarks_per_event)]})
+
+            recorder.call(transport, 'POST /parking/<id>/photo', 'POST', f'/parking/{event_id}/photo', (200,),
+                          headers=headers, photo=PHOTO_BYTES)
+
+            recorder.call(transport, 'PUT /parking/<id>', 'PUT', f'/parking/{event_id}', (200,), headers=headers,
+                          json_body={'status': 'retrieving', 'estimated_time': 300})
+
+            active = recorder.call(transport, 'GET /parking/latest-active', 'GET', '/parking/latest-active',
+                                   (200,), headers=headers)
+
+            for landmark in active.get('landmarks', []):
+                recorder.call(transport, 'PATCH /parking/<id>/landmarks/<id>', 'PATCH',
+                              f"/parking/{event_id}/landmarks/{landmark['landmarks_id']}", (200,),
+                              headers=headers, json_body={'is_achieved': landmark['landmarks_id'] % 2 == 0})
+
+            recorder.call(transport, 'PUT /parking/<id> retrieved', 'PUT', f'/parking/{event_id}', (202,),
+                          headers=headers,
+                          json_body={'status': 'retrieved', 'finalScreenTime': 45000, 'finalMapViewCount': 3})
+
+            # Scoring runs in the worker pool; wait for it like the app does before showing the score
+            deadline = time.monotonic() + SCORING_WAIT_SECONDS
+            while True:
+                job = recorder.call(transport, 'GET /parking/<id>/scoring-job', 'GET',
+                                    f'/parking/{event_id}/scoring-job', (200,), headers=headers)
+                if job['status'] in ('succeeded', 'failed'):
+                    break
+                if time.monotonic() > deadline:
+                    raise SessionError(f"Scoring job for event {event_id} still {job['status']}")
+                time.sleep(SCORING_POLL_SECONDS)
+            if job['status'] == 'failed':
+                raise SessionError(f"Scoring job for event {event_id} failed: {job['error']}")
+
+            recorder.call(transport, 'GET /scores', 'GET', '/scores', (200,), headers=headers)
+        except SessionError:
+            failed += 1
+
+    return failed
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def print_report(recorder, wall_time, failed_sessions, total_sessions):
+    print(f"\n{'endpoint':<40} {'count':>7} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>8}")
+    total_requests = 0
+    for endpoint in sorted(recorder.latencies):
+        values = sorted(recorder.latencies[endpoint])
+        total_requests += len(values)
+        print(f"{endpoint:<40} {len(values):>7} {recorder.errors[endpoint]:>6} "
+              f"{percentile(values, 50) * 1000:>9.1f} {percentile(values, 95) * 1000:>9.1f} "
+              f"{percentile(values, 99) * 1000:>9.1f} {len(values) / wall_time:>8.1f}")
+    print(f"\n{total_requests} requests in {wall_time:.2f}s ({total_requests / wall_time:.1f} req/s), "
+          f"{failed_sessions}/{total_sessions} sessions failed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', help='Target a running server instead of an in-process app')
+    parser.add_argument('--users', type=int, default=8, help='Concurrent virtual users (default: 8)')
+    parser.add_argument('--sessions', type=int, default=5, help='Parking sessions per virtual user (default: 5)')
+    parser.add_argument('--landmarks', type=int, default=3, help='Landmarks per parking event (default: 3)')
+    args = parser.parse_args()
+
+    if args.base_url:
+        make_transport = lambda: HttpTransport(args.base_url)
+        work_dir = None
+    else:
+        work_dir = tempfile.TemporaryDirectory(prefix='memopark-load-')
+
+        class LoadTestConfig(BenchmarkConfig):
+            # A file database, so concurrent virtual users get their own connections
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(work_dir.name, 'load.db')}"
+            SQLALCHEMY_ENGINE_OPTIONS = {'connect_args': {'timeout': 30}}
+            SCORING_WORKERS = 2
+
+        app = create_benchmark_app(LoadTestConfig)
+        install_local_s3(app, os.path.join(work_dir.name, 's3'))
+        make_transport = lambda: FlaskTransport(app)
+
+    recorder = Recorder()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        futures = [pool.submit(run_virtual_user, make_transport(), recorder, args.sessions, args.landmarks)
+                   for _ in range(args.users)]
+        failed_sessions = sum(future.result() for future in futures)
+    wall_time = time.perf_counter() - start
+
+    print_report(recorder, wall_time, failed_sessions, args.users * args.sessions)
+
+    if work_dir:
+        work_dir.cleanup()
+    return 1 if failed_sessions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
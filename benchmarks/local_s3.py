@@ -0,0 +1,40 @@
+"""
+A local stand-in for the boto3 S3 client, storing objects under a directory.
+Install it with install_local_s3(app, directory); get_s3_client() then returns it instead of boto3.
+"""
+import os
+
+
+class LocalS3Client:
+    """Implements the subset of the boto3 S3 client API the app uses."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, bucket, key):
+        return os.path.join(self.directory, bucket, key)
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None):
+        path = self._path(bucket, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(fileobj.read())
+
+    def generate_presigned_url(self, client_method, Params=None, ExpiresIn=3600):
+        return f"file://{self._path(Params['Bucket'], Params['Key'])}?expires_in={ExpiresIn}"
+
+    def delete_objects(self, Bucket, Delete):
+        deleted = []
+        for obj in Delete['Objects']:
+            path = self._path(Bucket, obj['Key'])
+            if os.path.exists(path):
+                os.remove(path)
+            deleted.append({'Key': obj['Key']})
+        return {'Deleted': deleted, 'Errors': []}
+
+
+def install_local_s3(app, directory):
+    client = LocalS3Client(directory)
+    app.extensions['s3_client'] = client
+    return client
@@ -0,0 +1,88 @@
+"""
+A local stand-in for an SMTP server, keeping received messages in memory.
+Start it with LocalSMTPServer().start() and point ALERT_SMTP_HOST / ALERT_SMTP_PORT at server.host / server.port.
+"""
+import socketserver
+import threading
+from email import message_from_bytes
+from email.policy import default as default_policy
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough SMTP for smtplib: EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP and QUIT."""
+
+    def _reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode('ascii'))
+
+    def handle(self):
+        server = self.server.owner
+        mail_from, recipients = None, []
+        self._reply("220 local-smtp ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('utf-8', 'replace').strip()
+            verb = command[:4].upper()
+
+            if verb in ('EHLO', 'HELO'):
+                self._reply("250 local-smtp")
+            elif verb == 'MAIL':
+                mail_from, recipients = command.split(':', 1)[1].strip(), []
+                self._reply("250 OK")
+            elif verb == 'RCPT':
+                recipient = command.split(':', 1)[1].strip().strip('<>')
+                if recipient in server.rejected_recipients:
+                    self._reply("550 No such user")
+                else:
+                    recipients.append(recipient)
+                    self._reply("250 OK")
+            elif verb == 'DATA':
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                for data_line in iter(self.rfile.readline, b''):
+                    if data_line in (b'.\r\n', b'.\n'):
+                        break
+                    data.append(data_line[1:] if data_line.startswith(b'..') else data_line)
+                server.record(mail_from, recipients, b''.join(data))
+                self._reply("250 OK")
+            elif verb == 'RSET':
+                mail_from, recipients = None, []
+                self._reply("250 OK")
+            elif verb == 'NOOP':
+                self._reply("250 OK")
+            elif verb == 'QUIT':
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class LocalSMTPServer:
+    """Collects every delivered message in .messages as email.message.EmailMessage objects."""
+
+    def __init__(self, host='127.0.0.1', port=0):
+        self._server = _ThreadingServer((host, port), _SMTPHandler)
+        self._server.owner = self
+        self.host, self.port = self._server.server_address
+        self.messages = []
+        self.rejected_recipients = set()  # Addresses answered with 550, to exercise failures
+        self._lock = threading.Lock()
+
+    def record(self, mail_from, recipients, data):
+        message = message_from_bytes(data, policy=default_policy)
+        with self._lock:
+            self.messages.append(message)
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, name='local-smtp', daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,232 @@
+"""
+Microbenchmarks for the request hot paths, run against an in-memory SQLite app.
+
+Covers:
+  * score computation (app.utils.scoring.calculate_score, used by PUT /parking/<id>)
+  * route_polyline decoding and path metrics for a 5k-point walk
+  * GET /scores serialization at 10 / 1k / 10k rows
+  * GET /parking/latest-active serialization at 10 / 1k / 10k landmarks
+  * JWT blocklist lookup against a populated token_blocklist table
+  * bcrypt password verification
+
+Usage:
+    python benchmarks/micro.py                       # compare against benchmarks/baselines/micro.json
+    python benchmarks/micro.py --only scores         # run the benchmarks whose name contains "scores"
+    python benchmarks/micro.py --write-baseline      # store the current medians as the baseline
+    python benchmarks/micro.py --runs 5 --write-baseline   # ...taking each benchmark's median run of 5
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import uuid
+
+from app_factory import create_benchmark_app
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import insert
+
+from app.extensions import db
+from app.models.user import User
+from app.models.parking_event import ParkingEvent
+from app.models.landmark import Landmark
+from app.models.score import Score
+from app.models.token_blocklist import TokenBlocklist
+from app.utils.scoring import calculate_score
+from app.utils.geo import decode_polyline, route_metrics
+from harness import bench, median_of_runs, print_results, write_baseline, compare_to_baseline
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'micro.json')
+SIZES = (10, 1000, 10000)
+ROUTE_POINTS = 5000
+
+
+def _create_user(email):
+    user = User(user_name='bench', user_email=email, user_password='benchmark-password', user_type_id=2)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def _auth_headers(user):
+    return {"Authorization": f"Bearer {create_access_token(identity=user.user_id)}"}
+
+
+def _seed_watched_scores(user, count):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    db.session.execute(insert(ParkingEvent.__table__), [{
+        "user_id": user.user_id,
+        "parking_latitude": -37.8136,
+        "parking_longitude": 144.9631,
+        "parking_location_name": f"Bench location {i}",
+        "parking_address": "1 Benchmark Street",
+        "parking_type": "outside",
+        "started_at": now,
+        "ended_at": now,
+        "status": "score_watched",
+    } for i in range(count)])
+    event_ids = [row[0] for row in db.session.query(ParkingEvent.parking_events_id).filter_by(user_id=user.user_id)]
+    db.session.execute(insert(Score.__table__), [{
+        "parking_events_id": event_id,
+        "time_factor": 87.5,
+        "landmark_factor": 66.67,
+        "path_performance": 91.2,
+        "assistance_points": 2,
+        "no_of_landmarks": 3,
+        "landmarks_recalled": 2,
+        "task_score": 78.4,
+        "peek_penalty": 2,
+        "assist_penalty": 40,
+    } for event_id in event_ids])
+    db.session.commit()
+
+
+def _seed_active_event(user, landmark_count):
+    event = ParkingEvent(
+        user_id=user.user_id,
+        parking_latitude=-37.8136,
+        parking_longitude=144.9631,
+        parking_location_name="Bench car park",
+        started_at=datetime.datetime.now(datetime.timezone.utc),
+    )
+    db.session.add(event)
+    db.session.commit()
+    db.session.execute(insert(Landmark.__table__), [{
+        "parking_events_id": event.parking_events_id,
+        "landmark_latitude": -37.8136 + i * 1e-5,
+        "landmark_longitude": 144.9631,
+        "location_name": f"Landmark {i}",
+        "distance_from_parking": float(i),
+        "is_achieved": i % 2 == 0,
+    } for i in range(landmark_count)])
+    db.session.commit()
+
+
+def _scored_event():
+    """An unsaved, finished event with five landmarks, as seen by the retrieval branch."""
+    started = datetime.datetime(2025, 1, 1, 9, 0, tzinfo=datetime.timezone.utc)
+    event = ParkingEvent(
+        parking_latitude=-37.8136,
+        parking_longitude=144.9631,
+        navigation_started_at=started,
+        ended_at=started + datetime.timedelta(seconds=420),
+        estimated_time=360,
+        finalScreenTime=95,
+        finalMapViewCount=4,
+    )
+    event.landmarks = [Landmark(is_achieved=i < 3) for i in range(5)]
+    return event
+
+
+def _encode_polyline(latitudes, longitudes, precision=5):
+    """Reference (loop-based) polyline encoder, only used to build benchmark input."""
+    chunks = []
+    previous = (0, 0)
+    for point in zip(latitudes, longitudes):
+        current = tuple(round(value * 10 ** precision) for value in point)
+        for delta in (current[0] - previous[0], current[1] - previous[1]):
+            value = ~(delta << 1) if delta < 0 else delta << 1
+            while value >= 0x20:
+                chunks.append(chr((0x20 | (value & 0x1f)) + 63))
+                value >>= 5
+            chunks.append(chr(value + 63))
+        previous = current
+    return ''.join(chunks)
+
+
+def _walked_polyline(points):
+    """A deterministic random walk ending at the benchmark parking location."""
+    rng = random.Random(0)
+    latitudes, longitudes = [-37.8136], [144.9631]
+    for _ in range(points - 1):
+        latitudes.append(latitudes[-1] + rng.uniform(-0.00005, 0.00008))
+        longitudes.append(longitudes[-1] + rng.uniform(-0.00005, 0.00008))
+    return _encode_polyline(latitudes[::-1], longitudes[::-1])
+
+
+def build_benchmarks(app):
+    """Seed the database and return (name, callable, rounds) tuples."""
+    client = app.test_client()
+    cases = []
+
+    event = _scored_event()
+
+    def score_computation():
+        calculate_score(event)
+
+    cases.append(("score_computation", score_computation, 200))
+
+    polyline = _walked_polyline(ROUTE_POINTS)
+
+    def route_scoring():
+        latitudes, longitudes = decode_polyline(polyline)
+        route_metrics(latitudes, longitudes, event.parking_latitude, event.parking_longitude)
+
+    cases.append((f"route_metrics[{ROUTE_POINTS}]", route_scoring, 200))
+
+    for size in SIZES:
+        rounds = 20 if size < 10000 else 5
+
+        user = _create_user(f"scores-{size}@bench.local")
+        _seed_watched_scores(user, size)
+        headers = _auth_headers(user)
+        cases.append((f"get_scores[{size}]", lambda h=headers: client.get('/scores', headers=h).get_data(), rounds))
+
+        user = _create_user(f"active-{size}@bench.local")
+        _seed_active_event(user, size)
+        headers = _auth_headers(user)
+        cases.append((f"latest_active[{size}]",
+                      lambda h=headers: client.get('/parking/latest-active', headers=h).get_data(), rounds))
+
+    db.session.execute(insert(TokenBlocklist.__table__), [{"jti": str(uuid.uuid4())} for _ in range(10000)])
+    db.session.commit()
+    missing_jti = str(uuid.uuid4())
+
+    def blocklist_lookup():
+        # Same query as the token_in_blocklist_loader registered in create_app
+        TokenBlocklist.query.filter_by(jti=missing_jti).first()
+
+    cases.append(("blocklist_lookup[10000]", blocklist_lookup, 200))
+
+    # Transient: GET /scores closes the shared session between pages, which would detach a stored user
+    user = User(user_name='bench', user_email="bcrypt@bench.local", user_password='benchmark-password', user_type_id=2)
+    cases.append(("bcrypt_verify", lambda: user.check_password('benchmark-password'), 5))
+
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', help='Only run benchmarks whose name contains this text')
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help='Allowed slowdown of the median over the baseline (default: 0.5 = +50%%)')
+    parser.add_argument('--runs', type=int, default=1,
+                        help='Run every benchmark this many times and keep its median run (default: 1)')
+    parser.add_argument('--write-baseline', action='store_true')
+    args = parser.parse_args()
+
+    app = create_benchmark_app()
+    runs = []
+    with app.app_context():
+        benchmarks = [(name, func, rounds) for name, func, rounds in build_benchmarks(app)
+                      if not args.only or args.only in name]
+        for _ in range(max(args.runs, 1)):
+            runs.append([bench(name, func, rounds=rounds) for name, func, rounds in benchmarks])
+    results = median_of_runs(runs)
+
+    print_results(results)
+
+    if args.write_baseline:
+        write_baseline(results, BASELINE_FILE)
+        print(f"Baseline written to {BASELINE_FILE}")
+        return 0
+
+    failures = compare_to_baseline(results, BASELINE_FILE, args.tolerance)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
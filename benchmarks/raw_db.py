@@ -0,0 +1,134 @@
+"""
+Raw Database layer benchmark: plain cursors versus the prepared-statement cache.
+
+Runs against the MySQL server configured in config.ini (the same one `Database()` uses) and times,
+for a batch of repeated statements:
+  * add_to_database / select_from_database on the current path (plain cursor, new connection per call)
+  * the same statements through plain cursors on one reused connection, to separate connect cost
+    from parse/plan cost
+  * the same statements with `prepared_statements` on (cursor(prepared=True), cached per SQL text)
+
+The rows go to a scratch table that is dropped afterwards.
+
+Usage:
+    python benchmarks/raw_db.py                     # compare against benchmarks/baselines/raw_db.json
+    python benchmarks/raw_db.py --statements 1000   # statements per timed round
+    python benchmarks/raw_db.py --write-baseline    # store the current medians as the baseline
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.database.connection import Database
+from harness import bench, print_results, write_baseline, compare_to_baseline
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'raw_db.json')
+SCRATCH_TABLE = 'BenchPreparedStatement'
+
+CREATE_SCRATCH_TABLE = f"""CREATE TABLE IF NOT EXISTS {SCRATCH_TABLE} (
+    bench_id INT AUTO_INCREMENT PRIMARY KEY,
+    label VARCHAR(64) NOT NULL,
+    amount INT NOT NULL,
+    INDEX idx_bench_label (label)
+)"""
+INSERT_ROW = f"INSERT INTO {SCRATCH_TABLE} (label, amount) VALUES (%s, %s)"
+SELECT_ROWS = f"SELECT bench_id, label, amount FROM {SCRATCH_TABLE} WHERE label = %s"
+
+
+def _run_statements(database, sql, statements):
+    if sql == INSERT_ROW:
+        for i in range(statements):
+            database.add_to_database(INSERT_ROW, (f"label-{i % 50}", i))
+    else:
+        for i in range(statements):
+            database.select_from_database(SELECT_ROWS, (f"label-{i % 50}",))
+
+
+def _run_on_one_connection(database, sql, statements):
+    cursor = database.connection.cursor()
+    try:
+        for i in range(statements):
+            if sql == INSERT_ROW:
+                cursor.execute(INSERT_ROW, (f"label-{i % 50}", i))
+            else:
+                cursor.execute(SELECT_ROWS, (f"label-{i % 50}",))
+                cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def build_benchmarks(database, statements):
+    cases = []
+    for operation, sql in (("insert", INSERT_ROW), ("select", SELECT_ROWS)):
+        name = f"{operation}[{statements}]"
+
+        def plain(sql=sql):
+            database.prepared_statements = False
+            _run_statements(database, sql, statements)
+
+        def reused_connection(sql=sql):
+            database.prepared_statements = False
+            _run_on_one_connection(database, sql, statements)
+
+        def prepared(sql=sql):
+            database.prepared_statements = True
+            _run_statements(database, sql, statements)
+
+        cases.append((f"{name}_plain", plain))
+        cases.append((f"{name}_plain_one_connection", reused_connection))
+        cases.append((f"{name}_prepared", prepared))
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--statements', type=int, default=200, help='Statements per timed round (default: 200)')
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help='Allowed slowdown of the median over the baseline (default: 0.5 = +50%%)')
+    parser.add_argument('--write-baseline', action='store_true')
+    args = parser.parse_args()
+
+    database = Database()
+    if database.connection is None:
+        print("Could not connect to the MySQL server in config.ini; see the log above.")
+        return 2
+
+    cursor = database.connection.cursor()
+    cursor.execute(CREATE_SCRATCH_TABLE)
+    cursor.close()
+
+    results = []
+    try:
+        for name, func in build_benchmarks(database, args.statements):
+            results.append(bench(name, func, rounds=args.rounds))
+    finally:
+        database.prepared_statements = False
+        cursor = database.create_connection_parser()
+        cursor.execute(f"DROP TABLE IF EXISTS {SCRATCH_TABLE}")
+        cursor.close()
+
+    print_results(results)
+    by_name = {result.name: result for result in results}
+    for operation in ("insert", "select"):
+        plain = by_name[f"{operation}[{args.statements}]_plain"]
+        prepared = by_name[f"{operation}[{args.statements}]_prepared"]
+        print(f"{operation}: prepared statements ran {plain.median_ms / prepared.median_ms:.1f}x faster than the plain path")
+
+    if args.write_baseline:
+        write_baseline(results, BASELINE_FILE)
+        print(f"Baseline written to {BASELINE_FILE}")
+        return 0
+
+    failures = compare_to_baseline(results, BASELINE_FILE, args.tolerance)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
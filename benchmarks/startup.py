@@ -0,0 +1,115 @@
+"""
+Cold-start benchmark.
+
+Measures, in fresh interpreters:
+  * the cumulative `python -X importtime` cost of importing the `app` package
+  * the wall time of `create_app()` (imports included)
+and fails (exit code 1) when either exceeds the stored baseline by more than the tolerance,
+or when boto3 is imported during start-up.
+
+Usage:
+    python benchmarks/startup.py                  # compare against benchmarks/baselines/startup.json
+    python benchmarks/startup.py --write-baseline # record the current numbers as the new baseline
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(ROOT, 'benchmarks', 'baselines', 'startup.json')
+
+CREATE_APP_SNIPPET = """
+import sys, time
+start = time.perf_counter()
+from app import create_app
+create_app()
+print((time.perf_counter() - start) * 1000.0)
+print(int('boto3' in sys.modules))
+"""
+
+
+def _env():
+    env = dict(os.environ)
+    # An in-memory database keeps the measurement independent of MySQL being reachable
+    env.setdefault('DATABASE_URL', 'sqlite://')
+    return env
+
+
+def measure_import_ms():
+    """Cumulative import time of the `app` package in milliseconds, from -X importtime output."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        cwd=ROOT, env=_env(), capture_output=True, text=True, check=True
+    )
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == 'app':
+            return int(parts[1].strip()) / 1000.0
+    raise RuntimeError("Could not find the 'app' package in -X importtime output")
+
+
+def measure_create_app():
+    """Return (create_app wall time in ms, whether boto3 was imported)."""
+    result = subprocess.run(
+        [sys.executable, '-c', CREATE_APP_SNIPPET],
+        cwd=ROOT, env=_env(), capture_output=True, text=True, check=True
+    )
+    wall_ms, boto3_loaded = result.stdout.split()
+    return float(wall_ms), bool(int(boto3_loaded))
+
+
+def run(repeat):
+    # Best of N: start-up noise only ever makes a run slower
+    import_ms = min(measure_import_ms() for _ in range(repeat))
+    create_runs = [measure_create_app() for _ in range(repeat)]
+    return {
+        "import_ms": round(import_ms, 1),
+        "create_app_ms": round(min(wall for wall, _ in create_runs), 1),
+        "boto3_loaded": any(loaded for _, loaded in create_runs),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help='Allowed slowdown over the baseline as a fraction (default: 0.5 = +50%%)')
+    parser.add_argument('--write-baseline', action='store_true')
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    print(json.dumps(results, indent=2))
+
+    if args.write_baseline:
+        os.makedirs(os.path.dirname(BASELINE_FILE), exist_ok=True)
+        with open(BASELINE_FILE, 'w') as f:
+            json.dump({k: v for k, v in results.items() if k.endswith('_ms')}, f, indent=2)
+            f.write('\n')
+        print(f"Baseline written to {BASELINE_FILE}")
+        return 0
+
+    failures = []
+    if results['boto3_loaded']:
+        failures.append("boto3 was imported during start-up; it must stay lazy (see app/utils/s3.py)")
+
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE) as f:
+            baseline = json.load(f)
+        for key, base_value in baseline.items():
+            budget = base_value * (1.0 + args.tolerance)
+            if results[key] > budget:
+                failures.append(f"{key}: {results[key]}ms exceeds budget {budget:.1f}ms (baseline {base_value}ms)")
+    else:
+        print(f"No baseline at {BASELINE_FILE}; run with --write-baseline to create one.")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
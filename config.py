@@ -1,6 +1,7 @@
 import os
 import configparser
 from datetime import timedelta
+from urllib.parse import quote_plus
 
 
 def load_db_config(filename='config.ini', section='mysql'):
@@ -22,12 +23,79 @@ def load_db_config(filename='config.ini', section='mysql'):
 
     return db
 
+
+def _env_bool(name, default):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def build_database_uri():
+    """
+    Resolve the database URI when the app is created, not when this module is imported.
+    DATABASE_URL wins; otherwise MYSQL_* environment variables override the values in config.ini.
+    """
+    if os.environ.get('DATABASE_URL'):
+        return os.environ['DATABASE_URL']
+
+    db_config = {}
+    filename = os.environ.get('DB_CONFIG_FILE', 'config.ini')
+    if os.path.exists(filename):
+        db_config = load_db_config(filename)
+
+    for key in ('host', 'user', 'password', 'database'):
+        env_value = os.environ.get(f'MYSQL_{key.upper()}')
+        if env_value is not None:
+            db_config[key] = env_value
+
+    missing = [key for key in ('host', 'user', 'database') if not db_config.get(key)]
+    if missing:
+        raise Exception(f"Database settings missing: {', '.join(missing)}. "
+                        f"Set DATABASE_URL, MYSQL_* variables or provide {filename}.")
+
+    return (
+        f"mysql+mysqlconnector://"
+        f"{quote_plus(db_config['user'])}:{quote_plus(db_config.get('password') or '')}"
+        f"@{db_config['host']}/{db_config['database']}"
+    )
+
+
+def build_engine_options(config, database_uri):
+    """ Build SQLALCHEMY_ENGINE_OPTIONS from the DB_* settings """
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+
+    # SQLite (used for local tooling) runs on a single-connection pool without these knobs
+    if database_uri.startswith('sqlite'):
+        return options
+
+    options.setdefault('pool_size', config['DB_POOL_SIZE'])
+    options.setdefault('max_overflow', config['DB_MAX_OVERFLOW'])
+    options.setdefault('pool_timeout', config['DB_POOL_TIMEOUT'])
+    options.setdefault('pool_recycle', config['DB_POOL_RECYCLE'])
+    options.setdefault('pool_pre_ping', config['DB_POOL_PRE_PING'])
+
+    connect_args = dict(options.get('connect_args') or {})
+    if config.get('DB_CONNECT_TIMEOUT'):
+        connect_args.setdefault('connection_timeout', config['DB_CONNECT_TIMEOUT'])
+    if connect_args:
+        options['connect_args'] = connect_args
+
+    return options
+
+
+def build_database_binds(config):
+    """ Add the optional read replica bind, sharing the primary's engine options """
+    binds = dict(config.get('SQLALCHEMY_BINDS') or {})
+    replica_url = config.get('DATABASE_REPLICA_URL')
+    if replica_url and 'replica' not in binds:
+        binds['replica'] = replica_url
+    return binds
+
+
 class Config:
     """Base configuration."""
 
-    # Load database configuration from config.ini
-    db_config = load_db_config()
-
     # General Config
     SECRET_KEY = os.environ.get('SECRET_KEY', 'a_very_secret_key_you_should_change')
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'a_different_very_secret_key')
@@ -37,16 +105,90 @@ class Config:
     JWT_BLOCKLIST_ENABLED = True
     JWT_BLOCKLIST_TOKEN_CHECKS = ['access', 'refresh']
 
+    # --- Logging Configuration ---
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+    LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json')  # 'json' for production, 'text' for local development
+    # Per-logger overrides; set SCORING_LOG_LEVEL=DEBUG to log the full score breakdown of every retrieval
+    LOG_LEVELS = {'app.utils.scoring': os.environ.get('SCORING_LOG_LEVEL', 'INFO')}
+
+    # --- Compression Configuration ---
+    COMPRESSION_ENABLED = _env_bool('COMPRESSION_ENABLED', True)  # Turn off when a proxy in front already compresses
+    COMPRESSION_MIMETYPES = ('application/json', 'application/x-ndjson')
+    COMPRESSION_MIN_SIZE = 1024  # Bytes; smaller bodies are sent as they are. Streamed bodies are always compressed
+    COMPRESSION_GZIP_LEVEL = 6
+    COMPRESSION_BROTLI_QUALITY = 4  # 0-11; higher compresses better but costs far more CPU per response
+    COMPRESSION_STREAM_FLUSH_SIZE = 64 * 1024  # Input bytes between flushes of a compressed stream
+    REQUEST_MAX_DECOMPRESSED_SIZE = 16 * 1024 * 1024  # Cap on a 'Content-Encoding: gzip' request body once inflated
+
+    # --- Request Profiling Configuration ---
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0.0))  # Fraction of requests profiled, e.g. 0.001
+    PROFILE_SIGNING_KEY = os.environ.get('PROFILE_SIGNING_KEY')  # Enables X-Profile-Token; see 'flask profiling token'
+    PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')  # pstats dumps, named <time>-<endpoint>-user<id>-<reason>.prof
+    PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES', 200))  # Oldest dumps are deleted beyond this
+
+    # --- Slow Query Log Configuration ---
+    SLOW_QUERY_THRESHOLD_MS = int(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 200))  # 0 disables the log
+    SLOW_QUERY_LOG_SIZE = 100  # Most recent slow statements kept per process for GET /admin/slow-queries
+    SLOW_QUERY_EXPLAIN = _env_bool('SLOW_QUERY_EXPLAIN', True)  # Capture the EXPLAIN plan of each slow statement
+
+    # --- Navigation Tracking Configuration ---
+    TRACK_MAX_POINTS_PER_BATCH = 1000  # Points accepted by one POST /parking/<id>/track
+    LANDMARK_ACHIEVED_RADIUS_M = 25.0  # A landmark counts as reached once a point comes this close
+    ROUTE_MAX_POINTS = 50000  # Largest route_polyline accepted when an event is retrieved
+
+    # --- Scoring Job Configuration ---
+    SCORING_WORKERS = int(os.environ.get('SCORING_WORKERS', 2))  # Worker threads per process; 0 disables the pool
+    SCORING_POLL_INTERVAL = 1.0  # Seconds an idle worker waits before checking the ScoringJob table again
+    SCORING_JOB_LEASE = timedelta(seconds=60)  # A running job whose worker vanished is retaken after this
+    SCORING_JOB_MAX_ATTEMPTS = 5  # Retries back off 2, 4, 8... seconds, then the job is marked failed
+
+    # --- Idempotency-Key Configuration ---
+    IDEMPOTENCY_KEY_TTL = timedelta(hours=24)  # How long a stored response can be replayed
+    IDEMPOTENCY_MAX_KEYS_PER_USER = 100  # Oldest keys are dropped beyond this
+
     # Database Config
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SQLALCHEMY_DATABASE_URI = (
-        f"mysql+mysqlconnector://"
-        f"{db_config.get('user')}:{db_config.get('password')}"
-        f"@{db_config.get('host')}/{db_config.get('database')}"
-    )
+    SQLALCHEMY_DATABASE_URI = None  # Resolved lazily by build_database_uri() in create_app
+
+    # --- Connection Pool Configuration ---
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 20))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 280))  # Below MySQL/RDS idle timeouts
+    DB_POOL_PRE_PING = _env_bool('DB_POOL_PRE_PING', True)
+    DB_CONNECT_TIMEOUT = int(os.environ.get('DB_CONNECT_TIMEOUT', 10))
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 0))  # 0 disables the limit
+
+    # --- Read Replica Configuration ---
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')  # GET endpoints read from here when set
+    READ_REPLICA_STICKINESS_SECONDS = int(os.environ.get('READ_REPLICA_STICKINESS_SECONDS', 5))
+
+    # --- Archival Configuration ---
+    ARCHIVE_AFTER_MONTHS = int(os.environ.get('ARCHIVE_AFTER_MONTHS', 12))  # Default for 'flask archive run'
+
+    # --- Event Deletion Configuration ---
+    BULK_DELETE_MAX_EVENTS = 500  # Per POST /parking/bulk-delete request
+    S3_DELETION_LEASE = timedelta(minutes=5)  # A batch claimed by a worker that died is retried after this
+
+    # --- Emergency Alert Configuration ---
+    ALERT_SMTP_HOST = os.environ.get('ALERT_SMTP_HOST', 'localhost')
+    ALERT_SMTP_PORT = int(os.environ.get('ALERT_SMTP_PORT', 25))
+    ALERT_SMTP_USERNAME = os.environ.get('ALERT_SMTP_USERNAME')
+    ALERT_SMTP_PASSWORD = os.environ.get('ALERT_SMTP_PASSWORD')
+    ALERT_SMTP_USE_TLS = _env_bool('ALERT_SMTP_USE_TLS', False)
+    ALERT_SMTP_TIMEOUT = 10  # Seconds
+    ALERT_FROM_ADDRESS = os.environ.get('ALERT_FROM_ADDRESS', 'alerts@memopark.app')
+    ALERT_RATE_PER_SECOND = float(os.environ.get('ALERT_RATE_PER_SECOND', 5))  # Stay under the SMTP provider's limit
+    ALERT_ABANDONED_AFTER = timedelta(hours=3)  # Navigation still 'retrieving' after this is expired and alerted
+    # A batch claimed by a worker that died is retried after this; keep it above --batch-size / ALERT_RATE_PER_SECOND
+    ALERT_DISPATCH_LEASE = timedelta(minutes=10)
+
+    # --- Research Export Configuration ---
+    EXPORT_PSEUDONYM_KEY = os.environ.get('EXPORT_PSEUDONYM_KEY')  # HMAC key for user ids; required by 'flask export scores'
 
     # --- AWS S3 Configuration ---
     S3_BUCKET = os.environ.get("S3_BUCKET")
     AWS_ACCESS_KEY_ID = os.environ.get("AWS_ACCESS_KEY_ID")
     AWS_SECRET_ACCESS_KEY = os.environ.get("AWS_SECRET_ACCESS_KEY")
-    AWS_REGION = os.environ.get("AWS_REGION")
\ No newline at end of file
+    AWS_REGION = os.environ.get("AWS_REGION")
+    S3_ENDPOINT_URL = os.environ.get("S3_ENDPOINT_URL")  # Optional, e.g. a local MinIO for load tests
\ No newline at end of file
@@ -0,0 +1,230 @@
+import csv
+import datetime
+import hashlib
+import hmac
+import os
+import time
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import select, union_all
+from app.extensions import db
+from app.models.parking_event import ParkingEvent
+from app.models.score import Score
+from app.models.archive import ParkingEventArchive, ScoreArchive
+from app.models.user_type import UserType  # noqa: F401 - lets the User mapper resolve 'UserType' on its own
+
+# Create a new Click command group
+export_cli = click.Group("export", help="Commands to export data for research and analysis.")
+
+# Column name -> pyarrow type name; also the column order of every output file
+SCORE_EXPORT_COLUMNS = {
+    "user_pseudonym": "string",
+    "parking_events_id": "int64",
+    "scores_id": "int64",
+    "status": "string",
+    "parking_type": "string",
+    "time_factor": "float64",
+    "landmark_factor": "float64",
+    "path_performance": "float64",
+    "task_score": "float64",
+    "assistance_points": "int32",
+    "no_of_landmarks": "int32",
+    "landmarks_recalled": "int32",
+    "peek_penalty": "int32",
+    "assist_penalty": "int32",
+    "estimated_time": "int32",
+    "finalScreenTime": "int64",
+    "finalMapViewCount": "int32",
+    "started_at": "timestamp",
+    "navigation_started_at": "timestamp",
+    "ended_at": "timestamp",
+    "scored_at": "timestamp",
+}
+
+# (score table, event table) for the hot set and the archive; scores_id is unique across both
+EXPORT_TABLES = (
+    (Score.__table__, ParkingEvent.__table__),
+    (ScoreArchive, ParkingEventArchive),
+)
+
+
+def _pseudonymise(user_id, key):
+    """Stable, non-reversible id: the same user always maps to the same value for a given key."""
+    return hmac.new(key, str(user_id).encode('utf-8'), hashlib.sha256).hexdigest()[:16]
+
+
+def _utc_naive(value):
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _score_chunk_select(score, event, last_id, chunk_size):
+    """The next chunk_size joined rows of one (score, event) table pair after last_id, by scores_id."""
+    return select(
+        event.c.user_id,
+        score.c.parking_events_id,
+        score.c.scores_id,
+        event.c.status,
+        event.c.parking_type,
+        score.c.time_factor,
+        score.c.landmark_factor,
+        score.c.path_performance,
+        score.c.task_score,
+        score.c.assistance_points,
+        score.c.no_of_landmarks,
+        score.c.landmarks_recalled,
+        score.c.peek_penalty,
+        score.c.assist_penalty,
+        event.c.estimated_time,
+        event.c.finalScreenTime,
+        event.c.finalMapViewCount,
+        event.c.started_at,
+        event.c.navigation_started_at,
+        event.c.ended_at,
+        score.c.created_at.label('scored_at'),
+    ).join(
+        event, score.c.parking_events_id == event.c.parking_events_id
+    ).where(
+        score.c.scores_id > last_id
+    ).order_by(score.c.scores_id).limit(chunk_size).subquery()
+
+
+def _iter_score_chunks(chunk_size):
+    """
+    Yield lists of joined Score/ParkingEvent rows from the hot and archive tables alike,
+    keyset-paginated on scores_id.
+    """
+    last_id = 0
+    while True:
+        # Each table pair is limited on its own, so neither is read past the chunk; every chunk is one
+        # statement, so an event archived during the export is seen in exactly one of the tables
+        chunks = union_all(*(
+            select(_score_chunk_select(score, event, last_id, chunk_size)) for score, event in EXPORT_TABLES
+        )).subquery()
+        rows = db.session.execute(
+            select(chunks).order_by(chunks.c.scores_id).limit(chunk_size)
+        ).all()
+        if not rows:
+            return
+
+        db.session.close()
+        yield rows
+
+        if len(rows) < chunk_size:
+            return
+        last_id = rows[-1].scores_id
+
+
+def _rows_by_month(rows, key):
+    """Convert rows to column dicts grouped by 'YYYY-MM' of the scoring time."""
+    months = {}
+    for row in rows:
+        record = row._asdict()
+        user_id = record.pop('user_id')
+        record['user_pseudonym'] = _pseudonymise(user_id, key)
+        record['status'] = row.status.name if row.status else None
+        record['parking_type'] = row.parking_type.name if row.parking_type else None
+        for name in ('started_at', 'navigation_started_at', 'ended_at', 'scored_at'):
+            record[name] = _utc_naive(record[name])
+
+        month_source = record['scored_at'] or record['ended_at'] or record['started_at']
+        month = month_source.strftime('%Y-%m') if month_source else 'unknown'
+        columns = months.setdefault(month, {name: [] for name in SCORE_EXPORT_COLUMNS})
+        for name in SCORE_EXPORT_COLUMNS:
+            columns[name].append(record[name])
+    return months
+
+
+class _ParquetPartitions:
+    """One open ParquetWriter per month partition (Hive layout: <output>/month=YYYY-MM/scores.parquet)."""
+
+    def __init__(self, output, compression):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise click.ClickException("Parquet export needs pyarrow: pip install pyarrow")
+
+        self.pa = pa
+        self.pq = pq
+        self.output = output
+        self.compression = compression
+        self.writers = {}
+        self.schema = pa.schema([
+            pa.field(name, pa.timestamp('us') if type_name == 'timestamp' else getattr(pa, type_name)())
+            for name, type_name in SCORE_EXPORT_COLUMNS.items()
+        ])
+
+    def write(self, month, columns):
+        writer = self.writers.get(month)
+        if writer is None:
+            directory = os.path.join(self.output, f"month={month}")
+            os.makedirs(directory, exist_ok=True)
+            writer = self.pq.ParquetWriter(os.path.join(directory, 'scores.parquet'), self.schema,
+                                           compression=self.compression)
+            self.writers[month] = writer
+        writer.write_table(self.pa.Table.from_pydict(columns, schema=self.schema))
+
+    def close(self):
+        for writer in self.writers.values():
+            writer.close()
+
+
+class _CsvPartitions:
+    """One CSV file per month partition, for environments without pyarrow."""
+
+    def __init__(self, output):
+        self.output = output
+        self.files = {}
+
+    def write(self, month, columns):
+        if month not in self.files:
+            directory = os.path.join(self.output, f"month={month}")
+            os.makedirs(directory, exist_ok=True)
+            handle = open(os.path.join(directory, 'scores.csv'), 'w', newline='')
+            writer = csv.writer(handle)
+            writer.writerow(SCORE_EXPORT_COLUMNS)
+            self.files[month] = (handle, writer)
+        self.files[month][1].writerows(zip(*(columns[name] for name in SCORE_EXPORT_COLUMNS)))
+
+    def close(self):
+        for handle, _ in self.files.values():
+            handle.close()
+
+
+@export_cli.command("scores", help="Exports all scores, archived ones included, joined with their parking events, "
+                                   "partitioned by month.")
+@click.option('--format', 'output_format', type=click.Choice(['parquet', 'csv']), default='parquet', show_default=True)
+@click.option('--output', default='exports/scores', show_default=True, help="Output directory.")
+@click.option('--chunk-size', type=int, default=50000, show_default=True, help="Rows fetched per query.")
+@click.option('--compression', default='zstd', show_default=True, help="Parquet compression codec.")
+@with_appcontext
+def scores(output_format, output, chunk_size, compression):
+    """Streams the Score/ParkingEvent join (hot and archive tables) in chunks into typed, month-partitioned files."""
+    # User ids are replaced by a keyed hash, so the export can leave the production environment.
+    # No fallback to SECRET_KEY: it has a public default, and small ids hashed with a known key are reversible
+    key = current_app.config.get('EXPORT_PSEUDONYM_KEY')
+    if not key:
+        raise click.ClickException("Set EXPORT_PSEUDONYM_KEY to a secret used only for exports.")
+    key = key.encode('utf-8')
+
+    if output_format == 'parquet':
+        partitions = _ParquetPartitions(output, compression)
+    else:
+        partitions = _CsvPartitions(output)
+
+    start_time = time.perf_counter()
+    total = 0
+    try:
+        for rows in _iter_score_chunks(chunk_size):
+            for month, columns in _rows_by_month(rows, key).items():
+                partitions.write(month, columns)
+            total += len(rows)
+            click.echo(f"  {total} scores exported ({time.perf_counter() - start_time:.1f}s)", err=True)
+    finally:
+        partitions.close()
+
+    print(f"Exported {total} scores to {output} as {output_format} in {time.perf_counter() - start_time:.1f}s.")
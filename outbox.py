@@ -0,0 +1,69 @@
+import datetime
+import time
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from app.models.user_type import UserType  # noqa: F401 - lets the User mapper resolve 'UserType' on its own
+from app.utils.event_deletion import drain_s3_deletion_outbox, S3_DELETE_BATCH_LIMIT
+from app.utils.alerts import dispatch_alert_batch, expire_abandoned_navigations, RateLimiter
+
+# Create a new Click command group
+outbox_cli = click.Group("outbox", help="Workers that deliver queued side effects (S3 deletions, emergency alerts).")
+
+
+@outbox_cli.command("drain-s3", help="Deletes photos of deleted parking events from S3 in batches.")
+@click.option('--batch-size', type=click.IntRange(1, S3_DELETE_BATCH_LIMIT), default=S3_DELETE_BATCH_LIMIT,
+              show_default=True, help="Keys per delete_objects call.")
+@click.option('--max-attempts', type=int, default=5, show_default=True,
+              help="Give up on a key after this many failed attempts.")
+@click.option('--loop', is_flag=True, help="Keep running, polling the outbox every --interval seconds.")
+@click.option('--interval', type=float, default=10.0, show_default=True, help="Polling interval with --loop.")
+@with_appcontext
+def drain_s3(batch_size, max_attempts, loop, interval):
+    """Drains the S3 deletion outbox until it is empty (or forever with --loop)."""
+    while True:
+        total_deleted = total_failed = 0
+        while True:
+            deleted, failed = drain_s3_deletion_outbox(batch_size=batch_size, max_attempts=max_attempts)
+            total_deleted += deleted
+            total_failed += failed
+            # Stop when the outbox is empty or a whole batch failed (S3 unavailable); retry on the next pass
+            if deleted == 0:
+                break
+
+        if total_deleted or total_failed:
+            print(f"S3 outbox: {total_deleted} objects deleted, {total_failed} failed.")
+        if not loop:
+            break
+        time.sleep(interval)
+
+
+@outbox_cli.command("dispatch-alerts", help="Expires abandoned navigations and emails queued emergency alerts.")
+@click.option('--batch-size', type=click.IntRange(1, 1000), default=50, show_default=True,
+              help="Alerts sent per SMTP connection.")
+@click.option('--max-attempts', type=int, default=5, show_default=True,
+              help="Give up on an alert after this many failed attempts.")
+@click.option('--loop', is_flag=True, help="Keep running, polling the outbox every --interval seconds.")
+@click.option('--interval', type=float, default=30.0, show_default=True, help="Polling interval with --loop.")
+@with_appcontext
+def dispatch_alerts(batch_size, max_attempts, loop, interval):
+    """Sends due alerts until none are left (or forever with --loop), at most ALERT_RATE_PER_SECOND."""
+    rate_limiter = RateLimiter(current_app.config['ALERT_RATE_PER_SECOND'])
+    while True:
+        expired = expire_abandoned_navigations(datetime.datetime.now(datetime.timezone.utc))
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = dispatch_alert_batch(batch_size, max_attempts, rate_limiter)
+            total_sent += sent
+            total_failed += failed
+            # Stop when nothing is due or a whole batch failed (SMTP unavailable); retry on the next pass
+            if sent == 0:
+                break
+
+        if expired or total_sent or total_failed:
+            print(f"Alert outbox: {expired} abandoned navigations expired, {total_sent} alerts sent, "
+                  f"{total_failed} failed.")
+        if not loop:
+            break
+        time.sleep(interval)
@@ -0,0 +1,42 @@
+import os
+import pstats
+import time
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from app.utils.profiling import sign_profile_token, PROFILE_HEADER, PROFILE_SUFFIX
+
+# Create a new Click command group
+profiling_cli = click.Group("profiling", help="Per-request cProfile dumps (PROFILE_SAMPLE_RATE, X-Profile-Token).")
+
+
+@profiling_cli.command("token", help="Prints an X-Profile-Token header value that profiles requests until it expires.")
+@click.option('--ttl', type=click.IntRange(1, 24 * 3600), default=600, show_default=True,
+              help="Seconds the token stays valid.")
+@with_appcontext
+def token(ttl):
+    key = current_app.config.get('PROFILE_SIGNING_KEY')
+    if not key:
+        raise click.ClickException("PROFILE_SIGNING_KEY is not set.")
+    print(f"{PROFILE_HEADER}: {sign_profile_token(key, time.time() + ttl)}")
+
+
+@profiling_cli.command("show", help="Prints the most expensive functions of a dump (default: the newest one).")
+@click.argument('filename', required=False)
+@click.option('--sort', type=click.Choice(['cumulative', 'tottime', 'calls']), default='cumulative',
+              show_default=True)
+@click.option('--limit', type=int, default=30, show_default=True, help="Functions to print.")
+@with_appcontext
+def show(filename, sort, limit):
+    directory = current_app.config['PROFILE_DIR']
+    if filename is None:
+        dumps = [entry for entry in os.scandir(directory) if entry.name.endswith(PROFILE_SUFFIX)] \
+            if os.path.isdir(directory) else []
+        if not dumps:
+            raise click.ClickException(f"No profiles in {directory}.")
+        filename = max(dumps, key=lambda entry: entry.stat().st_mtime).name
+
+    path = filename if os.path.exists(filename) else os.path.join(directory, filename)
+    print(path)
+    pstats.Stats(path).strip_dirs().sort_stats(sort).print_stats(limit)
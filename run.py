@@ -1,11 +1,19 @@
 from app import create_app
 from seed import seed_cli  # Import the seed command group
+from export import export_cli  # Import the export command group
+from archive import archive_cli  # Import the archive command group
+from outbox import outbox_cli  # Import the outbox worker command group
+from profiling import profiling_cli  # Import the request profiling command group
 
 # Create the Flask app instance
 app = create_app()
 
 # Register the seed command with the app's CLI
 app.cli.add_command(seed_cli)
+app.cli.add_command(export_cli)
+app.cli.add_command(archive_cli)
+app.cli.add_command(outbox_cli)
+app.cli.add_command(profiling_cli)
 
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
@@ -1,7 +1,21 @@
+import datetime
+import random
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
 import click
 from flask.cli import with_appcontext
-from app.extensions import db
+from sqlalchemy import func, insert, select
+from app.extensions import db, bcrypt
 from app.models.user_type import UserType
+from app.models.user import User
+from app.models.parking_event import ParkingEvent
+from app.models.landmark import Landmark
+from app.models.score import Score
+from app.models.archive import ParkingEventArchive
+from app.utils.scoring import calculate_score
+from app.utils.score_histogram import rebuild_score_histograms
 
 # Create a new Click command group
 seed_cli = click.Group("seed", help="Commands to seed the database with initial data.")
@@ -31,4 +45,214 @@ def run():
         print("Standard user type already exists.")
 
     db.session.commit()
-    print("User types seeding complete.")
\ No newline at end of file
+    print("User types seeding complete.")
+
+# --- Synthetic data ---
+# Status mix of real traffic: most sessions end with the score viewed, some expire or are still open
+SYNTHETIC_STATUS_WEIGHTS = {
+    'score_watched': 0.70,
+    'expired': 0.15,
+    'active': 0.08,
+    'retrieving': 0.04,
+    'retrieved': 0.03,
+}
+SYNTHETIC_LANDMARK_WEIGHTS = [0.20, 0.20, 0.25, 0.20, 0.10, 0.05]  # 0..5 landmarks per event
+SYNTHETIC_PASSWORD = 'memopark-synthetic'
+
+
+@contextmanager
+def _bulk_load_checks_disabled(connection):
+    """Turn off FK/unique checks for the duration of a bulk load, and restore them afterwards."""
+    dialect = connection.dialect.name
+    if dialect == 'mysql':
+        connection.exec_driver_sql("SET SESSION foreign_key_checks = 0")
+        connection.exec_driver_sql("SET SESSION unique_checks = 0")
+    elif dialect == 'sqlite':
+        connection.exec_driver_sql("PRAGMA foreign_keys = OFF")
+        connection.exec_driver_sql("PRAGMA synchronous = OFF")
+    try:
+        yield
+    finally:
+        if dialect == 'mysql':
+            connection.exec_driver_sql("SET SESSION unique_checks = 1")
+            connection.exec_driver_sql("SET SESSION foreign_key_checks = 1")
+        elif dialect == 'sqlite':
+            connection.exec_driver_sql("PRAGMA synchronous = FULL")
+            connection.exec_driver_sql("PRAGMA foreign_keys = ON")
+
+
+def _next_id(connection, *columns):
+    """One past the highest id in any of the given columns (hot and archive tables share id ranges)."""
+    return max((connection.execute(select(func.max(column))).scalar() or 0) for column in columns) + 1
+
+
+def _synthetic_event(rng, event_id, user_id, created_at):
+    """Build the ParkingEvent, Landmark and Score rows for one synthetic session."""
+    status = rng.choices(list(SYNTHETIC_STATUS_WEIGHTS), weights=list(SYNTHETIC_STATUS_WEIGHTS.values()))[0]
+    latitude = round(-37.8136 + rng.uniform(-0.2, 0.2), 6)
+    longitude = round(144.9631 + rng.uniform(-0.2, 0.2), 6)
+
+    event = {
+        "parking_events_id": event_id,
+        "user_id": user_id,
+        "parking_latitude": latitude,
+        "parking_longitude": longitude,
+        "parking_location_name": f"Car park {rng.randint(1, 500)}",
+        "parking_address": f"{rng.randint(1, 300)} Synthetic Street",
+        "parking_type": rng.choices(['outside', 'inside_building'], weights=[0.65, 0.35])[0],
+        "level_floor": None,
+        "parking_slot": None,
+        "started_at": created_at,
+        "navigation_started_at": None,
+        "estimated_time": None,
+        "ended_at": None,
+        "finalScreenTime": None,
+        "finalMapViewCount": None,
+        "status": status,
+        "is_active": True,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+    if event["parking_type"] == 'inside_building':
+        event["level_floor"] = f"L{rng.randint(-3, 8)}"
+        event["parking_slot"] = f"{rng.choice('ABCDEFG')}{rng.randint(1, 120)}"
+
+    if status != 'active':
+        event["navigation_started_at"] = created_at + datetime.timedelta(minutes=rng.randint(15, 600))
+        event["estimated_time"] = rng.randint(60, 900)
+    if status in ('score_watched', 'retrieved', 'expired'):
+        # Most people take a bit longer than the estimate; a long tail takes much longer
+        duration = event["estimated_time"] * rng.lognormvariate(0.1, 0.4)
+        event["ended_at"] = event["navigation_started_at"] + datetime.timedelta(seconds=duration)
+        event["finalMapViewCount"] = min(20, int(rng.expovariate(1 / 3.0)))
+        event["finalScreenTime"] = int(duration * rng.betavariate(2, 5))
+        event["updated_at"] = event["ended_at"]
+
+    landmarks = []
+    for i in range(rng.choices(range(len(SYNTHETIC_LANDMARK_WEIGHTS)), weights=SYNTHETIC_LANDMARK_WEIGHTS)[0]):
+        landmarks.append({
+            "parking_events_id": event_id,
+            "landmark_latitude": round(latitude + rng.uniform(-0.002, 0.002), 6),
+            "landmark_longitude": round(longitude + rng.uniform(-0.002, 0.002), 6),
+            "location_name": f"Landmark {i + 1}",
+            "distance_from_parking": round(rng.uniform(5, 400), 1),
+            "is_achieved": status in ('score_watched', 'retrieved') and rng.random() < 0.7,
+            "is_active": True,
+            "created_at": created_at,
+            "updated_at": created_at,
+        })
+
+    score = None
+    if status in ('score_watched', 'retrieved'):
+        # Run the real scoring code on a lightweight stand-in for the ORM object
+        scored_event = SimpleNamespace(
+            landmarks=[SimpleNamespace(is_achieved=lm["is_achieved"]) for lm in landmarks],
+            **{key: event[key] for key in ('parking_events_id', 'ended_at', 'navigation_started_at',
+                                           'estimated_time', 'finalScreenTime', 'finalMapViewCount')}
+        )
+        score = dict(calculate_score(scored_event), parking_events_id=event_id, is_active=True,
+                     created_at=event["ended_at"], updated_at=event["ended_at"])
+
+    return event, landmarks, score
+
+
+@seed_cli.command("synthetic", help="Generates production-sized synthetic users, parking events, landmarks and scores.")
+@click.option('--users', 'user_count', type=int, default=1000, show_default=True, help="Number of users to create.")
+@click.option('--events-per-user', type=int, default=50, show_default=True, help="Parking events per user.")
+@click.option('--seed', 'random_seed', type=int, default=42, show_default=True,
+              help="Random seed; the same seed produces the same data.")
+@click.option('--batch-size', type=int, default=5000, show_default=True, help="Parking events per insert batch.")
+@click.option('--days', type=int, default=730, show_default=True, help="Spread events over this many past days.")
+@with_appcontext
+def synthetic(user_count, events_per_user, random_seed, batch_size, days):
+    """Bulk-loads synthetic data with multi-row inserts, explicit ids and FK/unique checks disabled."""
+    rng = random.Random(random_seed)
+
+    user_type = UserType.query.filter_by(user_type='user').first()
+    if not user_type:
+        raise click.ClickException("Run 'flask seed run' first to create the user types.")
+
+    email_prefix = f"synthetic-{random_seed}-"
+    if User.query.filter(User.user_email.like(f"{email_prefix}%")).first():
+        raise click.ClickException(f"Synthetic data for seed {random_seed} already exists; use another --seed.")
+
+    # bcrypt is deliberately slow, so every synthetic user shares one hash
+    password_hash = bcrypt.generate_password_hash(SYNTHETIC_PASSWORD).decode('utf-8')
+    # Fixed reference time, so the same seed also gives the same timestamps
+    now = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+    start_time = time.perf_counter()
+    totals = {"users": 0, "events": 0, "landmarks": 0, "scores": 0}
+
+    with db.engine.connect() as connection, _bulk_load_checks_disabled(connection):
+        next_user_id = _next_id(connection, User.user_id)
+        next_event_id = _next_id(connection, ParkingEvent.parking_events_id,
+                                 ParkingEventArchive.c.parking_events_id)
+        users, events, landmarks, scores = [], [], [], []
+
+        def flush():
+            if not users and not events:
+                return
+            for table, rows in ((User.__table__, users), (ParkingEvent.__table__, events),
+                                (Landmark.__table__, landmarks), (Score.__table__, scores)):
+                if rows:
+                    connection.execute(insert(table), rows)
+            connection.commit()
+            totals["users"] += len(users)
+            totals["events"] += len(events)
+            totals["landmarks"] += len(landmarks)
+            totals["scores"] += len(scores)
+            for rows in (users, events, landmarks, scores):
+                rows.clear()
+            click.echo(f"  {totals['events']} events loaded ({time.perf_counter() - start_time:.1f}s)", err=True)
+
+        for user_index in range(user_count):
+            user_id = next_user_id + user_index
+            joined_at = now - datetime.timedelta(days=rng.uniform(0, days))
+            users.append({
+                "user_id": user_id,
+                "user_type_id": user_type.user_type_id,
+                "user_name": f"Synthetic User {user_index + 1}",
+                "user_email": f"{email_prefix}{user_index + 1}@memopark.test",
+                "user_password": password_hash,
+                "language": 'en',
+                "text_size": rng.choices(['small', 'medium', 'large'], weights=[0.1, 0.6, 0.3])[0],
+                "icon_size": rng.choices(['default', 'medium', 'large'], weights=[0.6, 0.25, 0.15])[0],
+                "high_contrast_mode": rng.random() < 0.15,
+                "is_active": True,
+                "created_at": joined_at,
+                "updated_at": joined_at,
+            })
+
+            # Events are spread between sign-up and now, oldest first
+            span_seconds = (now - joined_at).total_seconds()
+            offsets = sorted(rng.uniform(0, span_seconds) for _ in range(events_per_user))
+            for offset in offsets:
+                event, event_landmarks, score = _synthetic_event(
+                    rng, next_event_id, user_id, joined_at + datetime.timedelta(seconds=offset)
+                )
+                next_event_id += 1
+                events.append(event)
+                landmarks.extend(event_landmarks)
+                if score:
+                    scores.append(score)
+
+                if len(events) >= batch_size:
+                    flush()
+
+        flush()
+
+    elapsed = time.perf_counter() - start_time
+    rows = sum(totals.values())
+    print(f"Synthetic seeding complete: {totals['users']} users, {totals['events']} events, "
+          f"{totals['landmarks']} landmarks, {totals['scores']} scores "
+          f"({rows} rows in {elapsed:.1f}s, {rows / max(elapsed, 1e-9):.0f} rows/s).")
+
+    # Bulk-loaded scores skip the per-insert histogram update, so count them once at the end
+    print(f"{rebuild_score_histograms()} scores added to the score histograms.")
+
+
+@seed_cli.command("score-histogram", help="Adds scores not yet counted to the score percentile histograms.")
+@with_appcontext
+def score_histogram():
+    """Counts uncounted Score and ScoreArchive rows into ScoreHistogram, e.g. once after the migration that adds it."""
+    print(f"{rebuild_score_histograms()} scores added to the score histograms.")